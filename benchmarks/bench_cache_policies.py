@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Benchmark the time per operation of cache policies as their size grows.
+
+This script measures the time per request of the LFU caches, half of whose
+requests are misses evicting an item, and the time per insertion of a TTL
+cache wrapping an LRU cache, whose items have random TTLs and expire as time
+advances. Both must take about the same time at all sizes, since evictions
+and expirations are indexed by heaps rather than found by linear scans.
+
+Usage: python benchmarks/bench_cache_policies.py [MAXLEN ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+import icarus.models as cache
+
+
+def time_per_request(cache_class, maxlen, n_requests=20000):
+    """Return the time per request in seconds of an LFU cache"""
+    c = cache_class(maxlen)
+    # Contents are requested uniformly, hence about half of the requests are
+    # misses evicting an item once the cache is full
+    contents = np.random.default_rng(0).integers(2 * maxlen, size=n_requests)
+    for k in range(maxlen):
+        c.get(k)
+        c.put(k)
+    best = float("inf")
+    for requests in np.array_split(contents, 4):
+        start = time.perf_counter()
+        for k in requests.tolist():
+            if not c.get(k):
+                c.put(k)
+        best = min(best, (time.perf_counter() - start) / len(requests))
+    return best
+
+
+def time_per_put(maxlen, n_puts=20000):
+    """Return the time per insertion in seconds of a TTL cache"""
+    now = 0
+    c = cache.ttl_cache(cache.LruCache(maxlen), lambda: now)
+    ttls = np.random.default_rng(0).random(maxlen + n_puts) * maxlen
+    for k in range(maxlen):
+        c.put(k, ttl=ttls[k])
+    best = float("inf")
+    for puts in np.array_split(np.arange(maxlen, maxlen + n_puts), 4):
+        start = time.perf_counter()
+        for k in puts.tolist():
+            now += 1
+            c.put(k, ttl=ttls[k])
+        best = min(best, (time.perf_counter() - start) / len(puts))
+    return best
+
+
+def main():
+    maxlens = [int(maxlen) for maxlen in sys.argv[1:]] or [10 ** 2, 10 ** 4, 10 ** 5]
+    print("%-10s %14s %14s %14s" % ("maxlen", "IN_CACHE_LFU", "PERFECT_LFU", "TTL"))
+    for maxlen in maxlens:
+        print(
+            "%-10d %11.2f us %11.2f us %11.2f us"
+            % (
+                maxlen,
+                10 ** 6 * time_per_request(cache.InCacheLfuCache, maxlen),
+                10 ** 6 * time_per_request(cache.PerfectLfuCache, maxlen),
+                10 ** 6 * time_per_put(maxlen),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Benchmark the overhead of reporting events to data collectors.
+
+This script measures the time taken by the network controller to report each
+type of event to a collector proxy dispatching events to the default data
+collectors of the configuration file (cache hit ratio, latency, link load and
+path stretch) on the GEANT topology. The time of the same calls with logging
+disabled is subtracted, so that only the event reporting overhead is shown.
+The *session* entry is the overhead of opening and closing a session, which
+is not included in the other entries.
+
+The overhead is shown both for the collector proxy, which generates a
+dispatcher for each event, and for a proxy looping over the collectors
+handling each event and reporting all events, as done by earlier versions.
+
+Usage: python benchmarks/bench_collectors.py [--n-calls N]
+"""
+import argparse
+import time
+
+from icarus.registry import (
+    CACHE_PLACEMENT,
+    CONTENT_PLACEMENT,
+    DATA_COLLECTOR,
+    TOPOLOGY_FACTORY,
+)
+from icarus.execution import (
+    NetworkModel,
+    NetworkView,
+    NetworkController,
+    CollectorProxy,
+)
+from icarus.util import path_links
+
+COLLECTORS = ["CACHE_HIT_RATIO", "LATENCY", "LINK_LOAD", "PATH_STRETCH"]
+
+
+class LoopCollectorProxy(CollectorProxy):
+    """Collector proxy looping over the collectors handling each event, as
+    done before dispatchers were generated"""
+
+    def _dispatcher(self, event):
+        collectors = self.collectors[event]
+
+        def dispatch(*args):
+            for c in collectors:
+                getattr(c, event)(*args)
+
+        return dispatch
+
+    def handles(self, event):
+        return True
+
+
+def setup(proxy):
+    """Build a controller with the default collectors attached to a proxy of
+    the given class"""
+    topology = TOPOLOGY_FACTORY["GEANT"]()
+    CACHE_PLACEMENT["UNIFORM"](topology, cache_budget=1000)
+    CONTENT_PLACEMENT["UNIFORM"](topology, range(1, 1001), seed=0)
+    model = NetworkModel(topology, cache_policy={"name": "LRU"})
+    view = NetworkView(model)
+    controller = NetworkController(model)
+    collectors = [DATA_COLLECTOR[name](view) for name in COLLECTORS]
+    controller.attach_collector(proxy(view, collectors))
+    receiver = next(v for v in topology if topology.nodes[v]["stack"][0] == "receiver")
+    return controller, view.shortest_path(receiver, view.content_source(1))
+
+
+def run(controller, path, n_calls, log):
+    """Return the time per call in nanoseconds of each controller method
+    reporting an event"""
+    links = path_links(path)
+    cache = next(v for v in path if v in controller.model.cache)
+    calls = {
+        "request_hop": lambda: [controller.forward_request_hop(u, v) for u, v in links],
+        "content_hop": lambda: [controller.forward_content_hop(v, u) for u, v in links],
+        "request_path": lambda: controller.forward_request_path(path[0], path[-1]),
+        "cache_miss": lambda: controller.get_content(cache),
+    }
+    n_events = {"request_hop": len(links), "content_hop": len(links)}
+    # Time sessions without events first, to only count the time of events
+    start = time.perf_counter()
+    for t in range(n_calls):
+        controller.start_session(t, path[0], 1, log)
+        controller.end_session()
+    session_elapsed = time.perf_counter() - start
+    timing = {"session": 10 ** 9 * session_elapsed / n_calls}
+    for event, call in calls.items():
+        start = time.perf_counter()
+        for t in range(n_calls):
+            controller.start_session(t, path[0], 1, log)
+            call()
+            controller.end_session()
+        elapsed = time.perf_counter() - start - session_elapsed
+        timing[event] = 10 ** 9 * elapsed / (n_calls * n_events.get(event, 1))
+    return timing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-calls", type=int, default=10 ** 5)
+    args = parser.parse_args()
+    overheads = {}
+    for name, proxy in (("loop", LoopCollectorProxy), ("generated", CollectorProxy)):
+        controller, path = setup(proxy)
+        logged = run(controller, path, args.n_calls, True)
+        unlogged = run(controller, path, args.n_calls, False)
+        overheads[name] = {event: logged[event] - unlogged[event] for event in logged}
+    print("Path of %d hops, overhead in ns/event" % (len(path) - 1))
+    print("%-14s %10s %10s" % ("", "loop", "generated"))
+    for event in overheads["loop"]:
+        print(
+            "%-14s %10.0f %10.0f"
+            % (event, overheads["loop"][event], overheads["generated"][event])
+        )
+
+if __name__ == "__main__":
+    main()
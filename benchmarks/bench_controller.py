@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Benchmark the cost of the network controller API per request.
+
+This script replays on the GEANT topology the sequence of controller calls
+issued by an LCE strategy for each request, i.e. opening a session, looking
+up all nodes on the path to the source, forwarding request and content hop by
+hop, inserting the content in all caches on the path and closing the session.
+Requests are replayed both with and without logging and the average time per
+request is reported.
+
+Usage: python benchmarks/bench_controller.py [--n-requests N]
+"""
+import argparse
+import random
+import time
+
+from icarus.registry import (
+    CACHE_PLACEMENT,
+    CONTENT_PLACEMENT,
+    DATA_COLLECTOR,
+    TOPOLOGY_FACTORY,
+)
+from icarus.execution import (
+    NetworkModel,
+    NetworkView,
+    NetworkController,
+    CollectorProxy,
+)
+from icarus.util import path_links
+
+
+def setup(n_contents, n_requests, seed):
+    """Build the controller and the requests of the benchmark scenario"""
+    topology = TOPOLOGY_FACTORY["GEANT"]()
+    contents = range(1, n_contents + 1)
+    CACHE_PLACEMENT["UNIFORM"](topology, cache_budget=n_contents // 100)
+    CONTENT_PLACEMENT["UNIFORM"](topology, contents, seed=seed)
+    model = NetworkModel(topology, cache_policy={"name": "LRU"})
+    view = NetworkView(model)
+    controller = NetworkController(model)
+    collectors = [DATA_COLLECTOR[name](view) for name in ("CACHE_HIT_RATIO",)]
+    controller.attach_collector(CollectorProxy(view, collectors))
+    rand = random.Random(seed)
+    receivers = [
+        v for v in topology.nodes() if topology.nodes[v]["stack"][0] == "receiver"
+    ]
+    requests = []
+    for _ in range(n_requests):
+        receiver = rand.choice(receivers)
+        content = rand.choice(contents)
+        path = view.shortest_path(receiver, view.content_source(content))
+        requests.append((receiver, content, path_links(path), path[1:]))
+    return controller, requests
+
+
+def run(controller, requests, log):
+    """Replay all requests and return the average time per request in
+    microseconds"""
+    start = time.perf_counter()
+    for t, (receiver, content, links, nodes) in enumerate(requests):
+        controller.start_session(t, receiver, content, log)
+        for u, v in links:
+            controller.forward_request_hop(u, v)
+        for v in nodes:
+            controller.get_content(v)
+        for u, v in reversed(links):
+            controller.forward_content_hop(v, u)
+        for v in nodes:
+            controller.put_content(v)
+        controller.end_session()
+    return 10 ** 6 * (time.perf_counter() - start) / len(requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-requests", type=int, default=2 * 10 ** 5)
+    parser.add_argument("--n-contents", type=int, default=10 ** 5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    controller, requests = setup(args.n_contents, args.n_requests, args.seed)
+    for name, log in (("logged", True), ("unlogged", False)):
+        print("%-10s %8.2f us/request" % (name, run(controller, requests, log)))
+
+
+if __name__ == "__main__":
+    main()
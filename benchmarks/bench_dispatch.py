@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Benchmark the overhead of dispatching experiments to worker processes.
+
+This script runs a campaign of many short experiments on the GEANT topology,
+each executing only a few requests, so that the run time is dominated by the
+cost of dispatching experiments to the processes of the pool and collecting
+their results. The campaign is run by the orchestrator, which installs
+settings and topologies once in each worker, and by a pool to which the full
+settings are passed with each experiment, as done by earlier versions of the
+orchestrator. Since settings include the queue of all experiments, the size
+of each job grows with the size of the campaign in the latter case.
+
+Usage: python benchmarks/bench_dispatch.py [--n-experiments N] [--n-processes N]
+"""
+import argparse
+import logging
+import multiprocessing as mp
+import time
+
+from icarus.orchestration import Orchestrator, run_scenario
+from icarus.util import Settings, Tree
+
+
+def settings(n_experiments, n_processes):
+    """Return the settings of a campaign of short experiments"""
+    settings = Settings()
+    settings.DATA_COLLECTORS = ["CACHE_HIT_RATIO"]
+    settings.PARALLEL_EXECUTION = True
+    settings.N_PROCESSES = n_processes
+    settings.N_REPLICATIONS = 1
+    settings.SCENARIO_CACHE = True
+    settings.EXPERIMENT_QUEUE = []
+    for i in range(n_experiments):
+        experiment = Tree()
+        experiment["topology"]["name"] = "GEANT"
+        experiment["workload"] = {
+            "name": "STATIONARY",
+            "n_contents": 1000,
+            "n_warmup": 10,
+            "n_measured": 10,
+            "alpha": 0.8,
+            "rate": 1,
+            "seed": i,
+        }
+        experiment["cache_placement"]["name"] = "UNIFORM"
+        experiment["cache_placement"]["network_cache"] = 0.01
+        experiment["content_placement"] = {"name": "UNIFORM", "seed": 0}
+        experiment["cache_policy"]["name"] = "LRU"
+        experiment["strategy"]["name"] = "LCE"
+        settings.EXPERIMENT_QUEUE.append(experiment)
+    settings.freeze()
+    return settings
+
+
+def run_orchestrator(settings):
+    """Run the campaign with the orchestrator"""
+    orch = Orchestrator(settings)
+    orch.run()
+    return orch.n_success
+
+
+def run_settings_per_job(settings):
+    """Run the campaign passing settings with each experiment"""
+    pool = mp.Pool(settings.N_PROCESSES)
+    n_exp = len(settings.EXPERIMENT_QUEUE)
+    jobs = [
+        pool.apply_async(run_scenario, args=(settings, experiment, i + 1, n_exp))
+        for i, experiment in enumerate(settings.EXPERIMENT_QUEUE)
+    ]
+    n_success = sum(1 for job in jobs if job.get() is not None)
+    pool.close()
+    pool.join()
+    return n_success
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-experiments", type=int, default=4000)
+    parser.add_argument("--n-processes", type=int, default=mp.cpu_count())
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    campaign = settings(args.n_experiments, args.n_processes)
+    for name, run in (
+        ("settings per job", run_settings_per_job),
+        ("worker initializer", run_orchestrator),
+    ):
+        start = time.perf_counter()
+        n_success = run(campaign)
+        elapsed = time.perf_counter() - start
+        assert n_success == args.n_experiments
+        print(
+            "%-20s %8.2f s %8.2f ms/experiment"
+            % (name, elapsed, 1000 * elapsed / args.n_experiments)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Benchmark the throughput of the simulation engine.
+
+This script measures the number of events per second processed by the
+simulation engine on the GEANT topology using the LCE strategy and LRU caches,
+both with the per-event loop and with the batched event loop.
+
+Usage: python benchmarks/bench_engine.py [--batch-size N] [--n-events N]
+"""
+import argparse
+import time
+
+from icarus.registry import (
+    CACHE_PLACEMENT,
+    CONTENT_PLACEMENT,
+    TOPOLOGY_FACTORY,
+    WORKLOAD,
+)
+from icarus.execution import exec_experiment
+
+
+def setup(n_contents, n_warmup, n_measured, seed):
+    """Build topology and workload of the benchmark scenario"""
+    topology = TOPOLOGY_FACTORY["GEANT"]()
+    workload = WORKLOAD["STATIONARY"](
+        topology,
+        n_contents=n_contents,
+        alpha=0.8,
+        n_warmup=n_warmup,
+        n_measured=n_measured,
+        seed=seed,
+    )
+    CACHE_PLACEMENT["UNIFORM"](topology, cache_budget=n_contents // 100)
+    CONTENT_PLACEMENT["UNIFORM"](topology, workload.contents, seed=seed)
+    return topology, workload
+
+
+def run(batch_size, n_contents, n_warmup, n_measured, seed):
+    """Run one experiment and return the number of events per second"""
+    topology, workload = setup(n_contents, n_warmup, n_measured, seed)
+    start = time.perf_counter()
+    exec_experiment(
+        topology,
+        workload,
+        netconf={},
+        strategy={"name": "LCE"},
+        cache_policy={"name": "LRU"},
+        collectors={"CACHE_HIT_RATIO": {}, "LATENCY": {}},
+        batch_size=batch_size,
+    )
+    return (n_warmup + n_measured) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=10 ** 4)
+    parser.add_argument("--n-events", type=int, default=2 * 10 ** 5)
+    parser.add_argument("--n-contents", type=int, default=10 ** 5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    n_warmup = args.n_events // 4
+    n_measured = args.n_events - n_warmup
+    for name, batch_size in (("per-event", None), ("batched", args.batch_size)):
+        rate = run(batch_size, args.n_contents, n_warmup, n_measured, args.seed)
+        print("%-10s %12.0f events/s" % (name, rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Benchmark shortest path recomputation after link failures.
+
+This script runs a failure-injection workload on a RocketFuel topology, in
+which random links fail and are then restored, and measures the time taken
+to update shortest paths after each event by recomputing all paths from
+scratch or by repairing only the shortest path trees affected.
+
+Usage: python benchmarks/bench_path_repair.py [--asn ASN] [--n-failures N]
+       [--batch N]
+"""
+import argparse
+import random
+import time
+
+import fnss
+
+from icarus.registry import TOPOLOGY_FACTORY
+from icarus.execution.network import NetworkModel, NetworkController, PathStore
+
+
+def failure_events(topology, n_failures, batch, seed):
+    """Return a list of batches of links failing and being restored"""
+    rnd = random.Random(seed)
+    links = sorted(topology.edges(), key=str)
+    events = []
+    for _ in range(n_failures):
+        failed = rnd.sample(links, batch)
+        events.append(("remove", failed))
+        events.append(("restore", failed))
+    return events
+
+
+def run(topology, events, incremental):
+    """Execute the failure events and return total path update time"""
+    model = NetworkModel(topology, cache_policy={"name": "NULL"})
+    controller = NetworkController(model)
+    nodes = model.shortest_path.nodes
+    duration = 0
+    for action, links in events:
+        for u, v in links:
+            if action == "remove":
+                controller.remove_link(u, v, recompute_paths=False)
+            else:
+                controller.restore_link(u, v, recompute_paths=False)
+        start = time.perf_counter()
+        if incremental:
+            controller.update_paths()
+        else:
+            model.shortest_path = PathStore(model.topology, nodes)
+            model.path_changes = []
+        duration += time.perf_counter() - start
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--asn", type=int, default=3257)
+    parser.add_argument("--n-failures", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=1, help="links per failure")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    topology = TOPOLOGY_FACTORY["ROCKET_FUEL"](asn=args.asn)
+    # Content placement is not needed to compute paths
+    for v in topology.nodes():
+        if fnss.get_stack(topology, v)[0] == "source":
+            fnss.add_stack(topology, v, "source", {"contents": []})
+    events = failure_events(topology, args.n_failures, args.batch, args.seed)
+    full = run(topology.copy(), events, incremental=False)
+    incremental = run(topology.copy(), events, incremental=True)
+    print("Topology: ROCKET_FUEL %d, %d path updates" % (args.asn, len(events)))
+    print("full:        %8.3f s (%.1f ms/update)" % (full, 1000 * full / len(events)))
+    print(
+        "incremental: %8.3f s (%.1f ms/update)"
+        % (incremental, 1000 * incremental / len(events))
+    )
+
+
+if __name__ == "__main__":
+    main()
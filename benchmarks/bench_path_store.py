@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""Benchmark memory usage and build time of all-pair shortest paths.
+
+This script compares the dictionary of dictionaries of paths built by
+networkx with the compact path store used by the network model on the
+RocketFuel topologies.
+
+Usage: python benchmarks/bench_path_store.py [ASN ...]
+"""
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+
+from icarus.registry import TOPOLOGY_FACTORY
+from icarus.execution.network import PathStore, symmetrify_paths
+
+
+def measure(build):
+    """Return build time and memory retained by the object built"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    duration = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return duration, memory
+
+
+def main():
+    asns = [int(asn) for asn in sys.argv[1:]] or [1221, 1239, 3257]
+    print(
+        "%-6s %6s %10s %12s %10s %12s"
+        % ("ASN", "nodes", "dict (s)", "dict (MB)", "store (s)", "store (MB)")
+    )
+    for asn in asns:
+        topology = TOPOLOGY_FACTORY["ROCKET_FUEL"](asn=asn)
+        dict_time, dict_mem = measure(
+            lambda: symmetrify_paths(dict(nx.all_pairs_dijkstra_path(topology)))
+        )
+        store_time, store_mem = measure(lambda: PathStore(topology))
+        print(
+            "%-6d %6d %10.2f %12.1f %10.2f %12.1f"
+            % (
+                asn,
+                topology.number_of_nodes(),
+                dict_time,
+                dict_mem / 2 ** 20,
+                store_time,
+                store_mem / 2 ** 20,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
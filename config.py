@@ -64,6 +64,11 @@ This figure below represents the parameter structure accepted by Icarus:
  |        |----- ..................
  |        |----- cache_policy arg N
  |
+ |--- netconf (optional)
+ |        |----- network model arg 1
+ |        |----- ......................
+ |        |----- network model arg N
+ |
 
 
 Here below are listed all components currently provided by Icarus and lists
@@ -181,6 +186,19 @@ cache_policy
        * segments: int, optional, default=2. Number of segments
 
 
+netconf
+-------
+ * args:
+    * shortest_path: str, optional. If "lazy", shortest paths are computed on
+      demand, one source at a time, instead of all at once before the
+      simulation starts. It is useful for large topologies
+    * path_cache_size: int, optional. Maximum number of shortest path trees
+      kept in memory if shortest_path is "lazy". Unbounded if not specified
+    * path_info_cache_size: int, optional, default=65536. Maximum number of
+      paths whose information (links and delay) is kept in memory to report
+      path-level events to data collectors
+
+
 desc
 ----
 string describing the experiment (used to print on screen progress information)
@@ -215,6 +233,37 @@ PARALLEL_EXECUTION = True
 # This option is ignored if PARALLEL_EXECUTION = False
 N_PROCESSES = cpu_count()
 
+# Maximum number of experiments submitted to the processes and not yet
+# completed at any time. Experiments are submitted longest first, as estimated
+# from topology size and number of requests. Setting it lower than N_PROCESSES
+# limits the memory used by large scenarios executed concurrently.
+# If not set, all experiments are submitted at once.
+# This option is ignored if PARALLEL_EXECUTION = False
+# MAX_INFLIGHT = 2
+
+# Memory, in bytes, available to the processes running simulations in
+# parallel. The number of processes is reduced below N_PROCESSES if the
+# memory estimated for the largest experiments executed concurrently exceeds
+# it. If not set, it is the memory available when simulations start.
+# Memory and run time of experiments can be estimated with icarus run --plan.
+# This option is ignored if PARALLEL_EXECUTION = False
+# MAX_MEMORY = 16 * 2 ** 30
+
+# Address on which experiments are handed out to workers, if the simulator is
+# run with icarus run --serve. Workers are started on any host with
+# icarus worker -k AUTHKEY HOST:PORT. Connections are authenticated by
+# SERVE_AUTHKEY, which must be passed to workers with the --authkey option.
+# If it is not set, a random key is generated and logged when the
+# orchestrator starts. Since workers and orchestrator exchange pickled
+# objects, the address must only be reachable from trusted hosts. By default,
+# only workers running on the same host can connect. To serve workers on
+# other hosts, listen e.g. on all interfaces with SERVE_ADDRESS = "127.0.0.1:50000".
+# The experiments of a worker not heard from for SERVE_HEARTBEAT_TIMEOUT
+# seconds are handed out to other workers.
+SERVE_ADDRESS = "127.0.0.1:50000"
+# SERVE_AUTHKEY = "change me"
+SERVE_HEARTBEAT_TIMEOUT = 60
+
 # Format in which results are saved.
 # Result readers and writers are located in module ./icarus/results/readwrite.py
 # Currently only PICKLE is supported
@@ -224,6 +273,88 @@ RESULTS_FORMAT = "PICKLE"
 # This is necessary for extracting confidence interval of selected metrics
 N_REPLICATIONS = 3
 
+# Seed of the campaign. Components of experiments accepting a seed (topology,
+# workload, cache placement, content placement, strategy and cache policy)
+# which are not given one in the experiment are seeded with values derived
+# from SEED, the index of the replication and the component only. Hence the
+# same replication of experiments differing e.g. only in strategy runs on the
+# same requests and placements (common random numbers), which reduces the
+# variance of the differences between their results, and campaigns are
+# reproducible. Comment out to seed these components randomly
+SEED = 0
+
+# Number of segments into which the measured requests of each replication
+# are split. Segments are executed in parallel as independent experiments,
+# each warming up its caches with all warmup requests and measuring its share
+# of measured requests, and the states of their data collectors are merged
+# into the results of the replication. This lets a campaign of few long
+# experiments use all processes, at the cost of executing warmup requests
+# once per segment. If not set, replications are not split
+# N_SEGMENTS = 1
+
+# If True, N_REPLICATIONS is the minimum number of replications of each
+# experiment and further replications are executed until the confidence
+# intervals of the means of the REPLICATIONS_METRICS, i.e. (collector, metric)
+# tuples, are narrower than REPLICATIONS_CI_WIDTH times the mean, or until
+# MAX_REPLICATIONS replications are executed.
+# Note that replications of experiments whose workloads and content
+# placements are seeded in the experiment produce identical results.
+ADAPTIVE_REPLICATIONS = False
+REPLICATIONS_METRICS = [("CACHE_HIT_RATIO", "MEAN"), ("LATENCY", "MEAN")]
+REPLICATIONS_CI_WIDTH = 0.05
+REPLICATIONS_CONFIDENCE = 0.95
+MAX_REPLICATIONS = 20
+
+# If True, the numbers of warmup and measured requests of workloads are
+# upper bounds and the actual numbers are chosen while experiments run:
+# warmup ends when the MSER-5 rule detects the steady state of the cache hit
+# ratio, observed over blocks of obs_size requests, and measurement ends when
+# the confidence interval of the cache hit ratio, computed with batch means of
+# batch_size requests, is narrower than ci_width times its mean.
+# The numbers chosen are stored in results under the STEADY_STATE key.
+# Events are executed one at a time, regardless of BATCH_SIZE.
+STEADY_STATE_DETECTION = False
+STEADY_STATE_PARAMS = {
+    "obs_size": 200,
+    "batch_size": 1000,
+    "ci_width": 0.05,
+    "confidence": 0.95,
+}
+
+# Number of events executed in each block of the batched event loop.
+# If set, workloads implementing batched generation (e.g. STATIONARY) produce
+# events in blocks of arrays which are processed by the strategy in one call.
+# Comment out or set to None to execute events one at a time
+# BATCH_SIZE = 10 ** 4
+
+# If True, the wall-clock and CPU time of each phase of each experiment (e.g.
+# topology construction, content placement, warmup and measured events), the
+# event rate and the peak memory of the process are recorded and stored in
+# the results under the INSTRUMENTATION key. They can be shown with
+# icarus results print --instrumentation RESULTS
+INSTRUMENTATION = False
+
+# Interval, in seconds of CPU time, between two samples of the sampling
+# profiler enabled by icarus run --profile
+PROFILE_INTERVAL = 0.005
+
+# If True, each process running experiments caches the scenarios it builds,
+# i.e. topologies with caches and contents placed, and their shortest paths.
+# Experiments with the same topology, workload, cache placement and content
+# placement, e.g. differing only in strategy or cache policy, then reuse them.
+# Only scenarios built deterministically, i.e. with all seeds specified or
+# derived from SEED, are cached. Results are identical to those obtained without caching
+SCENARIO_CACHE = True
+
+# Maximum number of scenarios and of shortest path tables kept in memory by
+# each process
+SCENARIO_CACHE_SIZE = 4
+
+# If set, cached scenarios are also stored in this directory and can be
+# reused by other processes and later runs. Entries are not invalidated if
+# the code building scenarios changes, so clear it after changing it
+# SCENARIO_CACHE_DIR = "scenario_cache"
+
 # List of metrics to be measured in the experiments
 # The implementation of data collectors are located in ./icarus/execution/collectors.py
 # Remove collectors not needed
@@ -308,6 +439,9 @@ default["cache_placement"]["name"] = "UNIFORM"
 default["content_placement"]["name"] = "UNIFORM"
 default["cache_policy"]["name"] = CACHE_POLICY
 
+# Uncomment to compute shortest paths on demand rather than all at once
+# default["netconf"]["shortest_path"] = "lazy"
+
 # Create experiments multiplexing all desired parameters
 for alpha in ALPHA:
     for strategy in STRATEGIES:
@@ -0,0 +1,321 @@
+"""Execution of experiments by workers running on multiple hosts.
+
+A campaign can be executed by worker processes running on any number of
+hosts. The orchestrator of the campaign runs a coordinator, which hands out
+jobs to workers over TCP and collects their results. Settings shared by all
+jobs are fetched once by each worker rather than sent with each job. Workers
+request a job whenever they are idle and periodically send heartbeats to the
+coordinator. If a worker does not send any heartbeat for a configured time,
+the jobs assigned to it are handed out again to other workers.
+
+Communication relies on `multiprocessing.managers`, hence objects are
+exchanged in pickle format and connections are authenticated with a shared
+key. Since unpickling data can execute arbitrary code, the coordinator must
+only be reachable from trusted hosts.
+"""
+import collections
+import logging
+import queue
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+__all__ = [
+    "Coordinator",
+    "CoordinatorClient",
+    "parse_address",
+    "serve_coordinator",
+]
+
+
+logger = logging.getLogger("distributed")
+
+
+class Coordinator:
+    """Coordinator of the execution of jobs by remote workers.
+
+    Jobs are handed out in the order they are provided. The results of the
+    jobs are put in the *results* queue as soon as they are received, as
+    (job, result) tuples.
+
+    All methods are thread-safe, since they are called concurrently by the
+    threads serving the connections of the workers.
+    """
+
+    def __init__(self, jobs, heartbeat_timeout=60.0, settings=None):
+        """Constructor
+
+        Parameters
+        ----------
+        jobs : list
+            The jobs to execute. Each job is an object passed to workers,
+            e.g. the tuple of arguments of `run_scenario` other than settings
+        heartbeat_timeout : float, optional
+            Time, in seconds, after which a worker which has not sent any
+            heartbeat is considered lost and its jobs are reassigned
+        settings : object, optional
+            The settings shared by all jobs, returned by `Coordinator.settings`
+        """
+        if heartbeat_timeout <= 0:
+            raise ValueError("heartbeat_timeout must be positive")
+        self.heartbeat_timeout = heartbeat_timeout
+        self._settings = settings
+        self.results = queue.SimpleQueue()
+        self.n_jobs = len(jobs)
+        self.n_done = 0
+        self._pending = collections.deque(enumerate(jobs))
+        self._next_job_id = len(jobs)
+        # Map ID of assigned jobs to (worker, job) tuples
+        self._assigned = {}
+        # Map workers to the time of their last heartbeat
+        self._last_seen = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        """*True* if the results of all jobs have been received"""
+        return self.n_done == self.n_jobs
+
+    def settings(self):
+        """Return the settings shared by all jobs"""
+        return self._settings
+
+    def get_job(self, worker):
+        """Assign a job to a worker
+
+        Parameters
+        ----------
+        worker : str
+            The identifier of the worker
+
+        Returns
+        -------
+        status : str
+            *JOB* if a job is assigned, *WAIT* if there are no jobs to assign
+            now but some may become available, because they are reassigned or
+            added, or *DONE* if the coordinator is closed
+        job_id : int
+            The identifier of the job assigned or *None*
+        job : object
+            The job assigned or *None*
+        """
+        with self._lock:
+            self._last_seen[worker] = time.monotonic()
+            if self._closed:
+                return "DONE", None, None
+            if not self._pending:
+                return "WAIT", None, None
+            job_id, job = self._pending.popleft()
+            self._assigned[job_id] = (worker, job)
+            return "JOB", job_id, job
+
+    def heartbeat(self, worker):
+        """Notify that a worker is alive
+
+        Parameters
+        ----------
+        worker : str
+            The identifier of the worker
+        """
+        with self._lock:
+            self._last_seen[worker] = time.monotonic()
+
+    def put_result(self, worker, job_id, result):
+        """Notify the result of a job
+
+        Results of jobs which have been reassigned to another worker are
+        discarded.
+
+        Parameters
+        ----------
+        worker : str
+            The identifier of the worker
+        job_id : int
+            The identifier of the job
+        result : object
+            The result of the job
+        """
+        with self._lock:
+            self._last_seen[worker] = time.monotonic()
+            if job_id not in self._assigned or self._assigned[job_id][0] != worker:
+                return
+            job = self._assigned.pop(job_id)[1]
+            self.n_done += 1
+        self.results.put((job, result))
+
+    def add_jobs(self, jobs):
+        """Add jobs to execute after those already pending
+
+        Parameters
+        ----------
+        jobs : list
+            The jobs
+        """
+        with self._lock:
+            for job in jobs:
+                self._pending.append((self._next_job_id, job))
+                self._next_job_id += 1
+            self.n_jobs += len(jobs)
+
+    def reassign_expired(self):
+        """Reassign the jobs of the workers which have not sent any heartbeat
+        for longer than the heartbeat timeout
+
+        Returns
+        -------
+        expired : list
+            The identifiers of expired workers
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                worker
+                for worker, last_seen in self._last_seen.items()
+                if now - last_seen > self.heartbeat_timeout
+            ]
+            for worker in expired:
+                del self._last_seen[worker]
+            for job_id, (worker, job) in list(self._assigned.items()):
+                if worker in expired:
+                    del self._assigned[job_id]
+                    self._pending.appendleft((job_id, job))
+        return expired
+
+    def close(self):
+        """Stop handing out jobs and let workers know that there are no more
+        jobs to execute"""
+        with self._lock:
+            self._closed = True
+
+
+class _CoordinatorManager(BaseManager):
+    """Manager connecting workers to a coordinator"""
+
+
+_CoordinatorManager.register("coordinator")
+
+
+def parse_address(address):
+    """Parse a *HOST:PORT* address
+
+    Parameters
+    ----------
+    address : str
+        The address. The host can be omitted, i.e. *:PORT*, to refer to all
+        interfaces
+
+    Returns
+    -------
+    address : tuple
+        The (host, port) tuple
+    """
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError("Invalid address {}, expected HOST:PORT".format(address))
+    return host, int(port)
+
+
+def serve_coordinator(coordinator, address, authkey):
+    """Serve a coordinator to remote workers
+
+    The coordinator is served by a daemon thread of the calling process until
+    it exits.
+
+    Parameters
+    ----------
+    coordinator : Coordinator
+        The coordinator
+    address : tuple
+        The (host, port) address to listen on. If the port is 0, a free port
+        is chosen
+    authkey : bytes
+        The key authenticating workers
+
+    Returns
+    -------
+    address : tuple
+        The (host, port) address listened on
+    """
+
+    class Manager(BaseManager):
+        pass
+
+    Manager.register(
+        "coordinator",
+        callable=lambda: coordinator,
+        exposed=("settings", "get_job", "heartbeat", "put_result"),
+    )
+    server = Manager(address=address, authkey=authkey).get_server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.address
+
+
+class CoordinatorClient:
+    """Connection of a worker to a remote coordinator.
+
+    Once connected, a heartbeat is sent to the coordinator every
+    *heartbeat_interval* seconds by a daemon thread until the client is
+    closed.
+    """
+
+    def __init__(
+        self, worker, address, authkey, heartbeat_interval=5.0, connect_timeout=60.0
+    ):
+        """Constructor
+
+        Parameters
+        ----------
+        worker : str
+            The identifier of the worker, unique among all workers
+        address : tuple
+            The (host, port) address of the coordinator
+        authkey : bytes
+            The key authenticating the worker
+        heartbeat_interval : float, optional
+            The interval between heartbeats, in seconds
+        connect_timeout : float, optional
+            The time, in seconds, during which connection is retried if the
+            coordinator is not reachable, e.g. because it has not started yet
+        """
+        self.worker = worker
+        manager = _CoordinatorManager(address=address, authkey=authkey)
+        deadline = time.monotonic() + connect_timeout
+        while True:
+            try:
+                manager.connect()
+                break
+            except ConnectionError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+        self._coordinator = manager.coordinator()
+        self._closed = threading.Event()
+        self._heartbeat = threading.Thread(
+            target=self._send_heartbeats, args=(heartbeat_interval,), daemon=True
+        )
+        self._heartbeat.start()
+
+    def _send_heartbeats(self, interval):
+        while not self._closed.wait(interval):
+            try:
+                self._coordinator.heartbeat(self.worker)
+            except (EOFError, OSError):
+                return
+
+    def settings(self):
+        """Return the settings shared by all jobs, see `Coordinator.settings`"""
+        return self._coordinator.settings()
+
+    def get_job(self):
+        """Request a job, see `Coordinator.get_job`"""
+        return self._coordinator.get_job(self.worker)
+
+    def put_result(self, job_id, result):
+        """Send the result of a job, see `Coordinator.put_result`"""
+        self._coordinator.put_result(self.worker, job_id, result)
+
+    def close(self):
+        """Stop sending heartbeats"""
+        self._closed.set()
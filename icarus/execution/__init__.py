@@ -3,3 +3,6 @@
 from .network import *
 from .collectors import *
 from .engine import *
+from .instrumentation import *
+from .profiler import *
+from .steadystate import *
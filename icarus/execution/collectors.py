@@ -8,12 +8,25 @@ latency, path stretch and link load.
 
 To create a new data collector, it is sufficient to create a new class
 inheriting from the `DataCollector` class and override all required methods.
+
+Traversal of links is reported both by per-hop events (`request_hop` and
+`content_hop`) and by path-level events (`request_path` and `content_path`),
+the latter reporting a whole path at once. Collectors must implement per-hop
+events if they need to know about link traversals and can additionally
+implement path-level events to process whole paths more efficiently. By
+default path-level events are split into per-hop events.
+
+Collectors can merge the state of other collectors of the same type, e.g.
+executed on independent replications or time segments of an experiment in
+other processes, so that their results are computed over the sessions of
+all of them. Collectors are pickled without their network view, hence they
+must not need it to compute results after being unpickled.
 """
 import collections
 
 from icarus.registry import register_data_collector
 from icarus.tools import cdf
-from icarus.util import Tree, inheritdoc
+from icarus.util import Tree, inheritdoc, path_links
 
 
 __all__ = [
@@ -30,6 +43,15 @@ __all__ = [
 class DataCollector:
     """Object collecting notifications about simulation events and measuring
     relevant metrics.
+
+    Events of a session are reported between `start_session` and
+    `end_session`, but collectors must not rely on their order within a
+    session. In particular, strategies reporting paths at once with
+    `request_path` and `content_path` report the request path after the
+    cache and server lookups on it, i.e. after `cache_hit`, `cache_miss` and
+    `server_hit`, and the content path before the content is inserted in the
+    caches on it, while strategies reporting each hop interleave hops with
+    lookups and insertions.
     """
 
     def __init__(self, view, **params):
@@ -127,6 +149,44 @@ class DataCollector:
         """
         pass
 
+    def request_path(self, path, main_path=True):
+        """Reports that a request has traversed all links of a path
+
+        The default implementation reports each link of the path to
+        `request_hop`. It may be reported after the lookups of the content
+        in the caches and server on the path, see `DataCollector`.
+
+        Parameters
+        ----------
+        path : PathInfo
+            The path, including its nodes, link identifiers and total delay
+        main_path : bool, optional
+            If *True*, indicates that the path is on the main path that will
+            lead to hit a content. It is normally used to calculate latency
+            correctly in multicast cases. Default value is *True*
+        """
+        for u, v in path_links(path.nodes):
+            self.request_hop(u, v, main_path)
+
+    def content_path(self, path, main_path=True):
+        """Reports that a content has traversed all links of a path
+
+        The default implementation reports each link of the path to
+        `content_hop`.
+
+        Parameters
+        ----------
+        path : PathInfo
+            The path, including its nodes, link identifiers and total delay
+        main_path : bool, optional
+            If *True*, indicates that this path is being traversed by content
+            that will be delivered to the receiver. This is needed to
+            calculate latency correctly in multicast cases. Default value is
+            *True*
+        """
+        for u, v in path_links(path.nodes):
+            self.content_hop(u, v, main_path)
+
     def end_session(self, success=True):
         """Reports that the session is closed, i.e. the content has been
         successfully delivered to the receiver or a failure blocked the
@@ -149,6 +209,27 @@ class DataCollector:
         """
         pass
 
+    def merge(self, other):
+        """Merge the state of another collector of the same type and with the
+        same parameters into this collector.
+
+        Once merged, the results of this collector are computed over the
+        sessions recorded by both collectors, e.g. means are pooled means
+        and CDFs are computed from the samples of both. Collectors must be
+        merged before computing their results.
+
+        Parameters
+        ----------
+        other : DataCollector
+            The collector to merge, possibly unpickled from another process
+        """
+        raise NotImplementedError("This method is not implemented")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["view"] = None
+        return state
+
 
 # Note: The implementation of CollectorProxy could be improved to avoid having
 # to rewrite almost identical methods, for example by playing with __dict__
@@ -161,6 +242,13 @@ class CollectorProxy(DataCollector):
     An instance of this class registers itself with the network controller and
     it receives notifications for all events. This class is responsible for
     dispatching events of interests to concrete collectors.
+
+    Dispatchers are generated when the proxy is created. An event handled by
+    a single collector is wired directly to the bound method of that
+    collector, while an event handled by several collectors is dispatched by
+    a generated function calling all of them in sequence. Events not handled
+    by any collector are no-ops and are reported as not handled by the
+    `handles` method, so that the network controller can skip them entirely.
     """
 
     EVENTS = (
@@ -171,9 +259,28 @@ class CollectorProxy(DataCollector):
         "server_hit",
         "request_hop",
         "content_hop",
+        "request_path",
+        "content_path",
         "results",
     )
 
+    # Path-level events are also dispatched to collectors only implementing
+    # the per-hop event they are split into by default
+    HOP_EVENTS = {"request_path": "request_hop", "content_path": "content_hop"}
+
+    # Parameters of the methods of each event, used to generate dispatchers
+    EVENT_PARAMS = {
+        "start_session": "timestamp, receiver, content",
+        "end_session": "success=True",
+        "cache_hit": "node",
+        "cache_miss": "node",
+        "server_hit": "node",
+        "request_hop": "u, v, main_path=True",
+        "content_hop": "u, v, main_path=True",
+        "request_path": "path, main_path=True",
+        "content_path": "path, main_path=True",
+    }
+
     def __init__(self, view, collectors):
         """Constructor
 
@@ -185,48 +292,64 @@ class CollectorProxy(DataCollector):
             List of instances of DataCollector that will be notified of events
         """
         self.view = view
+        self.instances = list(collectors)
         self.collectors = {
-            e: [c for c in collectors if e in type(c).__dict__] for e in self.EVENTS
+            e: [
+                c
+                for c in collectors
+                if e in type(c).__dict__ or self.HOP_EVENTS.get(e) in type(c).__dict__
+            ]
+            for e in self.EVENTS
         }
+        for event in self.EVENT_PARAMS:
+            setattr(self, event, self._dispatcher(event))
+
+    def _dispatcher(self, event):
+        """Return a function dispatching an event to all collectors handling
+        it"""
+        methods = [getattr(c, event) for c in self.collectors[event]]
+        if len(methods) == 1:
+            return methods[0]
+        params = self.EVENT_PARAMS[event]
+        args = ", ".join(param.split("=")[0] for param in params.split(", "))
+        body = "".join("    m%d(%s)\n" % (i, args) for i in range(len(methods)))
+        namespace = {"m%d" % i: m for i, m in enumerate(methods)}
+        exec("def %s(%s):\n%s" % (event, params, body or "    pass\n"), namespace)
+        return namespace[event]
+
+    def handles(self, event):
+        """Return whether an event is handled by at least one collector
 
-    @inheritdoc(DataCollector)
-    def start_session(self, timestamp, receiver, content):
-        for c in self.collectors["start_session"]:
-            c.start_session(timestamp, receiver, content)
-
-    @inheritdoc(DataCollector)
-    def cache_hit(self, node):
-        for c in self.collectors["cache_hit"]:
-            c.cache_hit(node)
-
-    @inheritdoc(DataCollector)
-    def cache_miss(self, node):
-        for c in self.collectors["cache_miss"]:
-            c.cache_miss(node)
+        Parameters
+        ----------
+        event : str
+            The name of the event, e.g. *cache_hit*
 
-    @inheritdoc(DataCollector)
-    def server_hit(self, node):
-        for c in self.collectors["server_hit"]:
-            c.server_hit(node)
+        Returns
+        -------
+        handles : bool
+            *True* if the event is dispatched to at least one collector,
+            *False* if it is discarded
+        """
+        return len(self.collectors[event]) > 0
 
     @inheritdoc(DataCollector)
-    def request_hop(self, u, v, main_path=True):
-        for c in self.collectors["request_hop"]:
-            c.request_hop(u, v, main_path)
+    def results(self):
+        return Tree(**{c.name: c.results() for c in self.collectors["results"]})
 
     @inheritdoc(DataCollector)
-    def content_hop(self, u, v, main_path=True):
-        for c in self.collectors["content_hop"]:
-            c.content_hop(u, v, main_path)
+    def merge(self, other):
+        if [c.name for c in self.instances] != [c.name for c in other.instances]:
+            raise ValueError("Cannot merge proxies of different collectors")
+        for collector, other_collector in zip(self.instances, other.instances):
+            collector.merge(other_collector)
 
-    @inheritdoc(DataCollector)
-    def end_session(self, success=True):
-        for c in self.collectors["end_session"]:
-            c.end_session(success)
+    def __getstate__(self):
+        # Dispatchers are generated functions, which cannot be pickled
+        return {"instances": self.instances}
 
-    @inheritdoc(DataCollector)
-    def results(self):
-        return Tree(**{c.name: c.results() for c in self.collectors["results"]})
+    def __setstate__(self, state):
+        self.__init__(None, state["instances"])
 
 
 @register_data_collector("LINK_LOAD")
@@ -248,12 +371,19 @@ class LinkLoadCollector(DataCollector):
         self.view = view
         self.req_count = collections.defaultdict(int)
         self.cont_count = collections.defaultdict(int)
+        # Counts of links traversed by path-level events, keyed by link id
+        self.req_path_count = collections.Counter()
+        self.cont_path_count = collections.Counter()
         if req_size <= 0 or content_size <= 0:
             raise ValueError("req_size and content_size must be positive")
         self.req_size = req_size
         self.content_size = content_size
         self.t_start = -1
         self.t_end = 1
+        # Duration of the sessions of merged collectors and types of the
+        # links traversed, recorded when pickled without the view
+        self.merged_duration = 0
+        self.link_types = {}
 
     @inheritdoc(DataCollector)
     def start_session(self, timestamp, receiver, content):
@@ -269,27 +399,70 @@ class LinkLoadCollector(DataCollector):
     def content_hop(self, u, v, main_path=True):
         self.cont_count[(u, v)] += 1
 
+    @inheritdoc(DataCollector)
+    def request_path(self, path, main_path=True):
+        self.req_path_count.update(path.links)
+
+    @inheritdoc(DataCollector)
+    def content_path(self, path, main_path=True):
+        self.cont_path_count.update(path.links)
+
+    def _resolve_links(self):
+        """Add the counts of path-level events to those of links and record
+        the type of the links traversed, using the view"""
+        if self.view is None:
+            return
+        for link_id, count in self.req_path_count.items():
+            self.req_count[self.view.link(link_id)] += count
+        for link_id, count in self.cont_path_count.items():
+            self.cont_count[self.view.link(link_id)] += count
+        self.req_path_count.clear()
+        self.cont_path_count.clear()
+        for link in set(self.req_count).union(self.cont_count):
+            if link not in self.link_types:
+                self.link_types[link] = self.view.link_type(*link)
+
+    def _link_counts(self):
+        """Return the numbers of requests and contents traversing each link,
+        including those of path-level events, without modifying the state of
+        the collector"""
+        req_count = collections.Counter(self.req_count)
+        cont_count = collections.Counter(self.cont_count)
+        if self.view is not None:
+            for link_id, count in self.req_path_count.items():
+                req_count[self.view.link(link_id)] += count
+            for link_id, count in self.cont_path_count.items():
+                cont_count[self.view.link(link_id)] += count
+        return req_count, cont_count
+
+    def _link_type(self, link):
+        """Return the type of a link, recorded or looked up in the view"""
+        if link in self.link_types:
+            return self.link_types[link]
+        return self.view.link_type(*link)
+
     @inheritdoc(DataCollector)
     def results(self):
-        duration = self.t_end - self.t_start
-        used_links = set(self.req_count.keys()).union(set(self.cont_count.keys()))
+        req_count, cont_count = self._link_counts()
+        duration = self.t_end - self.t_start + self.merged_duration
+        used_links = set(req_count.keys()).union(set(cont_count.keys()))
         link_loads = {
             link: (
-                self.req_size * self.req_count[link]
-                + self.content_size * self.cont_count[link]
+                self.req_size * req_count[link] + self.content_size * cont_count[link]
             )
             / duration
             for link in used_links
         }
+        link_types = {link: self._link_type(link) for link in used_links}
         link_loads_int = {
             link: load
             for link, load in link_loads.items()
-            if self.view.link_type(*link) == "internal"
+            if link_types[link] == "internal"
         }
         link_loads_ext = {
             link: load
             for link, load in link_loads.items()
-            if self.view.link_type(*link) == "external"
+            if link_types[link] == "external"
         }
         mean_load_int = (
             sum(link_loads_int.values()) / len(link_loads_int)
@@ -310,6 +483,23 @@ class LinkLoadCollector(DataCollector):
             }
         )
 
+    @inheritdoc(DataCollector)
+    def merge(self, other):
+        self._resolve_links()
+        other._resolve_links()
+        for link, count in other.req_count.items():
+            self.req_count[link] += count
+        for link, count in other.cont_count.items():
+            self.cont_count[link] += count
+        self.link_types.update(other.link_types)
+        # The load is averaged over the sum of the durations of all
+        # collectors, as their sessions may overlap, e.g. if replications
+        self.merged_duration += other.t_end - other.t_start + other.merged_duration
+
+    def __getstate__(self):
+        self._resolve_links()
+        return super().__getstate__()
+
 
 @register_data_collector("LATENCY")
 class LatencyCollector(DataCollector):
@@ -350,6 +540,16 @@ class LatencyCollector(DataCollector):
         if main_path:
             self.sess_latency += self.view.link_delay(u, v)
 
+    @inheritdoc(DataCollector)
+    def request_path(self, path, main_path=True):
+        if main_path:
+            self.sess_latency += path.delay
+
+    @inheritdoc(DataCollector)
+    def content_path(self, path, main_path=True):
+        if main_path:
+            self.sess_latency += path.delay
+
     @inheritdoc(DataCollector)
     def end_session(self, success=True):
         if not success:
@@ -365,6 +565,13 @@ class LatencyCollector(DataCollector):
             results["CDF"] = cdf(self.latency_data)
         return results
 
+    @inheritdoc(DataCollector)
+    def merge(self, other):
+        self.sess_count += other.sess_count
+        self.latency += other.latency
+        if self.cdf:
+            self.latency_data.extend(other.latency_data)
+
 
 @register_data_collector("CACHE_HIT_RATIO")
 class CacheHitRatioCollector(DataCollector):
@@ -451,14 +658,32 @@ class CacheHitRatioCollector(DataCollector):
             }
             results["PER_CONTENT"] = cont_hits
         if self.per_node:
-            for v in self.per_node_cache_hits:
-                self.per_node_cache_hits[v] /= n_sess
-            for v in self.per_node_server_hits:
-                self.per_node_server_hits[v] /= n_sess
-            results["PER_NODE_CACHE_HIT_RATIO"] = self.per_node_cache_hits
-            results["PER_NODE_SERVER_HIT_RATIO"] = self.per_node_server_hits
+            results["PER_NODE_CACHE_HIT_RATIO"] = {
+                v: hits / n_sess for v, hits in self.per_node_cache_hits.items()
+            }
+            results["PER_NODE_SERVER_HIT_RATIO"] = {
+                v: hits / n_sess for v, hits in self.per_node_server_hits.items()
+            }
         return results
 
+    @inheritdoc(DataCollector)
+    def merge(self, other):
+        self.sess_count += other.sess_count
+        self.cache_hits += other.cache_hits
+        self.serv_hits += other.serv_hits
+        if self.off_path_hits:
+            self.off_path_hit_count += other.off_path_hit_count
+        if self.cont_hits:
+            for content, hits in other.cont_cache_hits.items():
+                self.cont_cache_hits[content] += hits
+            for content, hits in other.cont_serv_hits.items():
+                self.cont_serv_hits[content] += hits
+        if self.per_node:
+            for v, hits in other.per_node_cache_hits.items():
+                self.per_node_cache_hits[v] += hits
+            for v, hits in other.per_node_server_hits.items():
+                self.per_node_server_hits[v] += hits
+
 
 @register_data_collector("PATH_STRETCH")
 class PathStretchCollector(DataCollector):
@@ -505,6 +730,14 @@ class PathStretchCollector(DataCollector):
     def content_hop(self, u, v, main_path=True):
         self.cont_path_len += 1
 
+    @inheritdoc(DataCollector)
+    def request_path(self, path, main_path=True):
+        self.req_path_len += len(path.links)
+
+    @inheritdoc(DataCollector)
+    def content_path(self, path, main_path=True):
+        self.cont_path_len += len(path.links)
+
     @inheritdoc(DataCollector)
     def end_session(self, success=True):
         if not success:
@@ -537,6 +770,17 @@ class PathStretchCollector(DataCollector):
             results["CDF_CONTENT"] = cdf(self.cont_stretch_data)
         return results
 
+    @inheritdoc(DataCollector)
+    def merge(self, other):
+        self.sess_count += other.sess_count
+        self.mean_req_stretch += other.mean_req_stretch
+        self.mean_cont_stretch += other.mean_cont_stretch
+        self.mean_stretch += other.mean_stretch
+        if self.cdf:
+            self.req_stretch_data.extend(other.req_stretch_data)
+            self.cont_stretch_data.extend(other.cont_stretch_data)
+            self.stretch_data.extend(other.stretch_data)
+
 
 @register_data_collector("DUMMY")
 class DummyCollector(DataCollector):
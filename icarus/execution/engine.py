@@ -4,7 +4,21 @@ The simulation engine, given the parameters according to which a single
 experiments needs to be run, instantiates all the required classes and executes
 the experiment by iterating through the event provided by an event generator
 and providing them to a strategy instance.
+
+If a batch size is specified and the workload supports it, events are instead
+retrieved in fixed-size blocks of arrays and each block is handed over to the
+`process_batch` method of the strategy.
+
+Events which are not logged, i.e. those of the cache warmup phase, are
+handed over to the `warmup_event` method of the strategy, which only updates
+the state of caches.
+
+If a steady state detector is specified, it decides which events are
+warmup or measured events and when the experiment ends, instead of the
+workload.
 """
+import numpy as np
+
 from icarus.execution import (
     NetworkModel,
     NetworkView,
@@ -12,12 +26,24 @@ from icarus.execution import (
     CollectorProxy,
 )
 from icarus.registry import DATA_COLLECTOR, STRATEGY
+from icarus.util import Tree
 
 
 __all__ = ["exec_experiment"]
 
 
-def exec_experiment(topology, workload, netconf, strategy, cache_policy, collectors):
+def exec_experiment(
+    topology,
+    workload,
+    netconf,
+    strategy,
+    cache_policy,
+    collectors,
+    batch_size=None,
+    instrumentation=None,
+    steady_state=None,
+    collector_state=False,
+):
     """Execute the simulation of a specific scenario.
 
     Parameters
@@ -42,12 +68,32 @@ def exec_experiment(topology, workload, netconf, strategy, cache_policy, collect
         The collectors to be used. It is a dictionary in which keys are the
         names of collectors to use and values are dictionaries of attributes
         for the collector they refer to.
+    batch_size : int, optional
+        If specified and the workload implements a `batches` method, events
+        are executed in blocks of *batch_size* events. Otherwise events are
+        executed one at a time.
+    instrumentation : Instrumentation, optional
+        If specified, the time taken to build the network model, the
+        collectors and the strategy, to execute warmup and measured events
+        and to compute results is recorded in it.
+    steady_state : SteadyStateDetector, optional
+        If specified, the log attribute of events is ignored and the detector
+        chooses the number of warmup and measured events, which are stored in
+        the results under the *STEADY_STATE* key. Events are then executed
+        one at a time, regardless of *batch_size*.
+    collector_state : bool, optional
+        If *True*, the results of collectors are not computed and the
+        `CollectorProxy` of the experiment is stored in the results under the
+        *COLLECTOR_STATE* key instead, so that it can be merged with those of
+        other executions of the experiment, see `DataCollector.merge`.
 
     Returns
     -------
     results : Tree
         A tree with the aggregated simulation results from all collectors
     """
+    if instrumentation is not None:
+        instrumentation.start("NETWORK_MODEL")
     model = NetworkModel(topology, cache_policy, **netconf)
     view = NetworkView(model)
     controller = NetworkController(model)
@@ -60,8 +106,106 @@ def exec_experiment(topology, workload, netconf, strategy, cache_policy, collect
 
     strategy_name = strategy["name"]
     strategy_args = {k: v for k, v in strategy.items() if k != "name"}
+    if instrumentation is not None:
+        instrumentation.stop("NETWORK_MODEL")
+        instrumentation.start("STRATEGY")
     strategy_inst = STRATEGY[strategy_name](view, controller, **strategy_args)
+    if instrumentation is not None:
+        instrumentation.stop("STRATEGY")
 
+    if steady_state is not None:
+        measuring = steady_state.measuring
+        if instrumentation is not None:
+            instrumentation.start("MEASURED" if measuring else "WARMUP")
+        for time, event in workload:
+            if measuring:
+                strategy_inst.process_event(
+                    time, event["receiver"], event["content"], True
+                )
+            else:
+                strategy_inst.warmup_event(time, event["receiver"], event["content"])
+            end = steady_state.update(controller.n_cache_hits)
+            if steady_state.measuring and not measuring:
+                measuring = True
+                if instrumentation is not None:
+                    instrumentation.stop("WARMUP", steady_state.n_warmup)
+                    instrumentation.start("MEASURED")
+            if end:
+                break
+        if instrumentation is not None:
+            if measuring:
+                instrumentation.stop("MEASURED", steady_state.n_measured)
+            else:
+                instrumentation.stop("WARMUP", steady_state.n_warmup)
+    elif batch_size and hasattr(workload, "batches"):
+        receivers = workload.receivers
+        batches = workload.batches(batch_size)
+        if instrumentation is not None:
+            batches = _timed_batches(batches, instrumentation)
+        for time, receiver, content, log in batches:
+            strategy_inst.process_batch(
+                time.tolist(),
+                [receivers[i] for i in receiver.tolist()],
+                content.tolist(),
+                log.tolist(),
+            )
+    else:
+        if instrumentation is not None:
+            workload = _timed_events(workload, instrumentation)
+        for time, event in workload:
+            if event.get("log", True):
+                strategy_inst.process_event(time, **event)
+            else:
+                strategy_inst.warmup_event(time, event["receiver"], event["content"])
+    if collector_state:
+        results = Tree(COLLECTOR_STATE=collector)
+    elif instrumentation is None:
+        results = collector.results()
+    else:
+        with instrumentation.phase("RESULTS"):
+            results = collector.results()
+    if steady_state is not None:
+        results["STEADY_STATE"] = steady_state.results()
+    return results
+
+
+def _timed_events(workload, instrumentation):
+    """Iterate over the events of a workload, timing each sequence of warmup
+    or measured events as a WARMUP or MEASURED phase"""
+    phase = None
+    n_events = 0
     for time, event in workload:
-        strategy_inst.process_event(time, **event)
-    return collector.results()
+        curr_phase = "MEASURED" if event.get("log", True) else "WARMUP"
+        if curr_phase != phase:
+            if phase is not None:
+                instrumentation.stop(phase, n_events)
+            phase = curr_phase
+            n_events = 0
+            instrumentation.start(phase)
+        n_events += 1
+        yield time, event
+    if phase is not None:
+        instrumentation.stop(phase, n_events)
+
+
+def _timed_batches(batches, instrumentation):
+    """Iterate over blocks of events, timing each sequence of warmup or
+    measured events as a WARMUP or MEASURED phase. Blocks mixing warmup and
+    measured events are split."""
+    phase = None
+    n_events = 0
+    for time, receiver, content, log in batches:
+        bounds = [0, *(np.flatnonzero(np.diff(log)) + 1), len(log)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            curr_phase = "MEASURED" if log[start] else "WARMUP"
+            if curr_phase != phase:
+                if phase is not None:
+                    instrumentation.stop(phase, n_events)
+                phase = curr_phase
+                n_events = 0
+                instrumentation.start(phase)
+            n_events += int(end - start)
+            segment = slice(start, end)
+            yield time[segment], receiver[segment], content[segment], log[segment]
+    if phase is not None:
+        instrumentation.stop(phase, n_events)
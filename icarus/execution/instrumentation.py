@@ -0,0 +1,157 @@
+"""Instrumentation of the execution of experiments
+
+This module provides a recorder of the wall-clock time, CPU time and number
+of events of the phases of an experiment, e.g. topology construction, content
+placement or execution of warmup and measured events, as well as of the peak
+memory used by the process executing it.
+
+Instrumentation is opt-in: it is enabled by setting *INSTRUMENTATION = True*
+in the configuration file, in which case measurements are stored with the
+results of each experiment under the *INSTRUMENTATION* key.
+"""
+import collections
+import contextlib
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+from icarus.util import Tree
+
+__all__ = ["Instrumentation", "instrumentation_report"]
+
+
+class Instrumentation:
+    """Recorder of the execution time of the phases of an experiment
+
+    Each phase is identified by a name. A phase can be started and stopped
+    several times, in which case its times and numbers of events are summed.
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.wall_time = collections.OrderedDict()
+        self.cpu_time = collections.OrderedDict()
+        self.n_events = collections.OrderedDict()
+        self._start = {}
+
+    def start(self, phase):
+        """Start timing a phase
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase
+        """
+        self._start[phase] = (time.perf_counter(), time.process_time())
+
+    def stop(self, phase, n_events=0):
+        """Stop timing a phase
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase
+        n_events : int, optional
+            The number of events executed since the phase was started
+        """
+        wall_start, cpu_start = self._start.pop(phase)
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+        self.wall_time[phase] = self.wall_time.get(phase, 0.0) + wall_time
+        self.cpu_time[phase] = self.cpu_time.get(phase, 0.0) + cpu_time
+        if n_events:
+            self.n_events[phase] = self.n_events.get(phase, 0) + n_events
+
+    @contextlib.contextmanager
+    def phase(self, phase):
+        """Context manager timing the block it wraps as a phase
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase
+        """
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.stop(phase)
+
+    def results(self):
+        """Return the measurements of all phases
+
+        Returns
+        -------
+        results : Tree
+            Tree with the wall-clock and CPU time (in seconds) of each phase,
+            the number of events and events per second of the phases
+            executing events and the peak resident set size of the process
+            (in bytes). The latter is the peak over the whole lifetime of the
+            process, hence it also covers previous experiments executed by
+            the same process. It is *None* if it cannot be measured.
+        """
+        events_per_sec = {
+            phase: n / self.wall_time[phase] if self.wall_time[phase] > 0 else None
+            for phase, n in self.n_events.items()
+        }
+        return Tree(
+            WALL_TIME=dict(self.wall_time),
+            CPU_TIME=dict(self.cpu_time),
+            N_EVENTS=dict(self.n_events),
+            EVENTS_PER_SEC=events_per_sec,
+            PEAK_RSS=peak_rss(),
+        )
+
+
+def peak_rss():
+    """Return the peak resident set size of the current process
+
+    Returns
+    -------
+    peak_rss : int
+        The peak resident set size in bytes or *None* if it cannot be measured
+        on this platform
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, other platforms kilobytes
+    return maxrss if sys.platform == "darwin" else 1024 * maxrss
+
+
+def instrumentation_report(results):
+    """Return a human-readable table of the instrumentation of an experiment
+
+    Parameters
+    ----------
+    results : Tree
+        The results of an experiment
+
+    Returns
+    -------
+    report : str
+        The table, with a row per phase, or a note if the experiment was not
+        instrumented
+    """
+    if "INSTRUMENTATION" not in results:
+        return "  Not instrumented\n"
+    instr = results["INSTRUMENTATION"]
+    output = "  {:<20}{:>12}{:>12}{:>14}\n".format(
+        "PHASE", "WALL (s)", "CPU (s)", "EVENTS/S"
+    )
+    for phase, wall_time in instr["WALL_TIME"].items():
+        events_per_sec = instr["EVENTS_PER_SEC"].get(phase)
+        output += "  {:<20}{:>12.3f}{:>12.3f}{:>14}\n".format(
+            phase,
+            wall_time,
+            instr["CPU_TIME"][phase],
+            "-" if events_per_sec is None else "{:.0f}".format(events_per_sec),
+        )
+    if instr["PEAK_RSS"] is not None:
+        output += "  PEAK RSS: {:.1f} MB\n".format(instr["PEAK_RSS"] / 2 ** 20)
+    return output
@@ -13,7 +13,10 @@ The `NetworkController` is also responsible to notify a `DataCollectorProxy`
 of all relevant events.
 """
 import logging
+from collections import OrderedDict
+from collections.abc import Mapping
 
+import numpy as np
 import networkx as nx
 import fnss
 
@@ -51,6 +54,645 @@ def symmetrify_paths(shortest_paths):
     return shortest_paths
 
 
+def predecessor_matrix(topology, nodes=None):
+    """Return the predecessor matrix of the shortest path trees of a topology
+
+    Shortest paths are computed with the same Dijkstra implementation used by
+    `networkx.all_pairs_dijkstra_path`, hence ties between equal-cost paths
+    are broken in the same way.
+
+    Parameters
+    ----------
+    topology : Topology
+        The topology
+    nodes : list, optional
+        The nodes of the topology, in the order used to index the matrix. If
+        not specified, the order of `topology.nodes()` is used
+
+    Returns
+    -------
+    pred : 2-d array
+        Matrix where the element *pred[r, v]* is the index of the node
+        preceding node *v* on the shortest path from *r* to *v*, or -1 if *v*
+        is *r* or cannot be reached from *r*
+    """
+    if nodes is None:
+        nodes = list(topology.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    pred = np.full((len(nodes), len(nodes)), -1, dtype=np.int32)
+    for r, root in enumerate(nodes):
+        _tree_predecessors(topology, root, index, pred[r])
+    return pred
+
+
+def _tree_predecessors(topology, root, index, out):
+    """Write in *out* the indices of the predecessors of all nodes in the
+    shortest path tree rooted at *root*, or -1 for nodes not in the tree"""
+    out[:] = -1
+    if root not in topology:
+        return
+    pred = nx.dijkstra_predecessor_and_distance(topology, root)[0]
+    del pred[root]
+    if pred:
+        out[[index[v] for v in pred]] = [index[p[0]] for p in pred.values()]
+
+
+def _affects_tree(change, root, pred):
+    """Return whether a link change may modify a shortest path tree
+
+    Parameters
+    ----------
+    change : tuple
+        The link change, as recorded in `NetworkModel.path_changes`
+    root : any hashable type
+        The root of the tree
+    pred : dict
+        Dictionary mapping each node of the tree to its predecessor
+
+    Returns
+    -------
+    affects : bool
+        *True* if the tree may change, *False* if it certainly does not
+    """
+    kind, u, v = change[:3]
+    if kind == "remove" or kind == "detach":
+        return pred.get(v) == u or pred.get(u) == v
+    if kind == "attach":
+        return root == u or root == v or u in pred
+    weight, dist_u, dist_v = change[3:]
+    d_u = dist_u.get(root, np.inf)
+    d_v = dist_v.get(root, np.inf)
+    return (d_u < np.inf and d_u + weight <= d_v) or (
+        d_v < np.inf and d_v + weight <= d_u
+    )
+
+
+def compact_paths(pred, roots=None, max_pairs=2 ** 20):
+    """Encode the symmetric shortest paths of a predecessor matrix as a flat
+    array of node indices.
+
+    The path between nodes *i* and *j*, with *i <= j*, is extracted from the
+    shortest path tree rooted at *j*, which is equivalent to applying
+    `symmetrify_paths` to all-pair shortest paths computed iterating over
+    nodes in index order. The path of the pair is stored in
+    *flat[offsets[p]:offsets[p + 1]]*, where *p = j * (j + 1) // 2 + i*. The
+    slice is empty if *j* cannot be reached from *i*.
+
+    Parameters
+    ----------
+    pred : 2-d array
+        The predecessor matrix, as returned by `predecessor_matrix`
+    roots : array, optional
+        If specified, only encode the paths of the pairs *(i, j)* with *j* in
+        *roots*, in the order of *roots*. In this case offsets refer to the
+        pairs of the selected roots only
+    max_pairs : int, optional
+        Maximum number of pairs processed at once. It bounds the size of
+        temporary arrays
+
+    Returns
+    -------
+    offsets : array
+        Offsets of the path of each pair in the flat array
+    flat : array
+        Concatenation of the paths of all pairs
+    """
+    n = len(pred)
+    dtype = np.int16 if n <= np.iinfo(np.int16).max else np.int32
+    roots = np.arange(n) if roots is None else np.asarray(roots, dtype=np.int64)
+    lengths = []
+    flats = []
+    start = 0
+    while start < len(roots):
+        # Select a block of roots whose pairs do not exceed max_pairs
+        end = start + 1
+        n_pairs = roots[start] + 1
+        while end < len(roots) and n_pairs + roots[end] + 1 <= max_pairs:
+            n_pairs += roots[end] + 1
+            end += 1
+        J = np.repeat(roots[start:end], roots[start:end] + 1)
+        first = np.cumsum(roots[start:end] + 1) - (roots[start:end] + 1)
+        I = np.arange(len(J)) - np.repeat(first, roots[start:end] + 1)
+        # Compute the number of nodes of each path by walking up the trees
+        length = np.ones(len(J), dtype=np.int64)
+        cur = I.copy()
+        active = np.flatnonzero(cur != J)
+        while active.size:
+            nxt = pred[J[active], cur[active]]
+            length[active[nxt < 0]] = 0
+            active, nxt = active[nxt >= 0], nxt[nxt >= 0]
+            cur[active] = nxt
+            length[active] += 1
+            active = active[nxt != J[active]]
+        # Write the nodes of each path walking up the trees again
+        offsets = np.cumsum(length) - length
+        flat = np.empty(length.sum(), dtype=dtype)
+        cur = I
+        active = np.flatnonzero(length > 0)
+        k = 0
+        while active.size:
+            flat[offsets[active] + k] = cur[active]
+            k += 1
+            active = active[length[active] > k]
+            cur[active] = pred[J[active], cur[active]]
+        lengths.append(length)
+        flats.append(flat)
+        start = end
+    length = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.int64)
+    offsets = np.zeros(len(length) + 1, dtype=np.int64)
+    np.cumsum(length, out=offsets[1:])
+    flat = np.concatenate(flats) if flats else np.zeros(0, dtype=dtype)
+    return offsets, flat
+
+
+class PathStore(dict):
+    """Compact store of symmetric all-pair shortest paths
+
+    Nodes are relabelled to dense integers and all paths are stored in a
+    single flat array of node indices, indexed by an array of offsets. Paths
+    are decoded into lists of node labels only the first time they are
+    accessed.
+
+    The store is a dictionary keyed by origin node whose values are row views
+    of the paths from that origin, so that the path from *s* to *t* can be
+    retrieved as *store[s][t]*, like for a dictionary of dictionaries of
+    paths. Paths are identical to those returned by
+    `symmetrify_paths(dict(nx.all_pairs_dijkstra_path(topology)))`.
+    """
+
+    def __init__(self, topology, nodes=None, pred=None):
+        """Constructor
+
+        Parameters
+        ----------
+        topology : Topology
+            The topology
+        nodes : list, optional
+            The nodes of the topology, in the order used to index them. If not
+            specified, the order of `topology.nodes()` is used
+        pred : 2-d array, optional
+            The predecessor matrix of the topology. If not specified, it is
+            computed
+        """
+        self.nodes = list(topology.nodes()) if nodes is None else list(nodes)
+        self.index = {v: i for i, v in enumerate(self.nodes)}
+        self.pred = predecessor_matrix(topology, self.nodes) if pred is None else pred
+        self.offsets, self.flat = compact_paths(self.pred)
+        super().__init__((v, _PathRow(self, i)) for i, v in enumerate(self.nodes))
+
+    def __repr__(self):
+        return "<{} with {} nodes>".format(type(self).__name__, len(self.nodes))
+
+    def __reduce__(self):
+        return (_rebuild_path_store, (type(self), dict(self.__dict__)))
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        dict.update(self, ((v, _PathRow(self, i)) for i, v in enumerate(self.nodes)))
+
+    def path(self, s, t):
+        """Return the shortest path from *s* to *t*
+
+        Parameters
+        ----------
+        s : any hashable type
+            Origin node
+        t : any hashable type
+            Destination node
+
+        Returns
+        -------
+        path : list
+            List of nodes of the shortest path (origin and destination
+            included)
+        """
+        return self[s][t]
+
+    def repair(self, topology, changes):
+        """Return a store with paths updated after changes of the topology
+
+        Only the shortest path trees affected by the changes are recomputed.
+        A tree is affected by the removal of a link if it includes the link,
+        and by the addition of a link if the link provides a path to one of
+        its endpoints shorter than or as short as the current one. The paths
+        of the store returned are identical to those of a store built from
+        scratch on the changed topology with the same node order.
+
+        Nodes removed from the topology keep their index and are treated as
+        isolated nodes. If new nodes were added, the store is rebuilt.
+
+        Parameters
+        ----------
+        topology : Topology
+            The topology after the changes
+        changes : list of tuple
+            The link changes, as recorded in `NetworkModel.path_changes`
+
+        Returns
+        -------
+        store : PathStore
+            The updated store
+        """
+        nodes = self.nodes + [v for v in topology.nodes() if v not in self.index]
+        if len(nodes) > len(self.nodes):
+            return type(self)(topology, nodes)
+        index = self.index
+        pred = self.pred.copy()
+        dirty = np.zeros(len(nodes), dtype=bool)
+        for change in changes:
+            kind = change[0]
+            i, j = index[change[1]], index[change[2]]
+            if kind == "detach":
+                # Node j was a leaf and is now isolated
+                pred[:, j] = -1
+                pred[j] = -1
+            elif kind == "attach":
+                # Node j was isolated and is now a leaf attached to i
+                reachable = pred[:, i] >= 0
+                reachable[i] = True
+                pred[reachable, j] = i
+                dirty[j] = True
+            elif kind == "remove":
+                dirty |= (pred[:, j] == i) | (pred[:, i] == j)
+            else:
+                weight, dist_u, dist_v = change[3:]
+                d_u = np.array([dist_u.get(v, np.inf) for v in nodes])
+                d_v = np.array([dist_v.get(v, np.inf) for v in nodes])
+                dirty |= np.isfinite(d_u) & (d_u + weight <= d_v)
+                dirty |= np.isfinite(d_v) & (d_v + weight <= d_u)
+        for r in np.flatnonzero(dirty).tolist():
+            _tree_predecessors(topology, nodes[r], index, pred[r])
+        return type(self)(topology, nodes, pred)
+
+    def path_indices(self, i, j):
+        """Return the indices of the nodes of the path between two nodes
+
+        Parameters
+        ----------
+        i : int
+            Index of the origin node
+        j : int
+            Index of the destination node
+
+        Returns
+        -------
+        path : array
+            The indices of the nodes of the path, empty if there is no path
+        """
+        if i <= j:
+            p = j * (j + 1) // 2 + i
+            return self.flat[self.offsets[p] : self.offsets[p + 1]]
+        p = i * (i + 1) // 2 + j
+        return self.flat[self.offsets[p] : self.offsets[p + 1]][::-1]
+
+    def reachable(self, i):
+        """Return the indices of the nodes reachable from a node
+
+        Parameters
+        ----------
+        i : int
+            Index of the origin node
+
+        Returns
+        -------
+        nodes : array
+            Indices of the reachable nodes, in increasing order
+        """
+        reachable = self.pred[i] >= 0
+        reachable[i] = True
+        return np.flatnonzero(reachable)
+
+    def nbytes(self):
+        """Return the number of bytes used by the arrays of the store"""
+        return self.pred.nbytes + self.offsets.nbytes + self.flat.nbytes
+
+
+def _rebuild_path_store(cls, state):
+    store = cls.__new__(cls)
+    store.__setstate__(state)
+    return store
+
+
+class _PathRow(dict):
+    """Paths from a single origin node of a `PathStore`
+
+    This is a dictionary of the paths already decoded, that decodes further
+    paths on access and otherwise behaves as a dictionary of all paths
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        super().__init__()
+        self._store = store
+        self._index = index
+
+    def __missing__(self, t):
+        store = self._store
+        path = store.path_indices(self._index, store.index[t])
+        if len(path) == 0:
+            raise KeyError(t)
+        nodes = store.nodes
+        path = [nodes[v] for v in path.tolist()]
+        self[t] = path
+        return path
+
+    def __contains__(self, t):
+        if dict.__contains__(self, t):
+            return True
+        store = self._store
+        j = store.index.get(t)
+        if j is None:
+            return False
+        i = self._index
+        return i == j or store.pred[max(i, j), min(i, j)] >= 0
+
+    def __iter__(self):
+        nodes = self._store.nodes
+        return (nodes[j] for j in self._store.reachable(self._index).tolist())
+
+    def __len__(self):
+        return len(self._store.reachable(self._index))
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    def get(self, t, default=None):
+        return self[t] if t in self else default
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[t] for t in self]
+
+    def items(self):
+        return [(t, self[t]) for t in self]
+
+
+class LazyPathStore(dict):
+    """Store of symmetric shortest paths computed on demand
+
+    Shortest paths are computed one shortest path tree at a time, running
+    single-source Dijkstra the first time a path of the tree is requested.
+    Trees are kept in a table bounded in size and evicted in LRU order. The
+    number of table hits and misses are counted to help tuning its size.
+
+    Like `PathStore`, the store is a dictionary keyed by origin node whose
+    values are row views of the paths from that origin. The path between two
+    nodes is extracted from the tree rooted at the node that comes last in
+    the node order of the topology, so that paths are symmetric and identical
+    to those returned by
+    `symmetrify_paths(dict(nx.all_pairs_dijkstra_path(topology)))`.
+    """
+
+    def __init__(self, topology, cache_size=None, nodes=None):
+        """Constructor
+
+        Parameters
+        ----------
+        topology : Topology
+            The topology
+        cache_size : int, optional
+            The maximum number of shortest path trees kept in memory. If not
+            specified, trees are never evicted
+        nodes : list, optional
+            The nodes of the topology, in the order used to select the tree
+            from which paths are extracted. If not specified, the order of
+            `topology.nodes()` is used
+        """
+        if cache_size is not None and cache_size < 1:
+            raise ValueError("cache_size must be positive")
+        self.topology = topology
+        self.cache_size = cache_size
+        self.nodes = list(topology.nodes()) if nodes is None else list(nodes)
+        self.index = {v: i for i, v in enumerate(self.nodes)}
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+        super().__init__((v, _LazyPathRow(self, v)) for v in self.nodes)
+
+    def __repr__(self):
+        return "<{} with {} nodes>".format(type(self).__name__, len(self.nodes))
+
+    def __reduce__(self):
+        return (type(self), (self.topology, self.cache_size, self.nodes))
+
+    def tree(self, root):
+        """Return the shortest path tree rooted at a node
+
+        Parameters
+        ----------
+        root : any hashable type
+            The root node
+
+        Returns
+        -------
+        tree : tuple
+            A (pred, to_root, from_root) tuple, where pred is a dictionary
+            mapping each node reachable from the root to its predecessor
+            and to_root and from_root are dictionaries of the paths already
+            decoded, respectively towards and from the root, keyed by node
+        """
+        trees = self._trees
+        tree = trees.get(root)
+        if tree is not None:
+            self.hits += 1
+            trees.move_to_end(root)
+            return tree
+        self.misses += 1
+        if root in self.topology:
+            pred = nx.dijkstra_predecessor_and_distance(self.topology, root)[0]
+            pred = {v: p[0] for v, p in pred.items() if p}
+        else:
+            pred = {}
+        tree = trees[root] = (pred, {root: [root]}, {root: [root]})
+        if self.cache_size is not None and len(trees) > self.cache_size:
+            trees.popitem(last=False)
+        return tree
+
+    def path(self, s, t):
+        """Return the shortest path from *s* to *t*
+
+        Parameters
+        ----------
+        s : any hashable type
+            Origin node
+        t : any hashable type
+            Destination node
+
+        Returns
+        -------
+        path : list
+            List of nodes of the shortest path (origin and destination
+            included)
+        """
+        if self.index[s] < self.index[t]:
+            pred, to_root, _ = self.tree(t)
+            path = to_root.get(s)
+            if path is None:
+                path = to_root[s] = self._walk(pred, s, t)
+            return path
+        pred, _, from_root = self.tree(s)
+        path = from_root.get(t)
+        if path is None:
+            path = self._walk(pred, t, s)
+            path.reverse()
+            from_root[t] = path
+        return path
+
+    def repair(self, topology, changes):
+        """Return a store with paths updated after changes of the topology
+
+        The store returned keeps the shortest path trees not affected by the
+        changes, as well as the node order and table statistics of this
+        store. Nodes added to the topology are appended to the node order.
+
+        Parameters
+        ----------
+        topology : Topology
+            The topology after the changes
+        changes : list of tuple
+            The link changes, as recorded in `NetworkModel.path_changes`
+
+        Returns
+        -------
+        store : LazyPathStore
+            The updated store
+        """
+        nodes = self.nodes + [v for v in topology.nodes() if v not in self.index]
+        store = type(self)(topology, self.cache_size, nodes)
+        store.hits = self.hits
+        store.misses = self.misses
+        for root, tree in self._trees.items():
+            if not any(_affects_tree(change, root, tree[0]) for change in changes):
+                store._trees[root] = tree
+        return store
+
+    def cache_info(self):
+        """Return statistics about the table of shortest path trees
+
+        Returns
+        -------
+        info : dict
+            Dictionary with the number of table hits and misses, the number of
+            trees currently stored and the maximum number of trees
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._trees),
+            "cache_size": self.cache_size,
+        }
+
+    @staticmethod
+    def _walk(pred, v, root):
+        if v not in pred:
+            raise KeyError(v)
+        path = [v]
+        while v != root:
+            v = pred[v]
+            path.append(v)
+        return path
+
+
+class _LazyPathRow(Mapping):
+    """Paths from a single origin node of a `LazyPathStore`"""
+
+    __slots__ = ("_store", "_node")
+
+    def __init__(self, store, node):
+        self._store = store
+        self._node = node
+
+    def __getitem__(self, t):
+        return self._store.path(self._node, t)
+
+    def __iter__(self):
+        return iter(nx.descendants(self._store.topology, self._node) | {self._node})
+
+    def __len__(self):
+        return len(nx.descendants(self._store.topology, self._node)) + 1
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class PathInfo:
+    """Precomputed attributes of a path, reported to data collectors by
+    path-level events.
+
+    Instances are created and cached by the `NetworkModel`, hence the same
+    instance is returned every time the same path is traversed, as long as
+    it is not evicted from the cache, which is bounded in size.
+
+    Attributes
+    ----------
+    id : int
+        Identifier of the path, unique within a network model
+    nodes : list
+        The nodes of the path
+    links : tuple of int
+        The identifiers of the links of the path, as assigned by
+        `NetworkModel.link_id`
+    delay : float
+        The sum of the delays of all links of the path
+    """
+
+    __slots__ = ("id", "nodes", "links", "_model", "_delay")
+
+    def __init__(self, model, id, nodes):
+        """Constructor
+
+        Parameters
+        ----------
+        model : NetworkModel
+            The network model
+        id : int
+            The path identifier
+        nodes : list
+            The nodes of the path
+        """
+        self._model = model
+        self._delay = None
+        self.id = id
+        self.nodes = nodes
+        self.links = tuple(model.link_id(u, v) for u, v in path_links(nodes))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return "PathInfo(id={}, nodes={})".format(self.id, self.nodes)
+
+    @property
+    def delay(self):
+        # Computed on first access because topologies may not have delays
+        if self._delay is None:
+            link_delay = self._model.link_delay
+            self._delay = sum(link_delay[link] for link in path_links(self.nodes))
+        return self._delay
+
+    def hops(self):
+        """Return the links of the path as (u, v) tuples
+
+        Returns
+        -------
+        hops : list
+            The links of the path
+        """
+        return path_links(self.nodes)
+
+
 class NetworkView:
     """Network view
 
@@ -194,6 +836,24 @@ class NetworkView:
         """
         return self.model.link_delay[(u, v)]
 
+    def link(self, link_id):
+        """Return the link with the given identifier.
+
+        Link identifiers are used by path-level events reported to data
+        collectors.
+
+        Parameters
+        ----------
+        link_id : int
+            The link identifier
+
+        Returns
+        -------
+        link : tuple
+            The (u, v) link
+        """
+        return self.model.links[link_id]
+
     def topology(self):
         """Return the network topology
 
@@ -326,7 +986,14 @@ class NetworkModel:
     calls to the network controller.
     """
 
-    def __init__(self, topology, cache_policy, shortest_path=None):
+    def __init__(
+        self,
+        topology,
+        cache_policy,
+        shortest_path=None,
+        path_cache_size=None,
+        path_info_cache_size=2 ** 16,
+    ):
         """Constructor
 
         Parameters
@@ -337,8 +1004,17 @@ class NetworkModel:
             cache policy descriptor. It has the name attribute which identify
             the cache policy name and keyworded arguments specific to the
             policy
-        shortest_path : dict of dict, optional
-            The all-pair shortest paths of the network
+        shortest_path : dict of dict, PathStore, LazyPathStore or str, optional
+            The all-pair shortest paths of the network. If not specified, they
+            are computed and stored in a `PathStore`. If *lazy*, they are
+            computed on demand and stored in a `LazyPathStore`
+        path_cache_size : int, optional
+            The maximum number of shortest path trees kept in memory if
+            shortest paths are computed on demand. If not specified, trees
+            are never evicted
+        path_info_cache_size : int, optional
+            The maximum number of `PathInfo` objects kept in memory for
+            shortest paths and for explicit paths each, evicted in LRU order
         """
         # Filter inputs
         if not isinstance(topology, fnss.Topology):
@@ -348,11 +1024,16 @@ class NetworkModel:
             )
 
         # Shortest paths of the network
-        self.shortest_path = (
-            dict(shortest_path)
-            if shortest_path is not None
-            else symmetrify_paths(dict(nx.all_pairs_dijkstra_path(topology)))
-        )
+        if shortest_path is None:
+            self.shortest_path = PathStore(topology)
+        elif shortest_path == "lazy":
+            self.shortest_path = LazyPathStore(topology, path_cache_size)
+        elif isinstance(shortest_path, (PathStore, LazyPathStore)):
+            self.shortest_path = shortest_path
+        elif isinstance(shortest_path, str):
+            raise ValueError("Invalid shortest_path value: %s" % shortest_path)
+        else:
+            self.shortest_path = dict(shortest_path)
 
         # Network topology
         self.topology = topology
@@ -376,6 +1057,23 @@ class NetworkModel:
             for (u, v), delay in list(self.link_delay.items()):
                 self.link_delay[(v, u)] = delay
 
+        # Integer identifiers of directed links, used by path-level events
+        self.links = []
+        self.link_index = {}
+        for u, v in topology.edges():
+            self.link_id(u, v)
+            if not topology.is_directed():
+                self.link_id(v, u)
+        # Caches of PathInfo objects of shortest paths keyed by (s, t) and of
+        # explicit paths keyed by the tuple of their nodes, bounded in size
+        # and evicted in LRU order
+        if path_info_cache_size < 1:
+            raise ValueError("path_info_cache_size must be positive")
+        self.path_info_cache_size = path_info_cache_size
+        self.path_info_cache = OrderedDict()
+        self.explicit_path_info_cache = OrderedDict()
+        self.n_path_ids = 0
+
         cache_size = {}
         for node in topology.nodes():
             stack_name, stack_props = fnss.get_stack(topology, node)
@@ -398,10 +1096,20 @@ class NetworkModel:
 
         policy_name = cache_policy["name"]
         policy_args = {k: v for k, v in cache_policy.items() if k != "name"}
+        # If the cache policy is seeded, each cache is given a seed derived
+        # from it, so that caches draw independent random numbers
+        seed = policy_args.pop("seed", None)
+        if seed is not None:
+            if not isinstance(seed, np.random.SeedSequence):
+                seed = np.random.SeedSequence(seed)
+            seeds = dict(zip(cache_size, seed.spawn(len(cache_size))))
+            policy_args = [dict(policy_args, seed=seeds[node]) for node in cache_size]
+        else:
+            policy_args = [policy_args] * len(cache_size)
         # The actual cache objects storing the content
         self.cache = {
-            node: CACHE_POLICY[policy_name](cache_size[node], **policy_args)
-            for node in cache_size
+            node: CACHE_POLICY[policy_name](cache_size[node], **args)
+            for node, args in zip(cache_size, policy_args)
         }
 
         # This is for a local un-coordinated cache (currently used only by
@@ -419,6 +1127,113 @@ class NetworkModel:
         self.removed_sources = {}
         self.removed_caches = {}
         self.removed_local_caches = {}
+        # Link changes not yet reflected in shortest paths. Removed links are
+        # recorded as ("remove", u, v) tuples and added links as
+        # ("add", u, v, weight, dist_u, dist_v) tuples, where dist_u and
+        # dist_v map nodes to their distance from u and v before the addition.
+        # Links whose removal isolates v or whose addition connects an
+        # isolated node v are recorded as ("detach", u, v) and
+        # ("attach", u, v) tuples respectively
+        self.path_changes = []
+
+    def link_id(self, u, v):
+        """Return the identifier of a link, assigning one if needed
+
+        Parameters
+        ----------
+        u : any hashable type
+            Origin node
+        v : any hashable type
+            Destination node
+
+        Returns
+        -------
+        link_id : int
+            The link identifier
+        """
+        link_id = self.link_index.get((u, v))
+        if link_id is None:
+            link_id = self.link_index[(u, v)] = len(self.links)
+            self.links.append((u, v))
+        return link_id
+
+    def path_info(self, s, t, path=None):
+        """Return the PathInfo object of a path
+
+        Parameters
+        ----------
+        s : any hashable type
+            Origin node
+        t : any hashable type
+            Destination node
+        path : list, optional
+            The path. If not provided, the shortest path from *s* to *t* is
+            used
+
+        Returns
+        -------
+        path_info : PathInfo
+            The path information
+        """
+        if path is None:
+            cache, key = self.path_info_cache, (s, t)
+        else:
+            cache, key = self.explicit_path_info_cache, tuple(path)
+        info = cache.get(key)
+        if info is not None:
+            cache.move_to_end(key)
+            return info
+        info = cache[key] = self._new_path_info(
+            self.shortest_path[s][t] if path is None else list(path)
+        )
+        if len(cache) > self.path_info_cache_size:
+            cache.popitem(last=False)
+        return info
+
+    def _new_path_info(self, path):
+        self.n_path_ids += 1
+        return PathInfo(self, self.n_path_ids - 1, path)
+
+
+class Session:
+    """State of the session handled by a `NetworkController`, i.e. of the
+    retrieval of a content by a receiver.
+
+    The controller reuses the same instance for all sessions, hence its
+    attributes change every time a new session is started. For backward
+    compatibility with sessions stored as dictionaries, attributes can also
+    be read by key, e.g. *session["content"]*.
+
+    Attributes
+    ----------
+    timestamp : int
+        The timestamp of the event which started the session
+    receiver : any hashable type
+        The receiver node requesting a content
+    content : any hashable type
+        The content identifier requested by the receiver
+    log : bool
+        *True* if this session needs to be reported to the collector, *False*
+        otherwise
+    """
+
+    __slots__ = ("timestamp", "receiver", "content", "log")
+
+    def __init__(self, timestamp=None, receiver=None, content=None, log=False):
+        self.timestamp = timestamp
+        self.receiver = receiver
+        self.content = content
+        self.log = log
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self):
+        return "Session(timestamp={}, receiver={}, content={}, log={})".format(
+            self.timestamp, self.receiver, self.content, self.log
+        )
 
 
 class NetworkController:
@@ -429,6 +1244,19 @@ class NetworkController:
     data collectors of relevant events.
     """
 
+    # Events reported to the data collector
+    COLLECTOR_EVENTS = (
+        "start_session",
+        "end_session",
+        "cache_hit",
+        "cache_miss",
+        "server_hit",
+        "request_hop",
+        "content_hop",
+        "request_path",
+        "content_path",
+    )
+
     def __init__(self, model):
         """Constructor
 
@@ -438,22 +1266,40 @@ class NetworkController:
             Instance of the network model
         """
         self.session = None
+        # Session record reused across all sessions to avoid allocating a
+        # new object for each request
+        self._session = Session()
         self.model = model
-        self.collector = None
+        # Number of cache hits, including those of warmup requests, which are
+        # not reported to the collector
+        self.n_cache_hits = 0
+        self.attach_collector(None)
 
     def attach_collector(self, collector):
         """Attach a data collector to which all events will be reported.
 
+        The methods of the collector handling each event are looked up once
+        here. If the collector has a `handles` method, such as
+        `CollectorProxy`, events it does not handle are not reported at all,
+        which spares the controller the work of preparing them.
+
         Parameters
         ----------
         collector : DataCollector
             The data collector
         """
         self.collector = collector
+        handles = getattr(collector, "handles", None)
+        for event in self.COLLECTOR_EVENTS:
+            if collector is None or (handles is not None and not handles(event)):
+                method = None
+            else:
+                method = getattr(collector, event)
+            setattr(self, "_on_" + event, method)
 
     def detach_collector(self):
         """Detach the data collector."""
-        self.collector = None
+        self.attach_collector(None)
 
     def start_session(self, timestamp, receiver, content, log):
         """Instruct the controller to start a new session (i.e. the retrieval
@@ -471,11 +1317,14 @@ class NetworkController:
             *True* if this session needs to be reported to the collector,
             *False* otherwise
         """
-        self.session = dict(
-            timestamp=timestamp, receiver=receiver, content=content, log=log
-        )
-        if self.collector is not None and self.session["log"]:
-            self.collector.start_session(timestamp, receiver, content)
+        session = self._session
+        session.timestamp = timestamp
+        session.receiver = receiver
+        session.content = content
+        session.log = log
+        self.session = session
+        if self._on_start_session is not None and log:
+            self._on_start_session(timestamp, receiver, content)
 
     def forward_request_path(self, s, t, path=None, main_path=True):
         """Forward a request from node *s* to node *t* over the provided path.
@@ -493,10 +1342,8 @@ class NetworkController:
             lead to hit a content. It is normally used to calculate latency
             correctly in multicast cases. Default value is *True*
         """
-        if path is None:
-            path = self.model.shortest_path[s][t]
-        for u, v in path_links(path):
-            self.forward_request_hop(u, v, main_path)
+        if self._on_request_path is not None and self.session.log:
+            self._on_request_path(self.model.path_info(s, t, path), main_path)
 
     def forward_content_path(self, u, v, path=None, main_path=True):
         """Forward a content from node *s* to node *t* over the provided path.
@@ -515,10 +1362,8 @@ class NetworkController:
             calculate latency correctly in multicast cases. Default value is
             *True*
         """
-        if path is None:
-            path = self.model.shortest_path[u][v]
-        for u, v in path_links(path):
-            self.forward_content_hop(u, v, main_path)
+        if self._on_content_path is not None and self.session.log:
+            self._on_content_path(self.model.path_info(u, v, path), main_path)
 
     def forward_request_hop(self, u, v, main_path=True):
         """Forward a request over link  u -> v.
@@ -534,8 +1379,8 @@ class NetworkController:
             lead to hit a content. It is normally used to calculate latency
             correctly in multicast cases. Default value is *True*
         """
-        if self.collector is not None and self.session["log"]:
-            self.collector.request_hop(u, v, main_path)
+        if self._on_request_hop is not None and self.session.log:
+            self._on_request_hop(u, v, main_path)
 
     def forward_content_hop(self, u, v, main_path=True):
         """Forward a content over link  u -> v.
@@ -552,8 +1397,8 @@ class NetworkController:
             calculate latency correctly in multicast cases. Default value is
             *True*
         """
-        if self.collector is not None and self.session["log"]:
-            self.collector.content_hop(u, v, main_path)
+        if self._on_content_hop is not None and self.session.log:
+            self._on_content_hop(u, v, main_path)
 
     def put_content(self, node):
         """Store content in the specified node.
@@ -574,7 +1419,7 @@ class NetworkController:
             The evicted object or *None* if no contents were evicted.
         """
         if node in self.model.cache:
-            return self.model.cache[node].put(self.session["content"])
+            return self.model.cache[node].put(self.session.content)
 
     def get_content(self, node):
         """Get a content from a server or a cache.
@@ -590,18 +1435,19 @@ class NetworkController:
             True if the content is available, False otherwise
         """
         if node in self.model.cache:
-            cache_hit = self.model.cache[node].get(self.session["content"])
+            cache_hit = self.model.cache[node].get(self.session.content)
             if cache_hit:
-                if self.session["log"]:
-                    self.collector.cache_hit(node)
+                self.n_cache_hits += 1
+                if self._on_cache_hit is not None and self.session.log:
+                    self._on_cache_hit(node)
             else:
-                if self.session["log"]:
-                    self.collector.cache_miss(node)
+                if self._on_cache_miss is not None and self.session.log:
+                    self._on_cache_miss(node)
             return cache_hit
-        name, props = fnss.get_stack(self.model.topology, node)
-        if name == "source" and self.session["content"] in props["contents"]:
-            if self.collector is not None and self.session["log"]:
-                self.collector.server_hit(node)
+        contents = self.model.source_node.get(node)
+        if contents is not None and self.session.content in contents:
+            if self._on_server_hit is not None and self.session.log:
+                self._on_server_hit(node)
             return True
         else:
             return False
@@ -620,7 +1466,55 @@ class NetworkController:
             *True* if the entry was in the cache, *False* if it was not.
         """
         if node in self.model.cache:
-            return self.model.cache[node].remove(self.session["content"])
+            return self.model.cache[node].remove(self.session.content)
+
+    def get_content_warmup(self, node, content):
+        """Look up a content in the cache of a node during cache warmup.
+
+        Differently from `get_content`, this method does not require an open
+        session and does not report any event to the collector. It only
+        updates the state of the cache as a regular lookup would.
+
+        Parameters
+        ----------
+        node : any hashable type
+            The node where the content is looked up
+        content : any hashable type
+            The content identifier
+
+        Returns
+        -------
+        cache_hit : bool
+            True if the node has a cache storing the content, False otherwise.
+            Content sources are not looked up.
+        """
+        cache = self.model.cache.get(node)
+        if cache is not None and cache.get(content):
+            self.n_cache_hits += 1
+            return True
+        return False
+
+    def put_content_warmup(self, node, content):
+        """Store a content in the cache of a node during cache warmup.
+
+        Differently from `put_content`, this method does not require an open
+        session.
+
+        Parameters
+        ----------
+        node : any hashable type
+            The node where the content is inserted
+        content : any hashable type
+            The content identifier
+
+        Returns
+        -------
+        evicted : any hashable type
+            The evicted object or *None* if no contents were evicted.
+        """
+        cache = self.model.cache.get(node)
+        if cache is not None:
+            return cache.put(content)
 
     def end_session(self, success=True):
         """Close a session
@@ -630,10 +1524,63 @@ class NetworkController:
         success : bool, optional
             *True* if the session was completed successfully, *False* otherwise
         """
-        if self.collector is not None and self.session["log"]:
-            self.collector.end_session(success)
+        if self._on_end_session is not None and self.session.log:
+            self._on_end_session(success)
         self.session = None
 
+    def update_paths(self):
+        """Update shortest paths after changes of the topology.
+
+        Only shortest paths affected by the links removed, restored or rewired
+        since the last update are recomputed. Several changes can be applied
+        at once by invoking topology-changing methods with
+        *recompute_paths=False* and then calling this method.
+        """
+        shortest_path = self.model.shortest_path
+        if isinstance(shortest_path, (PathStore, LazyPathStore)):
+            self.model.shortest_path = shortest_path.repair(
+                self.model.topology, self.model.path_changes
+            )
+        else:
+            self.model.shortest_path = PathStore(self.model.topology)
+        self.model.path_changes = []
+        self.model.path_info_cache.clear()
+        self.model.explicit_path_info_cache.clear()
+
+    def _remove_link(self, u, v):
+        """Remove a link from the topology and record the change"""
+        topology = self.model.topology
+        topology.remove_edge(u, v)
+        if topology.degree(v) == 0 and topology.degree(u) > 0:
+            self.model.path_changes.append(("detach", u, v))
+        elif topology.degree(u) == 0 and topology.degree(v) > 0:
+            self.model.path_changes.append(("detach", v, u))
+        else:
+            self.model.path_changes.append(("remove", u, v))
+
+    def _add_link(self, u, v, **attr):
+        """Add a link to the topology and record the change"""
+        topology = self.model.topology
+        if topology.has_edge(u, v):
+            self._remove_link(u, v)
+        degree_u = topology.degree(u) if u in topology else 0
+        degree_v = topology.degree(v) if v in topology else 0
+        if degree_v == 0 and degree_u > 0:
+            self.model.path_changes.append(("attach", u, v))
+        elif degree_u == 0 and degree_v > 0:
+            self.model.path_changes.append(("attach", v, u))
+        else:
+            dist_u, dist_v = (
+                nx.single_source_dijkstra_path_length(topology, w)
+                if w in topology
+                else {}
+                for w in (u, v)
+            )
+            self.model.path_changes.append(
+                ("add", u, v, attr.get("weight", 1), dist_u, dist_v)
+            )
+        topology.add_edge(u, v, **attr)
+
     def rewire_link(self, u, v, up, vp, recompute_paths=True):
         """Rewire an existing link to new endpoints
 
@@ -652,13 +1599,15 @@ class NetworkController:
             Endpoints of link before rewiring
         up, vp : any hashable type
             Endpoints of link after rewiring
+        recompute_paths: bool, optional
+            If True, recompute shortest paths affected by the change. If False,
+            paths are recomputed by a later call to `update_paths`
         """
         link = self.model.topology.adj[u][v]
-        self.model.topology.remove_edge(u, v)
-        self.model.topology.add_edge(up, vp, **link)
+        self._remove_link(u, v)
+        self._add_link(up, vp, **link)
         if recompute_paths:
-            shortest_path = dict(nx.all_pairs_dijkstra_path(self.model.topology))
-            self.model.shortest_path = symmetrify_paths(shortest_path)
+            self.update_paths()
 
     def remove_link(self, u, v, recompute_paths=True):
         """Remove a link from the topology and update the network model.
@@ -680,13 +1629,13 @@ class NetworkController:
         v : any hashable type
             Destination node
         recompute_paths: bool, optional
-            If True, recompute all shortest paths
+            If True, recompute shortest paths affected by the change. If False,
+            paths are recomputed by a later call to `update_paths`
         """
         self.model.removed_links[(u, v)] = self.model.topology.adj[u][v]
-        self.model.topology.remove_edge(u, v)
+        self._remove_link(u, v)
         if recompute_paths:
-            shortest_path = dict(nx.all_pairs_dijkstra_path(self.model.topology))
-            self.model.shortest_path = symmetrify_paths(shortest_path)
+            self.update_paths()
 
     def restore_link(self, u, v, recompute_paths=True):
         """Restore a previously-removed link and update the network model
@@ -698,12 +1647,12 @@ class NetworkController:
         v : any hashable type
             Destination node
         recompute_paths: bool, optional
-            If True, recompute all shortest paths
+            If True, recompute shortest paths affected by the change. If False,
+            paths are recomputed by a later call to `update_paths`
         """
-        self.model.topology.add_edge(u, v, **self.model.removed_links.pop((u, v)))
+        self._add_link(u, v, **self.model.removed_links.pop((u, v)))
         if recompute_paths:
-            shortest_path = dict(nx.all_pairs_dijkstra_path(self.model.topology))
-            self.model.shortest_path = symmetrify_paths(shortest_path)
+            self.update_paths()
 
     def remove_node(self, v, recompute_paths=True):
         """Remove a node from the topology and update the network model.
@@ -736,7 +1685,8 @@ class NetworkController:
         v : any hashable type
             Node to remove
         recompute_paths: bool, optional
-            If True, recompute all shortest paths
+            If True, recompute shortest paths affected by the change. If False,
+            paths are recomputed by a later call to `update_paths`
         """
         self.model.removed_nodes[v] = self.model.topology.node[v]
         # First need to remove all links the removed node as endpoint
@@ -752,10 +1702,9 @@ class NetworkController:
         if v in self.model.source_node:
             self.model.removed_sources[v] = self.model.source_node.pop(v)
             for content in self.model.removed_sources[v]:
-                self.model.countent_source.pop(content)
+                self.model.content_source.pop(content)
         if recompute_paths:
-            shortest_path = dict(nx.all_pairs_dijkstra_path(self.model.topology))
-            self.model.shortest_path = symmetrify_paths(shortest_path)
+            self.update_paths()
 
     def restore_node(self, v, recompute_paths=True):
         """Restore a previously-removed node and update the network model.
@@ -765,7 +1714,8 @@ class NetworkController:
         v : any hashable type
             Node to restore
         recompute_paths: bool, optional
-            If True, recompute all shortest paths
+            If True, recompute shortest paths affected by the change. If False,
+            paths are recomputed by a later call to `update_paths`
         """
         self.model.topology.add_node(v, **self.model.removed_nodes.pop(v))
         for u in self.model.disconnected_neighbors[v]:
@@ -779,10 +1729,9 @@ class NetworkController:
         if v in self.model.removed_sources:
             self.model.source_node[v] = self.model.removed_sources.pop(v)
             for content in self.model.source_node[v]:
-                self.model.countent_source[content] = v
+                self.model.content_source[content] = v
         if recompute_paths:
-            shortest_path = dict(nx.all_pairs_dijkstra_path(self.model.topology))
-            self.model.shortest_path = symmetrify_paths(shortest_path)
+            self.update_paths()
 
     def reserve_local_cache(self, ratio=0.1):
         """Reserve a fraction of cache as local.
@@ -828,13 +1777,14 @@ class NetworkController:
         """
         if node not in self.model.local_cache:
             return False
-        cache_hit = self.model.local_cache[node].get(self.session["content"])
+        cache_hit = self.model.local_cache[node].get(self.session.content)
         if cache_hit:
-            if self.session["log"]:
-                self.collector.cache_hit(node)
+            self.n_cache_hits += 1
+            if self._on_cache_hit is not None and self.session.log:
+                self._on_cache_hit(node)
         else:
-            if self.session["log"]:
-                self.collector.cache_miss(node)
+            if self._on_cache_miss is not None and self.session.log:
+                self._on_cache_miss(node)
         return cache_hit
 
     def put_content_local_cache(self, node):
@@ -849,4 +1799,4 @@ class NetworkController:
             The node to query
         """
         if node in self.model.local_cache:
-            return self.model.local_cache[node].put(self.session["content"])
+            return self.model.local_cache[node].put(self.session.content)
@@ -0,0 +1,132 @@
+"""Sampling profiler for experiments
+
+This module provides a statistical profiler which periodically samples the
+call stack of the process executing an experiment, with no overhead on the
+calls executed between samples. It is enabled by running simulations with
+*icarus run --profile*.
+
+Frames executing methods of classes registered in the *STRATEGY*,
+*DATA_COLLECTOR*, *CACHE_POLICY* and *WORKLOAD* registries are labelled with
+the registry and the name the class is registered with, e.g.
+*STRATEGY[LCE].process_event* or *CACHE_POLICY[LRU].get*, so that time can
+be attributed to models irrespective of the module they are implemented in.
+
+Samples are written in the collapsed stack format, in which each line lists
+the frames of a stack separated by semicolons, from the outermost one,
+followed by the number of samples of that stack. This format can be rendered
+by flame graph tools such as flamegraph.pl or speedscope.
+"""
+import collections
+import os
+import signal
+
+from icarus.registry import CACHE_POLICY, DATA_COLLECTOR, STRATEGY, WORKLOAD
+
+__all__ = ["SamplingProfiler"]
+
+
+# Registries whose entries are labelled in sampled stacks
+PROFILED_REGISTRIES = {
+    "STRATEGY": STRATEGY,
+    "DATA_COLLECTOR": DATA_COLLECTOR,
+    "CACHE_POLICY": CACHE_POLICY,
+    "WORKLOAD": WORKLOAD,
+}
+
+
+class SamplingProfiler:
+    """Signal-based sampling profiler
+
+    When started, the profiler sets an interval timer delivering a *SIGPROF*
+    signal every *interval* seconds of CPU time consumed by the process, and
+    records the call stack interrupted by each signal. It can therefore only
+    be used in the main thread of a process and on platforms supporting
+    interval timers, i.e. not on Windows.
+    """
+
+    def __init__(self, interval=0.005):
+        """Constructor
+
+        Parameters
+        ----------
+        interval : float, optional
+            The interval between two samples, in seconds of CPU time
+        """
+        if not hasattr(signal, "setitimer"):
+            raise ValueError("Sampling profiling is not supported on this platform")
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._labels = {}
+        self._prev_handler = None
+        # Map code objects of methods of registered classes, including
+        # inherited ones, to their names and registered classes to labels
+        self._methods = {}
+        self._classes = {}
+        for registry_name, registry in PROFILED_REGISTRIES.items():
+            for name, cls in registry.items():
+                self._classes[cls] = "{}[{}]".format(registry_name, name)
+                for klass in cls.__mro__:
+                    for attr, value in vars(klass).items():
+                        code = getattr(value, "__code__", None)
+                        if code is not None:
+                            self._methods[code] = attr
+
+    def start(self):
+        """Start sampling"""
+        self._prev_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        """Stop sampling"""
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._prev_handler or signal.SIG_DFL)
+        self._prev_handler = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def n_samples(self):
+        """Number of samples collected"""
+        return sum(self.stacks.values())
+
+    def _sample(self, signum, frame):
+        """Handle a SIGPROF signal, recording the stack of *frame*"""
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame))
+            frame = frame.f_back
+        self.stacks[";".join(reversed(stack))] += 1
+
+    def _label(self, frame):
+        """Return the label of a frame"""
+        code = frame.f_code
+        if code in self._methods:
+            # Methods of registered classes are labelled by the class of the
+            # instance they are invoked on
+            cls = type(frame.f_locals.get("self"))
+            if cls in self._classes:
+                return "{}.{}".format(self._classes[cls], self._methods[code])
+        label = self._labels.get(code)
+        if label is None:
+            label = "{}:{}".format(os.path.basename(code.co_filename), code.co_name)
+            self._labels[code] = label
+        return label
+
+    def write(self, path):
+        """Write collected samples to a file in collapsed stack format
+
+        Parameters
+        ----------
+        path : str
+            The path of the file
+        """
+        with open(path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write("{} {}\n".format(stack, count))
@@ -0,0 +1,198 @@
+"""Detection of the steady state of experiments
+
+This module provides a detector which chooses the lengths of the warmup and
+measured phases of an experiment while it runs, rather than relying on the
+fixed numbers of warmup and measured requests of the workload, which are
+then only used as upper bounds.
+
+The detector observes the series of cache hit ratios of consecutive blocks
+of requests, including warmup requests. The warmup phase ends as soon as the
+MSER-5 rule finds a truncation point in the first half of the series observed
+so far. Observations are hit ratios of blocks of requests rather than hits of
+single requests because the variance of the latter hides the initial trend of
+the hit ratio from MSER, e.g. while large caches are being filled. The
+measured phase ends as soon as the confidence interval of the cache hit
+ratio, computed with the method of batch means, is narrow enough.
+
+Steady state detection is opt-in: it is enabled by setting
+*STEADY_STATE_DETECTION = True* in the configuration file, in which case the
+chosen lengths are stored with the results of each experiment under the
+*STEADY_STATE* key.
+"""
+import numpy as np
+
+from icarus.tools import means_confidence_interval
+from icarus.util import Tree
+
+__all__ = ["SteadyStateDetector", "mser"]
+
+
+def mser(series):
+    """Return the truncation point of a series according to the Marginal
+    Standard Error Rule (MSER)
+
+    The truncation point is the number of initial observations whose removal
+    minimizes the standard error of the mean of the remaining ones. Only
+    truncation points in the first half of the series are considered, as
+    the standard error of the last observations is unreliable.
+
+    MSER-5 is obtained by applying this rule to the means of batches of 5
+    consecutive observations.
+
+    Parameters
+    ----------
+    series : array-like
+        The series of observations
+
+    Returns
+    -------
+    d : int
+        The truncation point
+
+    References
+    ----------
+    [1] K. P. White, An effective truncation heuristic for bias reduction in
+        simulation output, Simulation, 69(6), 1997.
+    """
+    x = np.asarray(series, dtype=float)
+    n = len(x)
+    if n < 2:
+        return 0
+    # Sums of the observations after each truncation point
+    suffix_sum = np.cumsum(x[::-1])[::-1]
+    suffix_sq_sum = np.cumsum((x * x)[::-1])[::-1]
+    d = np.arange(n // 2 + 1)
+    n_kept = n - d
+    mean = suffix_sum[d] / n_kept
+    sq_dev = np.maximum(suffix_sq_sum[d] - n_kept * mean * mean, 0)
+    return int(np.argmin(sq_dev / n_kept ** 2))
+
+
+class SteadyStateDetector:
+    """Online detector of the end of warmup and measured phases
+
+    The detector must be updated after each request with the cumulative
+    number of cache hits. It tells whether the next request belongs to the
+    measured phase and whether the experiment can end.
+    """
+
+    def __init__(
+        self,
+        max_warmup,
+        max_measured,
+        obs_size=200,
+        batch_size=1000,
+        min_batches=10,
+        ci_width=0.05,
+        confidence=0.95,
+    ):
+        """Constructor
+
+        Parameters
+        ----------
+        max_warmup : int
+            The maximum number of warmup requests
+        max_measured : int
+            The maximum number of measured requests
+        obs_size : int, optional
+            The number of warmup requests of each observation of the cache hit
+            ratio to which MSER-5 is applied
+        batch_size : int, optional
+            The number of measured requests of each batch used to compute the
+            confidence interval of the cache hit ratio
+        min_batches : int, optional
+            The minimum number of batches of measured requests
+        ci_width : float, optional
+            The width of the confidence interval of the cache hit ratio,
+            relative to its mean, below which measurement ends
+        confidence : float, optional
+            The confidence level of the interval
+        """
+        if obs_size <= 0 or batch_size <= 0:
+            raise ValueError("obs_size and batch_size must be positive")
+        if min_batches < 2:
+            raise ValueError("min_batches must be at least 2")
+        self.max_warmup = max_warmup
+        self.max_measured = max_measured
+        self.obs_size = obs_size
+        self.batch_size = batch_size
+        self.min_batches = min_batches
+        self.ci_width = ci_width
+        self.confidence = confidence
+        self.measuring = max_warmup == 0
+        self.converged = False
+        self.n_warmup = 0
+        self.n_measured = 0
+        self._n_hits = 0
+        # Cache hits of the current batch, means of batches of 5 warmup
+        # observations and hit ratios of batches of measured requests
+        self._batch_hits = 0
+        self._warmup_means = []
+        self._next_check = 20
+        self._measured_means = []
+
+    def update(self, n_cache_hits):
+        """Record the execution of a request
+
+        Parameters
+        ----------
+        n_cache_hits : int
+            The cumulative number of cache hits after the request
+
+        Returns
+        -------
+        end : bool
+            *True* if no more requests need to be executed
+        """
+        self._batch_hits += n_cache_hits - self._n_hits
+        self._n_hits = n_cache_hits
+        if self.measuring:
+            self.n_measured += 1
+            if self.n_measured % self.batch_size == 0:
+                self._measured_means.append(self._batch_hits / self.batch_size)
+                self._batch_hits = 0
+                self.converged = self._converged()
+            return self.converged or self.n_measured >= self.max_measured
+        self.n_warmup += 1
+        if self.n_warmup % (5 * self.obs_size) == 0:
+            self._warmup_means.append(self._batch_hits / (5 * self.obs_size))
+            self._batch_hits = 0
+            # Run MSER-5 each time the series grows by 10%, so that the total
+            # cost of the checks is linear in the length of the warmup
+            if len(self._warmup_means) >= self._next_check:
+                self._next_check = int(1.1 * len(self._warmup_means)) + 1
+                k = len(self._warmup_means)
+                if mser(self._warmup_means) < k // 2:
+                    self._start_measuring()
+        if self.n_warmup >= self.max_warmup and not self.measuring:
+            self._start_measuring()
+        return self.max_measured == 0 and self.measuring
+
+    def _start_measuring(self):
+        self.measuring = True
+        self._batch_hits = 0
+        self._warmup_means = []
+
+    def _converged(self):
+        """Return whether the confidence interval of the cache hit ratio is
+        narrow enough"""
+        if len(self._measured_means) < self.min_batches:
+            return False
+        mean, err = means_confidence_interval(self._measured_means, self.confidence)
+        return mean > 0 and 2 * err / mean <= self.ci_width
+
+    def results(self):
+        """Return the lengths of the phases chosen by the detector
+
+        Returns
+        -------
+        results : Tree
+            Tree with the numbers of warmup and measured requests executed and
+            whether the confidence interval of the cache hit ratio converged
+            before the maximum number of measured requests
+        """
+        return Tree(
+            N_WARMUP=self.n_warmup,
+            N_MEASURED=self.n_measured,
+            CONVERGED=self.converged,
+        )
@@ -1,4 +1,13 @@
+import pickle
+
+import fnss
+import numpy as np
+import pytest
+
+from icarus.registry import DATA_COLLECTOR
+from icarus.scenarios import IcnTopology
 import icarus.execution as collectors
+import icarus.execution.network as network
 
 
 class TestLinkLoadCollector:
@@ -256,3 +265,220 @@ class TestCacheHitRatioCollector:
 
         res = c.results()
         assert {1: 0.5, 2: 0.25} == res["PER_CONTENT"]
+
+    def test_merge(self):
+
+        view = type("MockNetworkView", (), {})()
+
+        c = collectors.CacheHitRatioCollector(view, content_hits=True)
+        c.start_session(3.0, "RECV", 1)
+        c.cache_hit(1)
+        c.end_session()
+
+        other = collectors.CacheHitRatioCollector(view, content_hits=True)
+        for t, node in [(4.0, 1), (5.0, 2)]:
+            other.start_session(t, "RECV", 2)
+            other.server_hit(node)
+            other.end_session()
+
+        c.merge(pickle.loads(pickle.dumps(other)))
+        res = c.results()
+        assert 1 / 3 == res["MEAN"]
+        assert {1: 1.0, 2: 0.0} == res["PER_CONTENT"]
+        assert {1: 1 / 3} == res["PER_NODE_CACHE_HIT_RATIO"]
+        assert {1: 1 / 3, 2: 1 / 3} == res["PER_NODE_SERVER_HIT_RATIO"]
+
+
+class TestPathEvents:
+    def setup_method(self):
+        topology = IcnTopology(fnss.line_topology(4))
+        fnss.set_delays_constant(topology, 2, "ms")
+        topology.adj[2][3]["type"] = "external"
+        for u, v in [(0, 1), (1, 2)]:
+            topology.adj[u][v]["type"] = "internal"
+        fnss.add_stack(topology, 0, "receiver", {})
+        fnss.add_stack(topology, 1, "router", {})
+        fnss.add_stack(topology, 2, "router", {})
+        fnss.add_stack(topology, 3, "source", {"contents": [1]})
+        self.model = network.NetworkModel(topology, cache_policy={"name": "NULL"})
+        self.view = network.NetworkView(self.model)
+
+    def run_session(self, c, timestamp, t, use_paths):
+        c.start_session(timestamp, 0, 1)
+        path = list(range(t + 1))
+        if use_paths:
+            c.request_path(self.model.path_info(0, t, path))
+            c.content_path(self.model.path_info(t, 0))
+        else:
+            for u, v in zip(path[:-1], path[1:]):
+                c.request_hop(u, v)
+            for u, v in zip(path[:0:-1], path[-2::-1]):
+                c.content_hop(u, v)
+        c.end_session()
+
+    def test_path_info(self):
+        info = self.model.path_info(0, 3)
+        assert info is self.model.path_info(0, 3)
+        assert [0, 1, 2, 3] == info.nodes
+        assert [(0, 1), (1, 2), (2, 3)] == [self.view.link(i) for i in info.links]
+        assert 6 == info.delay
+        assert info.id != self.model.path_info(0, 2, [0, 1, 2]).id
+
+    def test_path_info_cache_size(self):
+        model = network.NetworkModel(
+            self.model.topology, cache_policy={"name": "NULL"}, path_info_cache_size=2
+        )
+        info = model.path_info(0, 3)
+        model.path_info(0, 2)
+        assert info is model.path_info(0, 3)
+        # The least recently used path is evicted
+        model.path_info(0, 1)
+        assert 2 == len(model.path_info_cache)
+        assert info is model.path_info(0, 3)
+        assert (0, 2) not in model.path_info_cache
+        for t in range(1, 4):
+            model.path_info(0, t, list(range(t + 1)))
+        assert 2 == len(model.explicit_path_info_cache)
+
+    def test_same_results(self):
+        for name in ("LINK_LOAD", "LATENCY", "PATH_STRETCH"):
+            results = []
+            for use_paths in (False, True):
+                c = DATA_COLLECTOR[name](self.view)
+                self.run_session(c, 1.0, 1, use_paths)
+                self.run_session(c, 3.0, 3, use_paths)
+                self.run_session(c, 5.0, 2, use_paths)
+                results.append(c.results())
+            assert results[0] == results[1]
+
+    def test_merge(self):
+        for name in ("LATENCY", "PATH_STRETCH"):
+            c = DATA_COLLECTOR[name](self.view, cdf=True)
+            for timestamp, t in [(1.0, 1), (3.0, 3), (5.0, 2)]:
+                self.run_session(c, timestamp, t, True)
+            expected = c.results()
+            c = DATA_COLLECTOR[name](self.view, cdf=True)
+            other = DATA_COLLECTOR[name](self.view, cdf=True)
+            self.run_session(c, 1.0, 1, True)
+            self.run_session(other, 3.0, 3, True)
+            self.run_session(other, 5.0, 2, False)
+            c.merge(pickle.loads(pickle.dumps(other)))
+            results = c.results()
+            assert expected.keys() == results.keys()
+            for metric, value in expected.items():
+                np.testing.assert_allclose(value, results[metric])
+
+    def test_merge_link_load(self):
+        c = collectors.LinkLoadCollector(self.view)
+        self.run_session(c, 1.0, 3, True)
+        self.run_session(c, 3.0, 3, True)
+        expected = c.results()
+        # Replications of the same sessions have the same load
+        c = collectors.LinkLoadCollector(self.view)
+        others = [collectors.LinkLoadCollector(self.view) for _ in range(2)]
+        for collector in [c] + others:
+            self.run_session(collector, 1.0, 3, True)
+            self.run_session(collector, 3.0, 3, False)
+        c.merge(others[0])
+        c.merge(pickle.loads(pickle.dumps(others[1])))
+        assert expected == c.results()
+
+    def test_results_link_load(self):
+        c = collectors.LinkLoadCollector(self.view)
+        other = collectors.LinkLoadCollector(self.view)
+        for collector in (c, other):
+            self.run_session(collector, 1.0, 3, True)
+            self.run_session(collector, 3.0, 2, True)
+        expected = c.results()
+        # Computing results leaves the state of collectors unchanged
+        assert 0 == len(c.req_count)
+        assert expected == c.results()
+        other.results()
+        c.merge(other)
+        assert expected == c.results()
+
+    def test_proxy_splits_paths(self):
+        dummy = collectors.DummyCollector(self.view)
+        latency = collectors.LatencyCollector(self.view)
+        proxy = collectors.CollectorProxy(self.view, [dummy, latency])
+        self.run_session(proxy, 1.0, 3, True)
+        summary = dummy.session_summary()
+        assert [(0, 1), (1, 2), (2, 3)] == summary["request_hops"]
+        assert [(3, 2), (2, 1), (1, 0)] == summary["content_hops"]
+        assert 12 == proxy.results()["LATENCY"]["MEAN"]
+
+
+class TestCollectorProxy:
+    def setup_method(self):
+        topology = IcnTopology(fnss.line_topology(3))
+        fnss.set_delays_constant(topology, 1, "ms")
+        for u, v in topology.edges():
+            topology.adj[u][v]["type"] = "internal"
+        fnss.add_stack(topology, 0, "receiver", {})
+        fnss.add_stack(topology, 1, "router", {"cache_size": 1})
+        fnss.add_stack(topology, 2, "source", {"contents": [1]})
+        self.model = network.NetworkModel(topology, cache_policy={"name": "LRU"})
+        self.view = network.NetworkView(self.model)
+        self.controller = network.NetworkController(self.model)
+
+    def run_session(self, timestamp=1.0):
+        self.controller.start_session(timestamp, 0, 1, True)
+        self.controller.forward_request_path(0, 2)
+        if not self.controller.get_content(1):
+            self.controller.get_content(2)
+            self.controller.put_content(1)
+        self.controller.forward_content_path(2, 0)
+        self.controller.end_session()
+
+    def test_single_collector(self):
+        latency = collectors.LatencyCollector(self.view)
+        proxy = collectors.CollectorProxy(self.view, [latency])
+        assert proxy.request_path == latency.request_path
+        assert proxy.handles("request_path")
+        assert not proxy.handles("cache_hit")
+        self.controller.attach_collector(proxy)
+        assert self.controller._on_cache_hit is None
+        self.run_session()
+        assert 4 == proxy.results()["LATENCY"]["MEAN"]
+
+    def test_multiple_collectors(self):
+        hit_ratio = collectors.CacheHitRatioCollector(self.view)
+        link_load = collectors.LinkLoadCollector(self.view)
+        dummy = collectors.DummyCollector(self.view)
+        proxy = collectors.CollectorProxy(self.view, [hit_ratio, link_load, dummy])
+        self.controller.attach_collector(proxy)
+        self.run_session(1.0)
+        self.run_session(2.0)
+        assert [(0, 1), (1, 2)] == dummy.session_summary()["request_hops"]
+        results = proxy.results()
+        assert 0.5 == results["CACHE_HIT_RATIO"]["MEAN"]
+        # Requests and contents traverse distinct directed links
+        assert 150 + 1500 == results["LINK_LOAD"]["MEAN_INTERNAL"]
+
+    def test_merge(self):
+        proxies = []
+        for t in (1.0, 2.0):
+            hit_ratio = collectors.CacheHitRatioCollector(self.view)
+            latency = collectors.LatencyCollector(self.view)
+            proxy = collectors.CollectorProxy(self.view, [hit_ratio, latency])
+            self.controller.attach_collector(proxy)
+            self.run_session(t)
+            proxies.append(proxy)
+        proxy = pickle.loads(pickle.dumps(proxies[1]))
+        assert proxy.handles("cache_hit")
+        proxies[0].merge(proxy)
+        results = proxies[0].results()
+        assert 0.5 == results["CACHE_HIT_RATIO"]["MEAN"]
+        assert 4 == results["LATENCY"]["MEAN"]
+        other = collectors.CollectorProxy(self.view, [latency])
+        with pytest.raises(ValueError):
+            proxies[0].merge(other)
+
+    def test_no_collector(self):
+        proxy = collectors.CollectorProxy(self.view, [])
+        proxy.cache_hit(1)
+        proxy.start_session(1.0, 0, 1)
+        self.controller.attach_collector(proxy)
+        self.run_session()
+        assert not self.model.path_info_cache
+        assert 0 == len(proxy.results())
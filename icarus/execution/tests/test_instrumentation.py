@@ -0,0 +1,59 @@
+from icarus.registry import (
+    CACHE_PLACEMENT,
+    CONTENT_PLACEMENT,
+    TOPOLOGY_FACTORY,
+    WORKLOAD,
+)
+from icarus.execution import Instrumentation, exec_experiment, instrumentation_report
+
+
+class TestInstrumentation:
+    def test_phases(self):
+        instr = Instrumentation()
+        with instr.phase("A"):
+            pass
+        instr.start("B")
+        instr.stop("B", 10)
+        instr.start("B")
+        instr.stop("B", 5)
+        results = instr.results()
+        assert ["A", "B"] == list(results["WALL_TIME"].keys())
+        assert ["A", "B"] == list(results["CPU_TIME"].keys())
+        assert {"B": 15} == results["N_EVENTS"]
+        assert results["WALL_TIME"]["B"] >= 0
+        assert "B" in results["EVENTS_PER_SEC"]
+        assert results["PEAK_RSS"] is None or results["PEAK_RSS"] > 0
+
+    def run_experiment(self, batch_size, instrumentation):
+        topology = TOPOLOGY_FACTORY["PATH"](5)
+        workload = WORKLOAD["STATIONARY"](
+            topology, n_contents=20, alpha=0.8, n_warmup=30, n_measured=50, seed=1
+        )
+        CACHE_PLACEMENT["UNIFORM"](topology, cache_budget=6)
+        CONTENT_PLACEMENT["UNIFORM"](topology, workload.contents, seed=1)
+        return exec_experiment(
+            topology,
+            workload,
+            netconf={},
+            strategy={"name": "LCE"},
+            cache_policy={"name": "LRU"},
+            collectors={"CACHE_HIT_RATIO": {}, "LATENCY": {}},
+            batch_size=batch_size,
+            instrumentation=instrumentation,
+        )
+
+    def test_exec_experiment(self):
+        for batch_size in (None, 7):
+            instr = Instrumentation()
+            results = self.run_experiment(batch_size, instr)
+            assert results == self.run_experiment(batch_size, None)
+            results["INSTRUMENTATION"] = instr.results()
+            instr_results = results["INSTRUMENTATION"]
+            assert {"WARMUP": 30, "MEASURED": 50} == instr_results["N_EVENTS"]
+            phases = ["NETWORK_MODEL", "STRATEGY", "WARMUP", "MEASURED", "RESULTS"]
+            assert phases == list(instr_results["WALL_TIME"].keys())
+            report = instrumentation_report(results)
+            assert "MEASURED" in report
+
+    def test_report_not_instrumented(self):
+        assert "Not instrumented" in instrumentation_report({"LATENCY": {}})
@@ -1,3 +1,7 @@
+import copy
+import pickle
+
+import pytest
 import networkx as nx
 import fnss
 
@@ -20,6 +24,101 @@ class TestSymmetrifyPaths:
         assert list(path[2][3]) == list(reversed(path[3][2]))
 
 
+class TestPathStore:
+    @classmethod
+    def assert_same_paths(cls, topology):
+        expected = network.symmetrify_paths(dict(nx.all_pairs_dijkstra_path(topology)))
+        store = network.PathStore(topology)
+        assert set(expected) == set(store)
+        for u in expected:
+            assert set(expected[u]) == set(store[u])
+            for v in expected[u]:
+                assert expected[u][v] == store[u][v]
+        return store
+
+    def test_ties(self):
+        self.assert_same_paths(fnss.ring_topology(8))
+        self.assert_same_paths(nx.grid_2d_graph(4, 5))
+
+    def test_weights(self):
+        topology = fnss.Topology()
+        nx.add_path(topology, ["a", "b", "c", "d"], weight=1)
+        nx.add_path(topology, ["a", "e", "d"], weight=0)
+        topology.add_edge("c", "f", weight=3)
+        self.assert_same_paths(topology)
+
+    def test_disconnected(self):
+        topology = fnss.Topology()
+        nx.add_path(topology, [1, 2, 3])
+        nx.add_path(topology, [4, 5])
+        store = self.assert_same_paths(topology)
+        assert 4 not in store[1]
+        assert list(store[4]) == [4, 5]
+        assert store[1].get(5) is None
+        with pytest.raises(KeyError):
+            store[1][5]
+
+    def test_pickle(self):
+        store = network.PathStore(fnss.ring_topology(6))
+        assert store[0][3] == pickle.loads(pickle.dumps(store))[0][3]
+        assert store[4][1] == copy.deepcopy(store)[4][1]
+
+
+class TestLazyPathStore:
+    def test_same_paths(self):
+        for topology in (fnss.ring_topology(8), nx.grid_2d_graph(4, 5)):
+            expected = network.symmetrify_paths(
+                dict(nx.all_pairs_dijkstra_path(topology))
+            )
+            store = network.LazyPathStore(topology, cache_size=3)
+            for u in expected:
+                assert set(expected[u]) == set(store[u])
+                for v in expected[u]:
+                    assert expected[u][v] == store[u][v]
+
+    def test_cache(self):
+        store = network.LazyPathStore(fnss.line_topology(5), cache_size=2)
+        assert [0, 1, 2] == store[0][2]
+        assert [2, 1, 0] == store[2][0]
+        assert store.cache_info() == {
+            "hits": 1,
+            "misses": 1,
+            "size": 1,
+            "cache_size": 2,
+        }
+        assert [4, 3] == store[4][3]
+        assert [1, 2, 3] == store[1][3]
+        assert [0, 1, 2] == store[0][2]
+        info = store.cache_info()
+        assert info["misses"] == 4
+        assert info["size"] == 2
+
+    def test_disconnected(self):
+        topology = fnss.Topology()
+        nx.add_path(topology, [1, 2, 3])
+        nx.add_path(topology, [4, 5])
+        store = network.LazyPathStore(topology)
+        assert 4 not in store[1]
+        assert set(store[4]) == {4, 5}
+        with pytest.raises(KeyError):
+            store[1][5]
+
+    def test_network_model(self):
+        topology = TestNetworkMVC.build_topology()
+        model = network.NetworkModel(
+            topology,
+            cache_policy={"name": "FIFO"},
+            shortest_path="lazy",
+            path_cache_size=4,
+        )
+        view = network.NetworkView(model)
+        controller = network.NetworkController(model)
+        assert [0, 1, 2, 3, 4] == view.shortest_path(0, 4)
+        controller.remove_link(2, 3, recompute_paths=True)
+        assert [0, 1, 5, 6, 7, 8, 3, 4] == view.shortest_path(0, 4)
+        assert model.shortest_path.cache_size == 4
+
+
 class TestNetworkMVC:
     @classmethod
     def build_topology(cls):
@@ -51,6 +150,15 @@ class TestNetworkMVC:
         self.collector = DummyCollector(self.view)
         self.controller.attach_collector(self.collector)
 
+    def test_seeded_cache_policy(self):
+        policy = {"name": "RAND", "seed": 1}
+        caches = network.NetworkModel(self.topology, policy).cache
+        seeds = [c._random.rng.bit_generator.seed_seq for c in caches.values()]
+        assert len({s.spawn_key for s in seeds}) == len(caches)
+        other = network.NetworkModel(self.topology, policy).cache
+        for v in caches:
+            assert caches[v]._random.random() == other[v]._random.random()
+
     def test_remove_restore_link(self):
         assert [0, 1, 2, 3, 4] == self.view.shortest_path(0, 4)
         assert 1 == self.topology.adj[2][3]["a"]
@@ -92,3 +200,60 @@ class TestNetworkMVC:
         self.controller.rewire_link(1, 3, 1, 5, recompute_paths=True)
         assert [0, 1, 2, 3, 4] == self.view.shortest_path(0, 4)
         assert 1 == self.topology.adj[2][3]["a"]
+
+    def test_session(self):
+        self.controller.start_session(1.0, 0, 2, True)
+        session = self.controller.session
+        assert (1.0, 0, 2, True) == (
+            session.timestamp,
+            session.receiver,
+            session.content,
+            session.log,
+        )
+        assert 2 == session["content"]
+        with pytest.raises(KeyError):
+            session["size"]
+        assert self.controller.get_content(4)
+        assert not self.controller.get_content(2)
+        self.controller.end_session()
+        assert self.controller.session is None
+        self.controller.start_session(2.0, 0, 5, False)
+        assert session is self.controller.session
+        assert 5 == session["content"]
+        assert not self.controller.get_content(4)
+        self.controller.end_session()
+
+    def test_update_paths_batch(self):
+        self.controller.remove_link(2, 3, recompute_paths=False)
+        self.controller.remove_link(6, 7, recompute_paths=False)
+        assert [0, 1, 2, 3, 4] == self.view.shortest_path(0, 4)
+        self.controller.update_paths()
+        assert 4 not in self.view.all_pairs_shortest_paths()[0]
+        self.controller.restore_link(6, 7, recompute_paths=False)
+        self.controller.remove_node(0, recompute_paths=False)
+        self.controller.update_paths()
+        assert [1, 5, 6, 7, 8, 3, 4] == self.view.shortest_path(1, 4)
+        assert 0 not in self.view.all_pairs_shortest_paths()[1]
+
+    def test_update_paths_same_as_full(self):
+        for shortest_path in (None, "lazy"):
+            topology = IcnTopology(nx.grid_2d_graph(5, 5))
+            for u, v in topology.edges():
+                topology.adj[u][v]["weight"] = 1 + (u[0] * v[1]) % 3
+            for v in topology.nodes():
+                fnss.add_stack(topology, v, "router", {})
+            model = network.NetworkModel(
+                topology, cache_policy={"name": "NULL"}, shortest_path=shortest_path
+            )
+            controller = network.NetworkController(model)
+            controller.remove_link((1, 1), (1, 2), recompute_paths=False)
+            controller.remove_link((3, 3), (3, 4), recompute_paths=False)
+            controller.remove_node((0, 0), recompute_paths=False)
+            controller.update_paths()
+            controller.restore_link((1, 1), (1, 2), recompute_paths=False)
+            controller.restore_node((0, 0), recompute_paths=False)
+            controller.rewire_link((4, 4), (4, 3), (4, 4), (2, 2))
+            expected = network.PathStore(topology, model.shortest_path.nodes)
+            for u in topology.nodes():
+                for v in expected[u]:
+                    assert expected[u][v] == model.shortest_path[u][v]
@@ -0,0 +1,36 @@
+import signal
+import time
+
+import pytest
+
+from icarus.execution import SamplingProfiler
+from icarus.registry import CACHE_POLICY
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(signal, "setitimer"),
+    reason="Interval timers not supported on this platform",
+)
+
+
+class TestSamplingProfiler:
+    def test_registry_labels(self, tmp_path):
+        cache = CACHE_POLICY["LRU"](10)
+        profiler = SamplingProfiler(interval=0.001)
+        with profiler:
+            start = time.process_time()
+            while time.process_time() - start < 0.2:
+                for i in range(100):
+                    cache.put(i)
+                    cache.get(i // 2)
+        assert profiler.n_samples > 0
+        path = tmp_path / "profile.collapsed"
+        profiler.write(str(path))
+        lines = path.read_text().splitlines()
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profiler.n_samples
+        frames = {f for line in lines for f in line.rsplit(" ", 1)[0].split(";")}
+        assert "CACHE_POLICY[LRU].put" in frames or "CACHE_POLICY[LRU].get" in frames
+        assert "test_profiler.py:test_registry_labels" in frames
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            SamplingProfiler(interval=0)
@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+
+from icarus.execution import SteadyStateDetector, exec_experiment, mser
+from icarus.registry import (
+    CACHE_PLACEMENT,
+    CONTENT_PLACEMENT,
+    TOPOLOGY_FACTORY,
+    WORKLOAD,
+)
+
+
+def feed(detector, hit_probability, n_requests, rng):
+    """Feed a detector with Bernoulli hits, returning the number of requests
+    executed before it ends the experiment"""
+    n_hits = 0
+    for i in range(n_requests):
+        n_hits += rng.random() < hit_probability(detector)
+        if detector.update(n_hits):
+            return i + 1
+    return n_requests
+
+
+class TestMser:
+    def test_constant(self):
+        assert 0 == mser([1.0] * 100)
+        assert 0 == mser([])
+
+    def test_transient(self):
+        rng = np.random.default_rng(0)
+        series = np.concatenate([np.linspace(0, 1, 20), np.ones(180)])
+        series += rng.normal(0, 0.05, len(series))
+        assert 15 <= mser(series) <= 25
+
+
+class TestSteadyStateDetector:
+    def test_stationary(self):
+        detector = SteadyStateDetector(10 ** 6, 10 ** 6, obs_size=10)
+        n = feed(detector, lambda d: 0.5, 10 ** 6, random.Random(0))
+        # The first check of the warmup is after 20 batches of 5 observations
+        assert 1000 == detector.n_warmup
+        assert detector.converged
+        assert n == detector.n_warmup + detector.n_measured
+        assert 0 == detector.n_measured % detector.batch_size
+
+    def test_transient(self):
+        detector = SteadyStateDetector(10 ** 6, 10 ** 6)
+        # Hit probability increasing over the first 50000 requests
+        feed(
+            detector,
+            lambda d: 0.5 * min(d.n_warmup / 50000, 1) if not d.measuring else 0.5,
+            10 ** 6,
+            random.Random(0),
+        )
+        assert detector.n_warmup > 50000
+        assert detector.converged
+
+    def test_max_lengths(self):
+        # Warmup ends before the first check
+        detector = SteadyStateDetector(500, 5000, obs_size=10, ci_width=0)
+        n = feed(detector, lambda d: 0.5, 10 ** 6, random.Random(0))
+        assert 5500 == n
+        assert not detector.converged
+        assert {"N_WARMUP": 500, "N_MEASURED": 5000, "CONVERGED": False} == dict(
+            detector.results()
+        )
+
+    def test_no_warmup(self):
+        detector = SteadyStateDetector(0, 100)
+        assert detector.measuring
+        assert 100 == feed(detector, lambda d: 0.5, 10 ** 6, random.Random(0))
+
+    def test_exec_experiment(self):
+        topology = TOPOLOGY_FACTORY["PATH"](5)
+        workload = WORKLOAD["STATIONARY"](
+            topology, n_contents=20, alpha=0.8, n_warmup=10 ** 5, n_measured=10 ** 5
+        )
+        CACHE_PLACEMENT["UNIFORM"](topology, cache_budget=6)
+        CONTENT_PLACEMENT["UNIFORM"](topology, workload.contents, seed=1)
+        detector = SteadyStateDetector(
+            workload.n_warmup, workload.n_measured, obs_size=10
+        )
+        results = exec_experiment(
+            topology,
+            workload,
+            netconf={},
+            strategy={"name": "LCE"},
+            cache_policy={"name": "LRU"},
+            collectors={"CACHE_HIT_RATIO": {}},
+            steady_state=detector,
+        )
+        steady_state = results["STEADY_STATE"]
+        assert steady_state["N_WARMUP"] < workload.n_warmup
+        assert steady_state["N_MEASURED"] < workload.n_measured
+        assert steady_state["CONVERGED"]
+        assert 0 < results["CACHE_HIT_RATIO"]["MEAN"] < 1
@@ -7,8 +7,11 @@ configuration file.
 
 Usage:
 
-  icarus run -r RESULTS [-c CONFIG_OVERRIDE] [-v] config
-  icarus results print [--json] RESULTS
+  icarus run -r RESULTS [-c CONFIG_OVERRIDE] [--profile] [--resume] [--serve]
+             [-v] config
+  icarus run --plan [-c CONFIG_OVERRIDE] config
+  icarus worker [-n N_PROCESSES] -k AUTHKEY HOST:PORT
+  icarus results print [--json | --instrumentation] RESULTS
   icarus results merge -o OUTPUT INPUT_1 ... INPUT_N
 
 """
@@ -31,20 +34,67 @@ def main():
 
 
 @main.command(context_settings=CONTEXT_SETTINGS)
-@click.option(
-    "--results", "-r", required=True, help="The file on which results will be saved"
-)
+@click.option("--results", "-r", help="The file on which results will be saved")
 @click.option(
     "--config-override",
     "-c",
     multiple=True,
     help="Override specific key=value parameter of configuration file",
 )
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Profile experiments with a sampling profiler and write a collapsed "
+    "stack file for each experiment next to the results file",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Resume an interrupted run, skipping the experiments whose results "
+    "are in the journal of the results file",
+)
+@click.option(
+    "--serve",
+    is_flag=True,
+    help="Hand out experiments to workers started with icarus worker on any "
+    "host instead of executing them",
+)
+@click.option(
+    "--plan",
+    is_flag=True,
+    help="Do not run simulations but print the estimated memory and run time "
+    "of each experiment and the wall-clock time of the campaign",
+)
 @click.argument("config", nargs=1, required=True)
-def run(results, config_override, config):
+def run(results, config_override, profile, resume, serve, plan, config):
     """Run a set of simulations."""
     config_override = dict(c.split("=") for c in config_override) or None
-    icarus.run(config, results, config_override)
+    if plan:
+        print(icarus.runner.plan(config, config_override))
+        return
+    if results is None:
+        raise click.UsageError("Missing option '--results' / '-r'.")
+    icarus.run(config, results, config_override, profile, resume, serve)
+
+
+@main.command(context_settings=CONTEXT_SETTINGS)
+@click.option(
+    "--n-processes",
+    "-n",
+    type=int,
+    help="The number of worker processes, by default the number of CPUs",
+)
+@click.option(
+    "--authkey",
+    "-k",
+    required=True,
+    help="The key authenticating workers, i.e. the SERVE_AUTHKEY setting or "
+    "the key logged by icarus run --serve if it is not set",
+)
+@click.argument("address", nargs=1, required=True)
+def worker(n_processes, authkey, address):
+    """Execute experiments handed out by icarus run --serve."""
+    icarus.runner.run_workers(address, authkey, n_processes)
 
 
 @main.group(context_settings=CONTEXT_SETTINGS)
@@ -63,11 +113,21 @@ def merge_results(output, inputs):
 
 @results.command("print", context_settings=CONTEXT_SETTINGS)
 @click.option("--json", "-j", is_flag=True, help="Print results in JSON format")
+@click.option(
+    "--instrumentation",
+    "-i",
+    is_flag=True,
+    help="Print only the time taken by each phase of the experiments",
+)
 @click.argument("path")
-def print_results(json, path):
+def print_results(json, instrumentation, path):
     """Print content of a results file."""
     rs = read(path)
     if json:
         print(rs.json(indent=4))
+    elif instrumentation:
+        for i, (_, results) in enumerate(rs):
+            print("EXPERIMENT {}/{}:".format(i + 1, len(rs)))
+            print(icarus.execution.instrumentation_report(results))
     else:
         print(rs.prettyprint())
@@ -6,10 +6,11 @@ provided by Icarus.
 
 import abc
 import copy
-import random
-from collections import defaultdict, deque
+import heapq
+from collections import deque
 
 from icarus.registry import register_cache_policy
+from icarus.tools import RandomStream
 from icarus.util import apportionment, inheritdoc
 
 import numpy as np
@@ -30,6 +31,7 @@ __all__ = [
     "insert_after_k_hits_cache",
     "rand_insert_cache",
     "keyval_cache",
+    "TtlCache",
     "ttl_cache",
 ]
 
@@ -47,7 +49,12 @@ class LinkedSet:
     """
 
     class _Node:
-        """Class implementing a node of the linked list"""
+        """Class implementing a node of the linked list
+
+        Nodes have no instance dictionary, as a set stores one per item.
+        """
+
+        __slots__ = ("val", "up", "down")
 
         def __init__(self, val, up=None, down=None):
             """Constructor
@@ -754,6 +761,13 @@ class BeladyMinCache(Cache):
     This policy is not implementable in practice because it requires knowledge
     of future requests, however it is very useful as a theoretical performance
     upper bound.
+
+    The position of the next request of the same item as each request of the
+    trace is computed when the cache is created and stored in an array, hence
+    memory grows with the length of the trace by 4 or 8 bytes per request.
+    Items in cache are kept in a max-heap ordered by the position of their
+    next request, whose entries are lazily deleted once outdated. Hence, each
+    operation takes amortized logarithmic time.
     """
 
     @inheritdoc(Cache)
@@ -770,12 +784,47 @@ class BeladyMinCache(Cache):
         self._maxlen = int(maxlen)
         if self._maxlen <= 0:
             raise ValueError("maxlen must be positive")
-        self._next = defaultdict(deque)
-        for i, k in enumerate(trace):
-            self._next[k].append(i)
-        for k in self._next.values():
-            k.append(np.infty)
+        if not hasattr(trace, "__len__"):
+            trace = list(trace)
+        # Map items to integer identifiers and replace each request of the
+        # trace by the identifier of the item requested
+        keys = np.asarray(trace)
+        if keys.ndim == 1 and keys.dtype.kind in "iu":
+            items, ids = np.unique(keys, return_inverse=True)
+            self._ids = {k: i for i, k in enumerate(items.tolist())}
+        else:
+            self._ids = {}
+            ids = np.fromiter(
+                (self._ids.setdefault(k, len(self._ids)) for k in trace),
+                dtype=np.int64,
+                count=len(trace),
+            )
+        # The length of the trace is used as the position of requests after
+        # the end of the trace
+        n = len(ids)
+        self._n = n
+        dtype = np.int32 if n < 2 ** 31 else np.int64
+        # Requests sorted by item and then by position, so that consecutive
+        # requests of the same item are adjacent
+        order = np.argsort(ids, kind="stable")
+        same = ids[order[:-1]] == ids[order[1:]]
+        # Position of the next request of the same item as each request
+        self._next_use = np.full(n, n, dtype=dtype)
+        self._next_use[order[:-1][same]] = order[1:][same]
+        # Position of the next request of each item not looked up yet
+        first = np.ones(n, dtype=bool)
+        first[1:] = ~same
+        self._next_request = np.full(len(self._ids), n, dtype=dtype)
+        self._next_request[ids[order[first]]] = order[first]
+        # Map items in cache to the position of their next request and the
+        # sequence number of their insertion, which breaks ties among items
+        # not requested again in favour of evicting the oldest one
         self._cache = {}
+        # Max-heap of (-next request, insertion sequence number, item)
+        # entries, outdated if the item is not in cache or has another next
+        # request
+        self._heap = []
+        self._seq = 0
 
     @inheritdoc(Cache)
     def __len__(self):
@@ -794,20 +843,44 @@ class BeladyMinCache(Cache):
     def has(self, k, *args, **kwargs):
         return k in self._cache
 
+    def _push(self, k, next_request, seq):
+        """Insert or update an item in cache"""
+        self._cache[k] = (next_request, seq)
+        heapq.heappush(self._heap, (-next_request, seq, k))
+        # Rebuild the heap if most of its entries are outdated
+        if len(self._heap) > 2 * len(self._cache) + 64:
+            self._heap = [(-pos, i, k) for k, (pos, i) in self._cache.items()]
+            heapq.heapify(self._heap)
+
     @inheritdoc(Cache)
     def get(self, k, *args, **kwargs):
-        self._next[k].popleft()
+        i = self._ids.get(k)
+        if i is not None and self._next_request[i] < self._n:
+            next_request = int(self._next_use[self._next_request[i]])
+            self._next_request[i] = next_request
+            if k in self._cache:
+                self._push(k, next_request, self._cache[k][1])
         return k in self._cache
 
     def put(self, k, *args, **kwargs):
-        if len(self) < self.maxlen:
-            self._cache[k] = self._next[k]
+        if k in self._cache:
             return None
-        next_cache = max(self._cache, key=lambda k: self._cache[k][0])
-        if self._next[k][0] < self._next[next_cache][0]:
-            self._cache.pop(next_cache)
-            self._cache[k] = self._next[k]
-            return next_cache
+        i = self._ids.get(k)
+        next_request = int(self._next_request[i]) if i is not None else self._n
+        self._seq += 1
+        if len(self._cache) < self._maxlen:
+            self._push(k, next_request, self._seq)
+            return None
+        # Discard outdated entries at the top of the heap
+        heap = self._heap
+        while self._cache.get(heap[0][2]) != (-heap[0][0], heap[0][1]):
+            heapq.heappop(heap)
+        latest_request, _, latest = heap[0]
+        if next_request < -latest_request:
+            heapq.heappop(heap)
+            self._cache.pop(latest)
+            self._push(k, next_request, self._seq)
+            return latest
         else:
             return None
 
@@ -821,6 +894,7 @@ class BeladyMinCache(Cache):
     @inheritdoc(Cache)
     def clear(self):
         self._cache.clear()
+        self._heap.clear()
 
 
 @register_cache_policy("LRU")
@@ -1111,15 +1185,21 @@ class InCacheLfuCache(Cache):
     policy in which a counter is maintained also when the content is evicted.
 
     In-cache LFU performs better than LRU under IRM demands.
-    However, its implementation is computationally expensive since it
-    cannot be implemented in such a way that both search and replacement tasks
-    can be executed in constant time. This makes it particularly unfit for
-    large caches and line speed operations.
+
+    Ties between items requested the same number of times are broken by
+    evicting the one inserted first. Items are kept in a heap ordered by
+    (frequency, insertion time), whose entries are only updated when they
+    reach its top. Hence, hits take constant time and insertions take
+    amortized logarithmic time.
     """
 
     @inheritdoc(Cache)
     def __init__(self, maxlen, *args, **kwargs):
+        # Map items in cache to their (frequency, insertion time) keys
         self._cache = {}
+        # Heap of (frequency, insertion time, item) entries of items in cache,
+        # see _pop_least_frequent
+        self._heap = []
         self.t = 0
         self._maxlen = int(maxlen)
         if self._maxlen <= 0:
@@ -1156,16 +1236,49 @@ class InCacheLfuCache(Cache):
         if not self.has(k):
             self.t += 1
             self._cache[k] = (1, self.t)
+            heapq.heappush(self._heap, (1, self.t, k))
             if len(self._cache) > self._maxlen:
-                evicted = min(self._cache, key=lambda x: self._cache[x])
+                evicted = self._pop_least_frequent()
                 self._cache.pop(evicted)
                 return evicted
         return None
 
+    def _pop_least_frequent(self):
+        """Pop from the heap the entry of the item with the smallest
+        (frequency, insertion time) key and return the item
+
+        Each item in cache has one entry in the heap, pushed with the key of
+        the item when inserted. As frequencies only increase, the key of an
+        entry is never greater than the key of its item. Entries at the top of
+        the heap with an outdated key are pushed again with the current key,
+        until the entry at the top is up to date, in which case its item has
+        the smallest key. Entries of items removed are discarded.
+
+        Returns
+        -------
+        k : any hashable type
+            The item with the smallest key
+        """
+        heap = self._heap
+        while True:
+            freq, t, k = heap[0]
+            key = self._cache.get(k)
+            if key is None or key[1] != t:
+                heapq.heappop(heap)
+            elif key[0] != freq:
+                heapq.heapreplace(heap, (key[0], t, k))
+            else:
+                heapq.heappop(heap)
+                return k
+
     @inheritdoc(Cache)
     def remove(self, k, *args, **kwargs):
         if k in self._cache:
             self._cache.pop(k)
+            # Rebuild the heap if most of its entries are of removed items
+            if len(self._heap) > 2 * len(self._cache) + 64:
+                self._heap = [(freq, t, k) for k, (freq, t) in self._cache.items()]
+                heapq.heapify(self._heap)
             return True
         else:
             return False
@@ -1173,6 +1286,7 @@ class InCacheLfuCache(Cache):
     @inheritdoc(Cache)
     def clear(self):
         self._cache.clear()
+        self._heap.clear()
 
 
 @register_cache_policy("PERFECT_LFU")
@@ -1189,18 +1303,26 @@ class PerfectLfuCache(Cache):
     counters for every item, even for those not in the cache.
 
     In contrast to LRU, Perfect-LFU has been shown to perform optimally under
-    IRM demands. However, its implementation is computationally expensive since
-    it cannot be implemented in such a way that both search and replacement
-    tasks can be executed in constant time. This makes it particularly unfit
-    for large caches and line speed operations.
+    IRM demands.
+
+    Ties between items requested the same number of times are broken by
+    evicting the one requested first. As in `InCacheLfuCache`, items in cache
+    are kept in a heap whose entries are only updated when they reach its
+    top, hence hits take constant time and insertions take amortized
+    logarithmic time.
     """
 
     @inheritdoc(Cache)
     def __init__(self, maxlen, *args, **kwargs):
         # Dict storing counter for all contents, not only those in cache
         self._counter = {}
-        # Set storing only items currently in cache
-        self._cache = set()
+        # Dict mapping items currently in cache to the sequence number of
+        # their insertion
+        self._cache = {}
+        # Heap of (frequency, time, insertion sequence number, item) entries
+        # of items in cache
+        self._heap = []
+        self._seq = 0
         self.t = 0
         self._maxlen = int(maxlen)
         if self._maxlen <= 0:
@@ -1246,17 +1368,45 @@ class PerfectLfuCache(Cache):
                 # If I always call a get before a put, this line should never
                 # be executed
                 self._counter[k] = (1, self.t)
-            self._cache.add(k)
+            self._seq += 1
+            self._cache[k] = self._seq
+            heapq.heappush(self._heap, (*self._counter[k], self._seq, k))
             if len(self._cache) > self._maxlen:
-                evicted = min(self._cache, key=lambda x: self._counter[x])
-                self._cache.remove(evicted)
+                evicted = self._pop_least_frequent()
+                self._cache.pop(evicted)
                 return evicted
         return None
 
+    def _pop_least_frequent(self):
+        """Pop from the heap the entry of the item with the smallest counter
+        and return the item, see `InCacheLfuCache._pop_least_frequent`
+
+        Returns
+        -------
+        k : any hashable type
+            The item with the smallest counter
+        """
+        heap = self._heap
+        while True:
+            freq, t, seq, k = heap[0]
+            if self._cache.get(k) != seq:
+                heapq.heappop(heap)
+            elif self._counter[k][0] != freq:
+                heapq.heapreplace(heap, (self._counter[k][0], t, seq, k))
+            else:
+                heapq.heappop(heap)
+                return k
+
     @inheritdoc(Cache)
     def remove(self, k, *args, **kwargs):
         if k in self._cache:
-            self._cache.remove(k)
+            self._cache.pop(k)
+            # Rebuild the heap if most of its entries are of removed items
+            if len(self._heap) > 2 * len(self._cache) + 64:
+                self._heap = [
+                    (*self._counter[k], seq, k) for k, seq in self._cache.items()
+                ]
+                heapq.heapify(self._heap)
             return True
         else:
             return False
@@ -1265,6 +1415,7 @@ class PerfectLfuCache(Cache):
     def clear(self):
         self._cache.clear()
         self._counter.clear()
+        self._heap.clear()
 
 
 @register_cache_policy("FIFO")
@@ -1480,15 +1631,36 @@ class RandEvictionCache(Cache):
 
     In case of stationary IRM workloads, the RAND eviction policy provably
     achieves the same cache hit ratio of the FIFO replacement policy.
+
+    Items are stored in an array of slots and mapped to their slot, hence
+    insertions, evictions and removals take constant time.
+
+    Items to evict are selected by a random generator owned by the cache and
+    seeded by *seed*, rather than by the global *random* module. Hence,
+    evictions are not reproducible if no seed is specified, either directly
+    or through the *SEED* setting, even if the workload is seeded.
     """
 
     @inheritdoc(Cache)
-    def __init__(self, maxlen, *args, **kwargs):
+    def __init__(self, maxlen, seed=None, *args, **kwargs):
+        """Constructor
+
+        Parameters
+        ----------
+        maxlen : int
+            The maximum number of items the cache can store
+        seed : int, SeedSequence, Generator or any hashable type, optional
+            The seed of the random number generator selecting the items to
+            evict, see `random_generator`
+        """
         self._maxlen = int(maxlen)
         if self._maxlen <= 0:
             raise ValueError("maxlen must be positive")
-        self._cache = set()
+        # Map items in cache to their slot. Slots of items in cache are the
+        # first len(self._cache) slots of the array
+        self._cache = {}
         self._a = [None for _ in range(self._maxlen)]
+        self._random = RandomStream(seed)
 
     @inheritdoc(Cache)
     def __len__(self):
@@ -1515,28 +1687,34 @@ class RandEvictionCache(Cache):
         evicted = None
         if not self.has(k):
             if len(self._cache) == self._maxlen:
-                evicted_index = random.randint(0, self.maxlen - 1)
+                evicted_index = int(self._random.random() * self._maxlen)
                 evicted = self._a[evicted_index]
                 self._a[evicted_index] = k
-                self._cache.remove(evicted)
+                del self._cache[evicted]
+                self._cache[k] = evicted_index
             else:
                 self._a[len(self._cache)] = k
-            self._cache.add(k)
+                self._cache[k] = len(self._cache)
         return evicted
 
     @inheritdoc(Cache)
     def remove(self, k, *args, **kwargs):
         if k not in self._cache:
             return False
-        index = self._a.index(k)
-        self._a[index] = self._a[len(self._cache) - 1]
-        self._a[len(self._cache) - 1] = None
-        self._cache.remove(k)
+        # Move the item of the last slot in use to the slot of the item removed
+        index = self._cache.pop(k)
+        last = len(self._cache)
+        if index != last:
+            moved = self._a[last]
+            self._a[index] = moved
+            self._cache[moved] = index
+        self._a[last] = None
         return True
 
     @inheritdoc(Cache)
     def clear(self):
         self._cache.clear()
+        self._a = [None for _ in range(self._maxlen)]
 
 
 def insert_after_k_hits_cache(cache, k=2, memory=None):
@@ -1629,8 +1807,9 @@ def rand_insert_cache(cache, p, seed=None):
         The instance of a cache to be applied random insertion
     p : float
         the insert probability
-    seed : any hashable type, optional
-        The seed of the random number generator
+    seed : int, SeedSequence, Generator or any hashable type, optional
+        The seed of the random number generator, see `random_generator`. If
+        not specified, insertions are not reproducible
 
     Returns
     -------
@@ -1642,11 +1821,11 @@ def rand_insert_cache(cache, p, seed=None):
     if p < 0 or p > 1:
         raise ValueError("p must be a value between 0 and 1")
     cache = copy.deepcopy(cache)
-    random.seed(seed)
+    rand = RandomStream(seed)
     c_put = cache.put
 
     def put(k, *args, **kwargs):
-        if random.random() < p:
+        if rand.random() < p:
             return c_put(k)
 
     cache.put = put
@@ -1799,61 +1978,78 @@ def keyval_cache(cache):
     return cache
 
 
-def ttl_cache(cache, f_time):
-    """Return a TTL cache.
+class TtlCache(Cache):
+    """TTL cache.
 
-    This function takes as a input a cache policy and returns a new policy
-    where items, when inserted, are (optionally) labelled with their expiration
-    time and are automatically evicted when their validity expires.
+    This class wraps a cache whose items, when inserted, are (optionally)
+    labelled with their expiration time and are automatically evicted when
+    their validity expires. Items are otherwise evicted according to the
+    replacement policy of the wrapped cache.
 
     The time validity is verified against the return value of the callable
     argument *f_time*, which is called whenever a purging is executed.
 
     This implementation can be used with both real time and simulated time.
 
-    Parameters
-    ----------
-    cache : Cache
-        The instance of a cache to be changed to a TTL cache
-    f_time : callable
-        A function that returns the current time (simulated or real). The
-        return type must be a numerical value, e.g. float
-
-    Returns
-    -------
-    cache : Cache
-        The modified cache instance
+    Expiration times are indexed by a min-heap with lazy deletion, hence
+    inserting an item with a finite TTL and purging an expired item take
+    O(log n) time. Attributes not defined by this class, e.g. *position*,
+    are looked up in the wrapped cache.
 
     Notes
     -----
-    The returned TTL cache performs purging operations only when *has*, *get*,
-    *put* and *dump* operations are performed. This ensures correctness when
-    normal caches are used with common routing and caching strategies.
-    However, if other operations like *position* or *len* are executed,
-    results may take into account also expired items. In such cases, it is then
-    advisable to execute a *purge* first.
+    A TTL cache performs purging operations only when *has*, *get*, *put* and
+    *dump* operations are performed. This ensures correctness when normal
+    caches are used with common routing and caching strategies. However, if
+    other operations like *position* or *len* are executed, results may take
+    into account also expired items. In such cases, it is then advisable to
+    execute a *purge* first.
     """
-    if not isinstance(cache, Cache):
-        raise TypeError("cache must be an instance of Cache or its subclasses")
-    if len(cache) > 0:
-        raise ValueError("the cache must be empty")
-    if not hasattr(f_time, "__call__"):
-        raise TypeError("f_time must be callable")
-    cache = copy.deepcopy(cache)
 
-    cache.f_time = f_time
-    cache.expiry = {}
+    def __init__(self, cache, f_time):
+        """Constructor
 
-    cache._exp_list = LinkedSet()
+        Parameters
+        ----------
+        cache : Cache
+            The cache storing the items, which must be empty
+        f_time : callable
+            A function that returns the current time (simulated or real). The
+            return type must be a numerical value, e.g. float
+        """
+        if not isinstance(cache, Cache):
+            raise TypeError("cache must be an instance of Cache or its subclasses")
+        if len(cache) > 0:
+            raise ValueError("the cache must be empty")
+        if not hasattr(f_time, "__call__"):
+            raise TypeError("f_time must be callable")
+        self._cache = cache
+        self.f_time = f_time
+        # Map items to their expiration time
+        self.expiry = {}
+        # Heap of (expiration time, insertion sequence number, item) entries
+        # of items with finite expiration time. Entries whose expiration time
+        # differs from the one of their item are outdated and discarded when
+        # popped
+        self._heap = []
+        self._seq = 0
+
+    def __getattr__(self, name):
+        # Only called for attributes not found in this instance
+        if name == "_cache":
+            raise AttributeError(name)
+        return getattr(self._cache, name)
 
-    c_put = cache.put
-    c_get = cache.get
-    c_has = cache.has
-    c_remove = cache.remove
-    c_dump = cache.dump
-    c_clear = cache.clear
+    @inheritdoc(Cache)
+    def __len__(self):
+        return len(self._cache)
 
-    def _purge_till(expiry):
+    @property
+    @inheritdoc(Cache)
+    def maxlen(self):
+        return self._cache.maxlen
+
+    def _purge_till(self, expiry):
         """Purge all entries expired before a certain time
 
         Parameters
@@ -1861,27 +2057,31 @@ def ttl_cache(cache, f_time):
         expiry : float
             Cutoff expiration time
         """
-        while (
-            cache._exp_list.bottom is not None
-            and cache.expiry[cache._exp_list.bottom] < expiry
-        ):
-            expired = cache._exp_list.pop_bottom()
-            cache.expiry.pop(expired)
-            c_remove(expired)
-
-    def purge():
+        heap = self._heap
+        while heap and heap[0][0] < expiry:
+            expires, _, k = heapq.heappop(heap)
+            if self.expiry.get(k) == expires:
+                del self.expiry[k]
+                self._cache.remove(k)
+
+    def purge(self):
         """Purge all expired items"""
-        cache._purge_till(cache.f_time())
+        self._purge_till(self.f_time())
 
-    def get(k, *args, **kwargs):
-        if c_get(k):
-            if cache.f_time() < cache.expiry[k]:
+    @inheritdoc(Cache)
+    def has(self, k, *args, **kwargs):
+        return self._cache.has(k) and self.f_time() <= self.expiry[k]
+
+    @inheritdoc(Cache)
+    def get(self, k, *args, **kwargs):
+        if self._cache.get(k):
+            if self.f_time() < self.expiry[k]:
                 return True
             else:
-                remove(k)
+                self.remove(k)
         return False
 
-    def put(k, ttl=None, expires=None, *args, **kwargs):
+    def put(self, k, ttl=None, expires=None, *args, **kwargs):
         """Insert an item in the cache if not already inserted.
 
         If the element is already present in the cache, it will not be inserted
@@ -1903,7 +2103,7 @@ def ttl_cache(cache, f_time):
         evicted : any hashable type
             The evicted object or *None* if no contents were evicted.
         """
-        now = cache.f_time()
+        now = self.f_time()
         if ttl is not None:
             if expires is not None:
                 raise ValueError(
@@ -1921,36 +2121,33 @@ def ttl_cache(cache, f_time):
             elif expires <= now:
                 return None
         # Purge expired items only if cache is full for performance reasons
-        if len(cache) == cache.maxlen:
-            cache._purge_till(now)
-        evicted = c_put(k)
+        if len(self._cache) == self._cache.maxlen:
+            self._purge_till(now)
+        evicted = self._cache.put(k)
         if evicted is not None:
-            cache.expiry.pop(evicted)
-            cache._exp_list.remove(evicted)
-        if k not in cache.expiry or cache.expiry[k] < expires:
-            cache.expiry[k] = expires
-            if k in cache._exp_list:
-                cache._exp_list.remove(k)
-            if len(cache._exp_list) == 0:
-                cache._exp_list.append_top(k)
-            else:
-                for i in cache._exp_list:
-                    if expires >= cache.expiry[i]:
-                        cache._exp_list.insert_above(i, k)
-                        break
-                else:
-                    cache._exp_list.append_bottom(k)
+            self.expiry.pop(evicted)
+        if k not in self.expiry or self.expiry[k] < expires:
+            self.expiry[k] = expires
+            if expires < np.infty:
+                heapq.heappush(self._heap, (expires, self._seq, k))
+                self._seq += 1
+                if len(self._heap) > 2 * len(self.expiry) + 64:
+                    self._compact()
         return evicted
 
-    def has(k, *args, **kwargs):
-        return c_has(k) and cache.f_time() <= cache.expiry[k]
+    def _compact(self):
+        """Discard all outdated entries from the heap"""
+        self._heap = [
+            entry for entry in self._heap if self.expiry.get(entry[2]) == entry[0]
+        ]
+        heapq.heapify(self._heap)
 
-    def remove(k, *args, **kwargs):
-        c_remove(k)
-        cache.expiry.pop(k)
-        cache._exp_list.remove(k)
+    @inheritdoc(Cache)
+    def remove(self, k, *args, **kwargs):
+        self.expiry.pop(k, None)
+        return self._cache.remove(k)
 
-    def dump():
+    def dump(self):
         """Return a dump of all the elements currently in the cache possibly
         sorted according to the eviction policy.
 
@@ -1960,27 +2157,41 @@ def ttl_cache(cache, f_time):
             The list of items currently stored in the cache represented as
             (key, expiration time) pairs
         """
-        cache.purge()
-        dump = c_dump()
-        return [(k, cache.expiry[k]) for k in dump]
+        self.purge()
+        return [(k, self.expiry[k]) for k in self._cache.dump()]
 
-    def clear():
-        c_clear()
-        cache.expiry.clear()
-        cache._exp_list.clear()
+    @inheritdoc(Cache)
+    def clear(self):
+        self._cache.clear()
+        self.expiry.clear()
+        self._heap = []
 
-    cache._purge_till = _purge_till
 
-    cache.get = get
-    cache.put = put
-    cache.has = has
-    cache.remove = remove
-    cache.dump = dump
-    cache.clear = clear
-    cache.purge = purge
-    cache.clear.__doc__ = c_clear.__doc__
+def ttl_cache(cache, f_time):
+    """Return a TTL cache.
 
-    return cache
+    This function takes as a input a cache policy and returns a new policy
+    where items, when inserted, are (optionally) labelled with their expiration
+    time and are automatically evicted when their validity expires.
+
+    The input cache is not modified. See *TtlCache* for details.
+
+    Parameters
+    ----------
+    cache : Cache
+        The instance of a cache to be changed to a TTL cache
+    f_time : callable
+        A function that returns the current time (simulated or real). The
+        return type must be a numerical value, e.g. float
+
+    Returns
+    -------
+    cache : TtlCache
+        The TTL cache
+    """
+    if not isinstance(cache, Cache):
+        raise TypeError("cache must be an instance of Cache or its subclasses")
+    return TtlCache(copy.deepcopy(cache), f_time)
 
 
 def ttl_keyval_cache():
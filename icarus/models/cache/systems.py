@@ -1,9 +1,8 @@
 """Simple networks of caches modeled as single caches."""
-import random
 import numpy as np
 
 from icarus.util import inheritdoc
-from icarus.tools import DiscreteDist
+from icarus.tools import DiscreteDist, RandomStream
 from icarus.registry import register_cache_policy, CACHE_POLICY
 
 from .policies import Cache
@@ -117,7 +116,7 @@ class TreeCache:
     selected node.
     """
 
-    def __init__(self, leaf_caches, root_cache, **kwargs):
+    def __init__(self, leaf_caches, root_cache, seed=None, **kwargs):
         """Constructor
 
         Parameters
@@ -126,7 +125,12 @@ class TreeCache:
             An array of caching nodes instances on the path
         segments : int
             The number of segments
+        seed : int, SeedSequence or any hashable type, optional
+            The seed of the random number generator selecting leaf nodes, see
+            `random_generator`. If not specified, selections are not
+            reproducible
         """
+        self._random = RandomStream(seed)
         self._leaf_caches = leaf_caches
         self._root_cache = root_cache
         self._len = sum(len(c) for c in leaf_caches) + len(root_cache)
@@ -144,7 +148,7 @@ class TreeCache:
         raise NotImplementedError("This method is not implemented")
 
     def get(self, k):
-        self._leaf = random.choice(self._leaf_caches)
+        self._leaf = self._random.choice(self._leaf_caches)
         if self._leaf.get(k):
             return True
         else:
@@ -211,7 +215,7 @@ class ArrayCache:
     selected node.
     """
 
-    def __init__(self, caches, weights=None, **kwargs):
+    def __init__(self, caches, weights=None, seed=None, **kwargs):
         """Constructor
 
         Parameters
@@ -221,6 +225,10 @@ class ArrayCache:
         weights : array-like
             Random weights according to which a cache of the array should be
             selected to process a given request
+        seed : int, SeedSequence or any hashable type, optional
+            The seed of the random number generator selecting caches, see
+            `random_generator`. If not specified, selections are not
+            reproducible
         """
         self._caches = caches
         self._len = sum(len(c) for c in caches)
@@ -231,10 +239,11 @@ class ArrayCache:
                 raise ValueError("weights must sum up to 1")
             if len(weights) != self._n_caches:
                 raise ValueError("weights must have as many elements as nr of caches")
-            randvar = DiscreteDist(weights)
+            randvar = DiscreteDist(weights, seed)
             self.select_cache = lambda: self._caches[randvar.rv() - 1]
         else:
-            self.select_cache = lambda: random.choice(self._caches)
+            rand = RandomStream(seed)
+            self.select_cache = lambda: rand.choice(self._caches)
 
     def __len__(self):
         return self._len
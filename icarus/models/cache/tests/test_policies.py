@@ -30,6 +30,12 @@ class TestLinkedSet:
             return False
         return list(reversed(list(linked_set))) == list(reversed(linked_set))
 
+    def test_node_slots(self):
+        c = cache.LinkedSet([1, 2])
+        assert not hasattr(c._top, "__dict__")
+        with pytest.raises(AttributeError):
+            c._top.other = 1
+
     def test_append_top(self):
         c = cache.LinkedSet()
         c.append_top(1)
@@ -278,6 +284,61 @@ class TestMinCache:
             assert c.put(i) is None
             assert set(range(min(i + 1, size))) == set(c.dump())
 
+    def test_reference(self):
+        # Compare with a scan of the trace for the next request of each item,
+        # breaking ties in favour of the item inserted first
+        rng = np.random.default_rng(0)
+        trace = ["c%d" % k for k in rng.zipf(1.5, 2000) % 50]
+        c = cache.BeladyMinCache(5, iter(trace))
+        cached = {}
+        for i, k in enumerate(trace):
+            hit = k in cached
+            assert hit == c.get(k)
+            if hit:
+                continue
+
+            def next_request(item):
+                future = trace[i + 1 :]
+                return future.index(item) if item in future else len(trace)
+
+            evicted = c.put(k)
+            if len(cached) < 5:
+                assert evicted is None
+                cached[k] = None
+                continue
+            latest = max(cached, key=next_request)
+            if next_request(k) < next_request(latest):
+                assert evicted == latest
+                del cached[evicted]
+                cached[k] = None
+            else:
+                assert evicted is None
+            assert set(cached) == c.dump()
+
+    def test_unknown_item(self):
+        # Items not in the trace are never requested again
+        c = cache.BeladyMinCache(1, [1, 2])
+        assert not c.get(3)
+        assert c.put(3) is None
+        assert c.put(1) == 3
+        assert c.put(4) is None
+        assert {1} == c.dump()
+
+    def test_evict_oldest_not_requested_again(self):
+        trace = [1, 2, 3, 2, 1, 4, 4]
+        c = cache.BeladyMinCache(2, trace)
+        for k in (1, 2):
+            assert not c.get(k)
+            assert c.put(k) is None
+        assert not c.get(3)
+        assert c.put(3) is None
+        # Neither 1 nor 2 is requested again after being hit, 1 is older
+        assert c.get(2)
+        assert c.get(1)
+        assert not c.get(4)
+        assert c.put(4) == 1
+        assert {2, 4} == c.dump()
+
 
 class TestLruCache:
     def test_lru(self):
@@ -607,6 +668,25 @@ class TestRandCache:
         for v in (4, 3, 1):
             assert c.has(v)
 
+    def test_remove_evict(self):
+        c = cache.RandEvictionCache(4, seed=0)
+        for v in (1, 2, 3, 4):
+            c.put(v)
+        assert c.remove(1)
+        assert not c.remove(1)
+        c.put(5)
+        assert c.put(6) in {2, 3, 4, 5}
+        assert len(c) == 4
+        assert sorted(c.dump()) == sorted(c._a)
+
+    def test_seed(self):
+        def evicted(seed):
+            c = cache.RandEvictionCache(10, seed=seed)
+            return [c.put(v) for v in range(1000)]
+
+        assert evicted(1) == evicted(1)
+        assert evicted(1) != evicted(2)
+
 
 class TestInCacheLfuCache:
     def test_lfu(self):
@@ -706,6 +786,37 @@ class TestPerfectLfuCache:
         assert not c.remove(3)
 
 
+class TestLfuEviction:
+    """Evictions of LFU caches must match those of a linear scan of the
+    counters of the items in cache"""
+
+    @pytest.mark.parametrize(
+        "cache_class", [cache.InCacheLfuCache, cache.PerfectLfuCache]
+    )
+    def test_evictions(self, cache_class):
+        perfect = cache_class is cache.PerfectLfuCache
+        c = cache_class(20)
+        # (frequency, time of first request or insertion) of items, only
+        # those in cache for In-Cache-LFU
+        counter = {}
+        contents = np.random.default_rng(0).zipf(1.5, size=5000) % 100
+        for t, k in enumerate(contents.tolist()):
+            hit = c.get(k)
+            if perfect or hit:
+                freq, first = counter.get(k, (0, t))
+                counter[k] = freq + 1, first
+            if hit:
+                continue
+            # Perfect-LFU also counts insertions
+            counter[k] = (counter[k][0] + 1, counter[k][1]) if perfect else (1, t)
+            cached = set(c.dump()) | {k}
+            expected = min(cached, key=counter.get) if len(cached) > 20 else None
+            assert expected == c.put(k)
+            if expected is not None and not perfect:
+                del counter[expected]
+        assert len(c) == 20
+
+
 class TestInsertAfterKHits:
     def test_put_get_no_memory(self):
         c = cache.LruCache(2)
@@ -1050,3 +1161,39 @@ class TestTtlCache:
         assert not c.has(1)
         c.put(3)
         assert not ttl_c.has(3)
+
+    def test_expiry(self):
+        curr_time = 0
+        def f_time(): return curr_time
+        c = cache.ttl_cache(cache.FifoCache(1000), f_time)
+        ttls = np.random.default_rng(0).integers(1, 100, size=1000).tolist()
+        for k, ttl in enumerate(ttls):
+            c.put(k, ttl=ttl)
+        for k in range(0, 1000, 3):
+            c.put(k, ttl=ttls[k] + 50)
+        for k in range(0, 1000, 7):
+            c.remove(k)
+        for curr_time in (0, 20, 60, 120, 200):
+            expected = {
+                k: ttl + 50 if k % 3 == 0 else ttl
+                for k, ttl in enumerate(ttls)
+                if k % 7 != 0 and curr_time <= (ttl + 50 if k % 3 == 0 else ttl)
+            }
+            assert dict(c.dump()) == expected
+        assert len(c._heap) <= 2 * len(c.expiry) + 64
+
+    def test_remove(self):
+        c = cache.ttl_cache(cache.FifoCache(3), lambda: 0)
+        c.put(1, ttl=4)
+        assert c.remove(1)
+        assert not c.remove(1)
+        assert c.dump() == []
+
+    def test_wrapped_attributes(self):
+        c = cache.ttl_cache(cache.LruCache(4), lambda: 0)
+        c.put(1, ttl=4)
+        c.put(2, ttl=4)
+        assert isinstance(c, cache.TtlCache)
+        assert c.maxlen == 4
+        assert c.position(2) == 0
+        assert c.position(1) == 1
@@ -51,6 +51,60 @@ class Strategy:
             "The selected strategy must implement " "a process_event method"
         )
 
+    def warmup_event(self, time, receiver, content):
+        """Process an event received during the warmup phase.
+
+        Warmup events are not logged, so they only need to bring caches to the
+        state that `process_event` would leave them in. The default
+        implementation simply calls `process_event` with *log* set to *False*.
+        Strategies can override it with a faster implementation which does
+        not open a session or forward requests and contents hop by hop but
+        only reads and writes caches using the `get_content_warmup` and
+        `put_content_warmup` methods of the controller. Overriding
+        implementations must perform the same cache operations and draw the
+        same random numbers, in the same order, as `process_event`.
+
+        Parameters
+        ----------
+        time : int
+            The timestamp of the event
+        receiver : any hashable type
+            The receiver node requesting a content
+        content : any hashable type
+            The content identifier requested by the receiver
+        """
+        self.process_event(time, receiver, content, False)
+
+    def process_batch(self, time, receiver, content, log):
+        """Process a block of events received from the simulation engine.
+
+        This method is invoked by the simulation engine when batched execution
+        is enabled. The default implementation processes events one at a time
+        by calling `process_event`, or `warmup_event` for events which are not
+        logged. Strategies can override it to process a
+        whole block within a single loop, for example by binding frequently
+        used methods to local variables.
+
+        Parameters
+        ----------
+        time : sequence of int
+            The timestamps of the events
+        receiver : sequence of any hashable type
+            The receiver nodes requesting a content
+        content : sequence of any hashable type
+            The content identifiers requested by the receivers
+        log : sequence of bool
+            Indicates whether each event must be registered by the data
+            collectors attached to the network.
+        """
+        process_event = self.process_event
+        warmup_event = self.warmup_event
+        for t, r, c, l in zip(time, receiver, content, log):
+            if l:
+                process_event(t, r, c, l)
+            else:
+                warmup_event(t, r, c)
+
 
 @register_strategy("NO_CACHE")
 class NoCache(Strategy):
@@ -78,3 +132,8 @@ class NoCache(Strategy):
         path = list(reversed(path))
         self.controller.forward_content_path(source, receiver, path)
         self.controller.end_session()
+
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        # No cache is ever read or written
+        pass
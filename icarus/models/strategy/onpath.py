@@ -1,10 +1,9 @@
 """Implementations of all on-path strategies"""
-import random
-
 import networkx as nx
 
 from icarus.registry import register_strategy
-from icarus.util import inheritdoc, path_links
+from icarus.tools import RandomStream
+from icarus.util import inheritdoc
 
 from .base import Strategy
 
@@ -64,6 +63,12 @@ class Partition(Strategy):
         self.controller.forward_content_path(cache, receiver)
         self.controller.end_session()
 
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        cache = self.cache_assignment[receiver]
+        if not self.controller.get_content_warmup(cache, content):
+            self.controller.put_content_warmup(cache, content)
+
 
 @register_strategy("EDGE")
 class Edge(Strategy):
@@ -91,10 +96,11 @@ class Edge(Strategy):
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
         edge_cache = None
-        for u, v in path_links(path):
-            self.controller.forward_request_hop(u, v)
+        for hop in range(1, len(path)):
+            v = path[hop]
             if self.view.has_cache(v):
                 edge_cache = v
+                self.controller.forward_request_path(receiver, v, path[: hop + 1])
                 if self.controller.get_content(v):
                     serving_node = v
                 else:
@@ -105,16 +111,26 @@ class Edge(Strategy):
                 break
         else:
             # No caches on the path at all, get it from source
+            self.controller.forward_request_path(receiver, v, path)
             self.controller.get_content(v)
             serving_node = v
 
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
-        self.controller.forward_content_path(serving_node, receiver, path)
+        self.controller.forward_content_path(serving_node, receiver)
         if serving_node == source:
             self.controller.put_content(edge_cache)
         self.controller.end_session()
 
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        path = self.view.shortest_path(receiver, self.view.content_source(content))
+        for v in path[1:]:
+            if self.view.has_cache(v):
+                # Only the edge cache is queried and, on a miss, updated
+                if not self.controller.get_content_warmup(v, content):
+                    self.controller.put_content_warmup(v, content)
+                break
+
 
 @register_strategy("LCE")
 class LeaveCopyEverywhere(Strategy):
@@ -135,24 +151,71 @@ class LeaveCopyEverywhere(Strategy):
         path = self.view.shortest_path(receiver, source)
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
-        for u, v in path_links(path):
-            self.controller.forward_request_hop(u, v)
+        for hop in range(1, len(path)):
+            v = path[hop]
             if self.view.has_cache(v):
                 if self.controller.get_content(v):
-                    serving_node = v
                     break
             # No cache hits, get content from source
             self.controller.get_content(v)
-            serving_node = v
+        serving_node = v
+        self.controller.forward_request_path(receiver, serving_node, path[: hop + 1])
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
-        for u, v in path_links(path):
-            self.controller.forward_content_hop(u, v)
+        path = self.view.shortest_path(serving_node, receiver)
+        self.controller.forward_content_path(serving_node, receiver)
+        for v in path[1:]:
             if self.view.has_cache(v):
                 # insert content
                 self.controller.put_content(v)
         self.controller.end_session()
 
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        get_content = self.controller.get_content_warmup
+        put_content = self.controller.put_content_warmup
+        path = self.view.shortest_path(receiver, self.view.content_source(content))
+        for v in path[1:]:
+            if get_content(v, content):
+                break
+            # A cache miss is looked up twice by process_event, do the same
+            # so that caches end up in the same state
+            get_content(v, content)
+        for v in self.view.shortest_path(v, receiver)[1:]:
+            put_content(v, content)
+
+    @inheritdoc(Strategy)
+    def process_batch(self, time, receiver, content, log):
+        content_source = self.view.content_source
+        shortest_path = self.view.shortest_path
+        has_cache = self.view.has_cache
+        start_session = self.controller.start_session
+        forward_request_path = self.controller.forward_request_path
+        forward_content_path = self.controller.forward_content_path
+        get_content = self.controller.get_content
+        put_content = self.controller.put_content
+        end_session = self.controller.end_session
+        warmup_event = self.warmup_event
+        for t, r, c, l in zip(time, receiver, content, log):
+            if not l:
+                warmup_event(t, r, c)
+                continue
+            path = shortest_path(r, content_source(c))
+            start_session(t, r, c, l)
+            # Query caches on the path up to the first hit or the source
+            for hop in range(1, len(path)):
+                v = path[hop]
+                if has_cache(v):
+                    if get_content(v):
+                        break
+                get_content(v)
+            forward_request_path(r, v, path[: hop + 1])
+            # Return content, inserting it in all caches on the path
+            forward_content_path(v, r)
+            for v in shortest_path(v, r)[1:]:
+                if has_cache(v):
+                    put_content(v)
+            end_session()
+
 
 @register_strategy("LCD")
 class LeaveCopyDown(Strategy):
@@ -180,8 +243,8 @@ class LeaveCopyDown(Strategy):
         path = self.view.shortest_path(receiver, source)
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
-        for u, v in path_links(path):
-            self.controller.forward_request_hop(u, v)
+        for hop in range(1, len(path)):
+            v = path[hop]
             if self.view.has_cache(v):
                 if self.controller.get_content(v):
                     serving_node = v
@@ -190,18 +253,31 @@ class LeaveCopyDown(Strategy):
             # No cache hits, get content from source
             self.controller.get_content(v)
             serving_node = v
+        self.controller.forward_request_path(receiver, serving_node, path[: hop + 1])
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
+        path = self.view.shortest_path(serving_node, receiver)
+        self.controller.forward_content_path(serving_node, receiver)
         # Leave a copy of the content only in the cache one level down the hit
         # caching node
         copied = False
-        for u, v in path_links(path):
-            self.controller.forward_content_hop(u, v)
+        for v in path[1:]:
             if not copied and v != receiver and self.view.has_cache(v):
                 self.controller.put_content(v)
                 copied = True
         self.controller.end_session()
 
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        get_content = self.controller.get_content_warmup
+        path = self.view.shortest_path(receiver, self.view.content_source(content))
+        for v in path[1:]:
+            if get_content(v, content):
+                break
+        for v in self.view.shortest_path(v, receiver)[1:-1]:
+            if self.view.has_cache(v):
+                self.controller.put_content_warmup(v, content)
+                break
+
 
 @register_strategy("PROB_CACHE")
 class ProbCache(Strategy):
@@ -216,6 +292,10 @@ class ProbCache(Strategy):
     version of ProbCache the :math`x/c` factor of the ProbCache equation is
     raised to the power of :math`c`.
 
+    Caching decisions are drawn from a random generator seeded by *seed*, see
+    `random_generator`, hence they are not reproducible if it is not
+    specified.
+
     References
     ----------
     ..[2] I. Psaras, W. Chai, G. Pavlou, Probabilistic In-Network Caching for
@@ -228,9 +308,10 @@ class ProbCache(Strategy):
     """
 
     @inheritdoc(Strategy)
-    def __init__(self, view, controller, t_tw=10):
+    def __init__(self, view, controller, t_tw=10, seed=None):
         super().__init__(view, controller)
         self.t_tw = t_tw
+        self.random = RandomStream(seed)
         self.cache_size = view.cache_nodes(size=True)
 
     @inheritdoc(Strategy)
@@ -241,9 +322,7 @@ class ProbCache(Strategy):
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
         for hop in range(1, len(path)):
-            u = path[hop - 1]
             v = path[hop]
-            self.controller.forward_request_hop(u, v)
             if self.view.has_cache(v):
                 if self.controller.get_content(v):
                     serving_node = v
@@ -252,27 +331,49 @@ class ProbCache(Strategy):
             # No cache hits, get content from source
             self.controller.get_content(v)
             serving_node = v
+        self.controller.forward_request_path(receiver, serving_node, path[: hop + 1])
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
+        path = self.view.shortest_path(serving_node, receiver)
+        self.controller.forward_content_path(serving_node, receiver)
         c = len([node for node in path if self.view.has_cache(node)])
         x = 0.0
         for hop in range(1, len(path)):
-            u = path[hop - 1]
             v = path[hop]
             N = sum(
                 [self.cache_size[n] for n in path[hop - 1 :] if n in self.cache_size]
             )
             if v in self.cache_size:
                 x += 1
-            self.controller.forward_content_hop(u, v)
             if v != receiver and v in self.cache_size:
                 # The (x/c) factor raised to the power of "c" according to the
                 # extended version of ProbCache published in IEEE TPDS
                 prob_cache = float(N) / (self.t_tw * self.cache_size[v]) * (x / c) ** c
-                if random.random() < prob_cache:
+                if self.random.random() < prob_cache:
                     self.controller.put_content(v)
         self.controller.end_session()
 
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        get_content = self.controller.get_content_warmup
+        path = self.view.shortest_path(receiver, self.view.content_source(content))
+        for v in path[1:]:
+            if get_content(v, content):
+                break
+        path = self.view.shortest_path(v, receiver)
+        c = len([node for node in path if self.view.has_cache(node)])
+        x = 0.0
+        for hop in range(1, len(path)):
+            v = path[hop]
+            N = sum(
+                [self.cache_size[n] for n in path[hop - 1 :] if n in self.cache_size]
+            )
+            if v in self.cache_size:
+                x += 1
+            if v != receiver and v in self.cache_size:
+                prob_cache = float(N) / (self.t_tw * self.cache_size[v]) * (x / c) ** c
+                if self.random.random() < prob_cache:
+                    self.controller.put_content_warmup(v, content)
+
 
 @register_strategy("CL4M")
 class CacheLessForMore(Strategy):
@@ -310,18 +411,20 @@ class CacheLessForMore(Strategy):
         path = self.view.shortest_path(receiver, source)
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
-        for u, v in path_links(path):
-            self.controller.forward_request_hop(u, v)
+        for hop in range(1, len(path)):
+            v = path[hop]
             if self.view.has_cache(v):
                 if self.controller.get_content(v):
                     serving_node = v
                     break
-        # No cache hits, get content from source
         else:
+            # No cache hits, get content from source
             self.controller.get_content(v)
             serving_node = v
+        self.controller.forward_request_path(receiver, serving_node, path[: hop + 1])
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
+        path = self.view.shortest_path(serving_node, receiver)
+        self.controller.forward_content_path(serving_node, receiver)
         # get the cache with maximum betweenness centrality
         # if there are more than one cache with max betw then pick the one
         # closer to the receiver
@@ -332,26 +435,43 @@ class CacheLessForMore(Strategy):
                 if self.betw[v] >= max_betw:
                     max_betw = self.betw[v]
                     designated_cache = v
-        # Forward content
-        for u, v in path_links(path):
-            self.controller.forward_content_hop(u, v)
-            if v == designated_cache:
-                self.controller.put_content(v)
+        if designated_cache is not None:
+            self.controller.put_content(designated_cache)
         self.controller.end_session()
 
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        get_content = self.controller.get_content_warmup
+        path = self.view.shortest_path(receiver, self.view.content_source(content))
+        for v in path[1:]:
+            if get_content(v, content):
+                break
+        max_betw = -1
+        designated_cache = None
+        for v in self.view.shortest_path(v, receiver)[1:]:
+            if self.view.has_cache(v):
+                if self.betw[v] >= max_betw:
+                    max_betw = self.betw[v]
+                    designated_cache = v
+        if designated_cache is not None:
+            self.controller.put_content_warmup(designated_cache, content)
+
 
 @register_strategy("RAND_BERNOULLI")
 class RandomBernoulli(Strategy):
     """Bernoulli random cache insertion.
 
     In this strategy, a content is randomly inserted in a cache on the path
-    from serving node to receiver with probability *p*.
+    from serving node to receiver with probability *p*. Insertions are drawn
+    from a random generator seeded by *seed*, see `random_generator`, hence
+    they are not reproducible if it is not specified.
     """
 
     @inheritdoc(Strategy)
-    def __init__(self, view, controller, p=0.2, **kwargs):
+    def __init__(self, view, controller, p=0.2, seed=None, **kwargs):
         super().__init__(view, controller)
         self.p = p
+        self.random = RandomStream(seed)
 
     @inheritdoc(Strategy)
     def process_event(self, time, receiver, content, log):
@@ -360,8 +480,8 @@ class RandomBernoulli(Strategy):
         path = self.view.shortest_path(receiver, source)
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
-        for u, v in path_links(path):
-            self.controller.forward_request_hop(u, v)
+        for hop in range(1, len(path)):
+            v = path[hop]
             if self.view.has_cache(v):
                 if self.controller.get_content(v):
                     serving_node = v
@@ -370,27 +490,43 @@ class RandomBernoulli(Strategy):
             # No cache hits, get content from source
             self.controller.get_content(v)
             serving_node = v
+        self.controller.forward_request_path(receiver, serving_node, path[: hop + 1])
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
-        for u, v in path_links(path):
-            self.controller.forward_content_hop(u, v)
+        path = self.view.shortest_path(serving_node, receiver)
+        self.controller.forward_content_path(serving_node, receiver)
+        for v in path[1:]:
             if v != receiver and self.view.has_cache(v):
-                if random.random() < self.p:
+                if self.random.random() < self.p:
                     self.controller.put_content(v)
         self.controller.end_session()
 
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        get_content = self.controller.get_content_warmup
+        path = self.view.shortest_path(receiver, self.view.content_source(content))
+        for v in path[1:]:
+            if get_content(v, content):
+                break
+        for v in self.view.shortest_path(v, receiver)[1:]:
+            if v != receiver and self.view.has_cache(v):
+                if self.random.random() < self.p:
+                    self.controller.put_content_warmup(v, content)
+
 
 @register_strategy("RAND_CHOICE")
 class RandomChoice(Strategy):
     """Random choice strategy
 
     This strategy stores the served content exactly in one single cache on the
-    path from serving node to receiver selected randomly.
+    path from serving node to receiver selected randomly. Caches are selected
+    by a random generator seeded by *seed*, see `random_generator`, hence
+    selections are not reproducible if it is not specified.
     """
 
     @inheritdoc(Strategy)
-    def __init__(self, view, controller, **kwargs):
+    def __init__(self, view, controller, seed=None, **kwargs):
         super().__init__(view, controller)
+        self.random = RandomStream(seed)
 
     @inheritdoc(Strategy)
     def process_event(self, time, receiver, content, log):
@@ -399,8 +535,8 @@ class RandomChoice(Strategy):
         path = self.view.shortest_path(receiver, source)
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
-        for u, v in path_links(path):
-            self.controller.forward_request_hop(u, v)
+        for hop in range(1, len(path)):
+            v = path[hop]
             if self.view.has_cache(v):
                 if self.controller.get_content(v):
                     serving_node = v
@@ -409,12 +545,23 @@ class RandomChoice(Strategy):
             # No cache hits, get content from source
             self.controller.get_content(v)
             serving_node = v
+        self.controller.forward_request_path(receiver, serving_node, path[: hop + 1])
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
+        path = self.view.shortest_path(serving_node, receiver)
+        self.controller.forward_content_path(serving_node, receiver)
         caches = [v for v in path[1:-1] if self.view.has_cache(v)]
-        designated_cache = random.choice(caches) if len(caches) > 0 else None
-        for u, v in path_links(path):
-            self.controller.forward_content_hop(u, v)
-            if v == designated_cache:
-                self.controller.put_content(v)
+        if len(caches) > 0:
+            self.controller.put_content(self.random.choice(caches))
         self.controller.end_session()
+
+    @inheritdoc(Strategy)
+    def warmup_event(self, time, receiver, content):
+        get_content = self.controller.get_content_warmup
+        path = self.view.shortest_path(receiver, self.view.content_source(content))
+        for v in path[1:]:
+            if get_content(v, content):
+                break
+        path = self.view.shortest_path(v, receiver)
+        caches = [v for v in path[1:-1] if self.view.has_cache(v)]
+        if len(caches) > 0:
+            self.controller.put_content_warmup(self.random.choice(caches), content)
@@ -1,5 +1,9 @@
+import inspect
+import random
+
 import networkx as nx
 import fnss
+import pytest
 
 from icarus.scenarios import IcnTopology
 import icarus.models as strategy
@@ -9,6 +13,7 @@ from icarus.execution import (
     NetworkController,
     DummyCollector,
 )
+from icarus.registry import CACHE_POLICY, STRATEGY
 
 
 class TestOnPath:
@@ -76,6 +81,31 @@ class TestOnPath:
         assert exp_req_hops == set(req_hops)
         assert exp_cont_hops == set(cont_hops)
 
+    def test_lce_process_batch(self):
+        events = [(0, 1), (5, 2), (0, 3), (5, 1), (0, 2), (5, 2), (0, 1)]
+        topology = self.on_path_topology()
+        model = NetworkModel(topology, cache_policy={"name": "LRU"})
+        view = NetworkView(model)
+        controller = NetworkController(model)
+        controller.attach_collector(DummyCollector(view))
+        hr = strategy.LeaveCopyEverywhere(view, controller)
+        for t, (r, c) in enumerate(events):
+            hr.process_event(t, r, c, True)
+        topology = self.on_path_topology()
+        model = NetworkModel(topology, cache_policy={"name": "LRU"})
+        batch_view = NetworkView(model)
+        controller = NetworkController(model)
+        controller.attach_collector(DummyCollector(batch_view))
+        hr = strategy.LeaveCopyEverywhere(batch_view, controller)
+        hr.process_batch(
+            list(range(len(events))),
+            [r for r, _ in events],
+            [c for _, c in events],
+            len(events) * [True],
+        )
+        for v in (1, 2, 3):
+            assert view.cache_dump(v) == batch_view.cache_dump(v)
+
     def test_lce_different_content(self):
         hr = strategy.LeaveCopyEverywhere(self.view, self.controller)
         # receiver 0 requests 2, expect miss
@@ -467,3 +497,87 @@ class TestPartition:
         assert set(exp_req_hops) == set(summary["request_hops"])
         assert set(exp_cont_hops) == set(summary["content_hops"])
         assert "c2" == summary["serving_node"]
+
+
+class TestWarmupEvent:
+    @classmethod
+    def tree_topology(cls):
+        """Return a binary tree topology with the source at the root, caches
+        at intermediate nodes and receivers at the leaves"""
+        topology = IcnTopology(fnss.k_ary_tree_topology(2, 4))
+        for v in topology.nodes():
+            depth = topology.nodes[v]["depth"]
+            if depth == 0:
+                fnss.add_stack(topology, v, "source", {"contents": range(1, 21)})
+            elif depth == 4:
+                fnss.add_stack(topology, v, "receiver", {})
+            else:
+                fnss.add_stack(topology, v, "router", {"cache_size": 2 + depth})
+        fnss.set_delays_constant(topology, 1, "ms")
+        return topology
+
+    @pytest.mark.parametrize("cache_policy", ["LRU", "PERFECT_LFU", "RAND"])
+    @pytest.mark.parametrize(
+        "strategy_name",
+        [
+            "NO_CACHE",
+            "EDGE",
+            "LCE",
+            "LCD",
+            "PROB_CACHE",
+            "CL4M",
+            "RAND_BERNOULLI",
+            "RAND_CHOICE",
+        ],
+    )
+    def test_same_cache_state(self, strategy_name, cache_policy):
+        rand = random.Random(0)
+        receivers = [v for v in range(31) if v >= 15]
+        events = [(rand.choice(receivers), rand.randint(1, 20)) for _ in range(500)]
+        dumps = []
+        for warmup in (False, True):
+            random.seed(1)
+            policy = {"name": cache_policy}
+            if "seed" in inspect.signature(CACHE_POLICY[cache_policy]).parameters:
+                policy["seed"] = 1
+            model = NetworkModel(self.tree_topology(), policy)
+            view = NetworkView(model)
+            controller = NetworkController(model)
+            controller.attach_collector(DummyCollector(view))
+            kwargs = {}
+            if "seed" in inspect.signature(STRATEGY[strategy_name]).parameters:
+                kwargs["seed"] = 1
+            strategy_inst = STRATEGY[strategy_name](view, controller, **kwargs)
+            for t, (r, c) in enumerate(events):
+                if warmup:
+                    strategy_inst.warmup_event(t, r, c)
+                else:
+                    strategy_inst.process_event(t, r, c, False)
+            dumps.append({v: view.cache_dump(v) for v in view.cache_nodes()})
+            dumps[-1]["random"] = random.random()
+        assert dumps[0] == dumps[1]
+
+    def test_process_batch_warmup(self):
+        events = [(0, 1), (5, 2), (0, 3), (5, 1), (0, 2), (5, 2), (0, 1)]
+        log = [False, False, False, True, False, True, True]
+        dumps = []
+        for batch in (False, True):
+            model = NetworkModel(TestOnPath.on_path_topology(), {"name": "LRU"})
+            view = NetworkView(model)
+            controller = NetworkController(model)
+            collector = DummyCollector(view)
+            controller.attach_collector(collector)
+            hr = strategy.LeaveCopyEverywhere(view, controller)
+            if batch:
+                hr.process_batch(
+                    list(range(len(events))),
+                    [r for r, _ in events],
+                    [c for _, c in events],
+                    log,
+                )
+            else:
+                for t, (r, c) in enumerate(events):
+                    hr.process_event(t, r, c, log[t])
+            dumps.append({v: view.cache_dump(v) for v in (1, 2, 3)})
+            dumps[-1]["sessions"] = collector.session_summary()
+        assert dumps[0] == dumps[1]
@@ -5,14 +5,44 @@ user-provided settings.
 """
 import time
 import collections
+import contextlib
 import multiprocessing as mp
 import logging
 import copy
+import functools
 import sys
 import signal
 import traceback
+import queue
+import hashlib
+import heapq
+import inspect
+import json
+import math
+import os
+import pickle
+import random
+import secrets
+import socket
 
-from icarus.execution import exec_experiment
+import networkx as nx
+import numpy as np
+
+import icarus
+
+from icarus.distributed import (
+    Coordinator,
+    CoordinatorClient,
+    parse_address,
+    serve_coordinator,
+)
+from icarus.execution import (
+    Instrumentation,
+    SamplingProfiler,
+    SteadyStateDetector,
+    exec_experiment,
+)
+from icarus.execution.network import PathStore
 from icarus.registry import (
     TOPOLOGY_FACTORY,
     CACHE_PLACEMENT,
@@ -22,16 +52,39 @@ from icarus.registry import (
     DATA_COLLECTOR,
     STRATEGY,
 )
-from icarus.results import ResultSet
-from icarus.util import SequenceNumber, timestr
+from icarus.results import ResultSet, ResultsJournal
+from icarus.tools import means_confidence_interval
+from icarus.util import SequenceNumber, Settings, Tree, timestr
 
 
-__all__ = ["Orchestrator", "run_scenario"]
+__all__ = [
+    "Orchestrator",
+    "CostModel",
+    "ScenarioCache",
+    "run_scenario",
+    "run_worker",
+]
 
 
 logger = logging.getLogger("orchestration")
 
 
+# Components of experiments seeded from the SEED setting, in the order used to
+# derive their seeds, which must not change for results to be reproducible
+SEEDED_COMPONENTS = (
+    ("topology", TOPOLOGY_FACTORY),
+    ("workload", WORKLOAD),
+    ("cache_placement", CACHE_PLACEMENT),
+    ("content_placement", CONTENT_PLACEMENT),
+    ("strategy", STRATEGY),
+    ("cache_policy", CACHE_POLICY),
+)
+
+# Components of experiments seeded differently in each segment of a
+# replication, i.e. those generating requests and making caching decisions
+SEGMENT_SEEDED_COMPONENTS = ("workload", "strategy", "cache_policy")
+
+
 class Orchestrator:
     """Orchestrator.
 
@@ -39,7 +92,7 @@ class Orchestrator:
     aggregate results.
     """
 
-    def __init__(self, settings, summary_freq=4):
+    def __init__(self, settings, summary_freq=4, journal=None):
         """Constructor
 
         Parameters
@@ -49,100 +102,219 @@ class Orchestrator:
         summary_freq : int
             Frequency (in number of experiment) at which summary messages
             are displayed
+        journal : ResultsJournal, optional
+            Journal to which the results of each experiment are appended as
+            soon as it completes. The results it already contains, if it was
+            resumed, are added to the results of the orchestrator and the
+            experiments which produced them are not executed again
         """
         self.settings = settings
         self.results = ResultSet()
+        self.journal = journal
+        if journal is not None:
+            for params, results in journal.results:
+                self.results.add(params, results)
         self.seq = SequenceNumber()
-        self.exp_durations = collections.deque(maxlen=30)
+        self.cost_model = CostModel()
+        # Estimated run time of the experiments scheduled and not completed
+        # and estimated and actual run times of those completed, whose ratio
+        # corrects the estimates used to compute the ETA
+        self._remaining_runtime = 0.0
+        self._estimated_runtime = 0.0
+        self._actual_runtime = 0.0
         self.n_success = 0
         self.n_fail = 0
         self.summary_freq = summary_freq
         self._stop = False
-        if self.settings.PARALLEL_EXECUTION:
-            self.pool = mp.Pool(settings.N_PROCESSES)
+        # State of the replications of each experiment and replications
+        # scheduled by callbacks, if the number of replications is adaptive
+        self.adaptive = (
+            "ADAPTIVE_REPLICATIONS" in settings and settings.ADAPTIVE_REPLICATIONS
+        )
+        self._replications = {}
+        self._new_replications = collections.deque()
+        # Number of segments of each replication and state of the segments
+        # received of the replications not completed
+        self.n_segments = settings.N_SEGMENTS if "N_SEGMENTS" in settings else 1
+        self._segments = {}
+        # Queue to which the callbacks of parallel jobs notify completions
+        self._completed = queue.SimpleQueue()
+        self.serve = "SERVE" in settings and settings.SERVE
+        self.n_proc = settings.N_PROCESSES if settings.PARALLEL_EXECUTION else 1
+        if self.settings.PARALLEL_EXECUTION and not self.serve:
+            # Run fewer processes than requested if the experiments they
+            # would execute concurrently are not estimated to fit in memory
+            self.n_proc = self.cost_model.max_processes(
+                settings.EXPERIMENT_QUEUE,
+                settings.N_PROCESSES,
+                settings.MAX_MEMORY if "MAX_MEMORY" in settings else None,
+            )
+            if self.n_proc < settings.N_PROCESSES:
+                logger.warning(
+                    "Running %d processes instead of %d, as the experiments are "
+                    "not estimated to fit in memory otherwise"
+                    % (self.n_proc, settings.N_PROCESSES)
+                )
+            # Settings and topologies, also built to estimate the cost of
+            # experiments, are sent once to each worker rather than with
+            # each experiment
+            topologies = {}
+            for experiment in settings.EXPERIMENT_QUEUE:
+                spec = experiment["topology"]
+                if ScenarioCache.cacheable(spec, TOPOLOGY_FACTORY):
+                    topology = _build_topology(spec)
+                    if topology is not None:
+                        topologies[ScenarioCache.key(spec)] = topology
+            self.pool = mp.Pool(
+                self.n_proc,
+                initializer=_init_worker,
+                initargs=(settings, topologies),
+            )
 
     def stop(self):
         """Stop the execution of the orchestrator"""
         logger.info("Orchestrator is stopping")
         self._stop = True
-        if self.settings.PARALLEL_EXECUTION:
+        if self.settings.PARALLEL_EXECUTION and not self.serve:
             self.pool.terminate()
             self.pool.join()
+            # Wake up the scheduling loop, if waiting for a job to complete
+            self._completed.put(None)
 
     def run(self):
         """Run the orchestrator.
 
         This call is blocking, whether multiple processes are used or not. This
         methods returns only after all experiments are executed.
+
+        If multiple processes are used, experiments are submitted in
+        decreasing order of estimated cost, i.e. number of nodes of the
+        topology times number of events of the workload, and a new experiment
+        is submitted as soon as one completes. If the *MAX_INFLIGHT* setting
+        is specified, no more than *MAX_INFLIGHT* experiments are submitted
+        and not completed at any time.
+
+        If the *SERVE* setting is *True*, experiments are not executed by
+        this process but handed out, in the same order, to the workers
+        connecting to the address of the *SERVE_ADDRESS* setting, by default
+        *127.0.0.1:50000*, see `run_worker`. Workers are authenticated by the
+        *SERVE_AUTHKEY* setting or, if it is not specified, by a random key
+        logged when the orchestrator starts serving.
+
+        If the *ADAPTIVE_REPLICATIONS* setting is *True*, *N_REPLICATIONS* is
+        the minimum number of replications of each experiment. Further
+        replications are executed until the confidence intervals of the
+        means of the *REPLICATIONS_METRICS* across replications are narrow
+        enough, see `Orchestrator.n_more_replications`.
+
+        If the *N_SEGMENTS* setting is greater than 1, the measured requests
+        of each replication are split into *N_SEGMENTS* independent segments,
+        each with its own warmup, executed as separate jobs. The states of
+        the collectors of the segments are merged into the results of the
+        replication, see `DataCollector.merge`.
         """
-        # Create queue of experiment configurations
-        queue = collections.deque(self.settings.EXPERIMENT_QUEUE)
+        # Create queue of experiment configurations, each with the indices of
+        # the replications to execute. Replications whose results are already
+        # available, i.e. loaded from a resumed journal, are skipped
+        n_replications = self.settings.N_REPLICATIONS
+        done = collections.defaultdict(list)
+        for params, results in self.results:
+            done[ResultsJournal.key(params)].append(_replication_index(results))
+        queue = collections.deque()
+        for experiment in self.settings.EXPERIMENT_QUEUE:
+            key = ResultsJournal.key(experiment)
+            n_skipped = len(done[key])
+            if not self.adaptive:
+                n_skipped = min(n_skipped, n_replications)
+            skipped = done[key][:n_skipped]
+            del done[key][:n_skipped]
+            replications = self._replications.setdefault(
+                key, _Replications(experiment)
+            )
+            replications.indices.update(i for i in skipped if i is not None)
+            if self.adaptive:
+                replications.n_scheduled += max(n_skipped, n_replications)
+            if n_skipped < n_replications:
+                queue.append(
+                    (experiment, replications.assign(n_replications - n_skipped))
+                )
+        if len(self.results) > 0:
+            logger.info(
+                "Resuming simulations: %d experiments already completed"
+                % len(self.results)
+            )
+            if self.adaptive:
+                for params, results in self.results:
+                    self._replicate(params, results)
         # Calculate number of experiments and number of processes
-        self.n_exp = len(queue) * self.settings.N_REPLICATIONS
-        self.n_proc = (
-            self.settings.N_PROCESSES if self.settings.PARALLEL_EXECUTION else 1
+        self.n_exp = sum(len(indices) for _, indices in queue)
+        self._remaining_runtime = sum(
+            self.cost_model.runtime(experiment) * len(indices)
+            for experiment, indices in queue
         )
+        queue.extend(self._pop_new_replications())
         logger.info(
             "Starting simulations: %d experiments, %d process(es)"
             % (self.n_exp, self.n_proc)
         )
 
-        if self.settings.PARALLEL_EXECUTION:
-            # Starting from Python 3.2, multiprocessing.Pool.apply_async
-            # accepts a new error_callback argument that is a callable for
-            # returning a message when uncaught errors are thrown.
-            # The following lines ensure compatibility with Python < 3.2
-            callbacks = {"callback": self.experiment_callback}
-            if sys.version_info > (3, 2):
-                callbacks["error_callback"] = self.error_callback
-            # This job queue is used only to keep track of which jobs have
-            # finished and which are still running. Currently this information
-            # is used only to handle keyboard interrupts correctly
-            job_queue = collections.deque()
-            # Schedule experiments from the queue
-            while queue:
-                experiment = queue.popleft()
-                for _ in range(self.settings.N_REPLICATIONS):
-                    job_queue.append(
+        if self.serve:
+            self._serve(queue)
+
+        elif self.settings.PARALLEL_EXECUTION:
+            max_inflight = (
+                self.settings.MAX_INFLIGHT if "MAX_INFLIGHT" in self.settings else None
+            )
+            # Schedule the most expensive experiments first, so that the
+            # longest ones do not start last and delay the end of the campaign
+            queue = sorted(queue, key=lambda x: _experiment_cost(x[0]), reverse=True)
+            jobs = collections.deque(self._jobs(queue))
+            # Callbacks are run by a thread of the pool as soon as a job
+            # completes. They notify the completion to this thread, which
+            # submits the next jobs
+            completed = self._completed
+            n_inflight = 0
+            try:
+                while (jobs or n_inflight) and not self._stop:
+                    while jobs and (max_inflight is None or n_inflight < max_inflight):
+                        experiment, curr_exp, replication, segment = jobs.popleft()
+                        job = (experiment, replication, segment)
                         self.pool.apply_async(
-                            run_scenario,
+                            _run_job,
                             args=(
-                                self.settings,
                                 experiment,
-                                self.seq.assign(),
+                                curr_exp,
                                 self.n_exp,
+                                replication,
+                                segment,
+                            ),
+                            callback=functools.partial(self._job_callback, job),
+                            error_callback=functools.partial(
+                                self._job_error_callback, job
                             ),
-                            **callbacks
                         )
-                    )
-            self.pool.close()
-            # This solution is probably not optimal, but at least makes
-            # KeyboardInterrupt work fine, which is crucial if launching the
-            # simulation remotely via screen.
-            # What happens here is that we keep waiting for possible
-            # KeyboardInterrupts till the last process terminates successfully.
-            # We may have to wait up to 5 seconds after the last process
-            # terminates before exiting, which is really negligible
-            try:
-                while job_queue:
-                    job = job_queue.popleft()
-                    while not job.ready():
-                        time.sleep(5)
+                        n_inflight += 1
+                    completed.get()
+                    n_inflight -= 1
+                    jobs.extend(self._jobs(self._pop_new_replications()))
+                if not self._stop:
+                    self.pool.close()
             except KeyboardInterrupt:
                 self.pool.terminate()
             self.pool.join()
 
         else:  # Single-process execution
             while queue:
-                experiment = queue.popleft()
-                for _ in range(self.settings.N_REPLICATIONS):
+                for experiment, curr_exp, i, segment in self._jobs([queue.popleft()]):
                     self.experiment_callback(
                         run_scenario(
-                            self.settings, experiment, self.seq.assign(), self.n_exp
-                        )
+                            self.settings, experiment, curr_exp, self.n_exp, i, segment
+                        ),
+                        (experiment, i, segment),
                     )
                     if self._stop:
                         self.stop()
+                queue.extend(self._pop_new_replications())
 
         logger.info(
             "END | Planned: %d, Completed: %d, Succeeded: %d, Failed: %d",
@@ -152,43 +324,353 @@ class Orchestrator:
             self.n_fail,
         )
 
-    def error_callback(self, msg):
+    def _serve(self, experiments):
+        """Hand out experiments to remote workers and wait for their results
+
+        Parameters
+        ----------
+        experiments : iterable
+            The (experiment, replication_indices) tuples to execute
+        """
+        settings = self.settings
+        experiments = sorted(
+            experiments, key=lambda x: _experiment_cost(x[0]), reverse=True
+        )
+        # Settings, which include the queue of all experiments, are fetched
+        # once by each worker rather than sent with each job
+        coordinator = Coordinator(
+            [
+                (experiment, curr_exp, self.n_exp, i, segment)
+                for experiment, curr_exp, i, segment in self._jobs(experiments)
+            ],
+            settings.SERVE_HEARTBEAT_TIMEOUT
+            if "SERVE_HEARTBEAT_TIMEOUT" in settings
+            else 60.0,
+            settings,
+        )
+        address = serve_coordinator(
+            coordinator,
+            parse_address(
+                settings.SERVE_ADDRESS
+                if "SERVE_ADDRESS" in settings
+                else "127.0.0.1:50000"
+            ),
+            _authkey(settings),
+        )
+        logger.info("Serving experiments to workers on %s:%d" % address)
+        n_received = 0
+        try:
+            while n_received < coordinator.n_jobs and not self._stop:
+                for worker in coordinator.reassign_expired():
+                    logger.warning(
+                        "Lost worker %s, reassigning its experiments" % worker
+                    )
+                try:
+                    job, result = coordinator.results.get(timeout=1)
+                except queue.Empty:
+                    continue
+                n_received += 1
+                experiment, _, _, replication, segment = job
+                self.experiment_callback(result, (experiment, replication, segment))
+                coordinator.add_jobs(
+                    [
+                        (experiment, curr_exp, self.n_exp, i, segment)
+                        for experiment, curr_exp, i, segment in self._jobs(
+                            self._pop_new_replications()
+                        )
+                    ]
+                )
+        finally:
+            # Let workers know that there are no more experiments
+            coordinator.close()
+
+    def n_more_replications(self, values, n_scheduled):
+        """Return the number of replications of an experiment to execute in
+        addition to those already executed
+
+        The relative width of the confidence interval of the mean of a metric
+        is the width of the interval divided by the absolute value of the
+        mean. If it exceeds *REPLICATIONS_CI_WIDTH* for any metric, further
+        replications are needed. Their number is estimated assuming that the
+        width decreases with the square root of the number of replications.
+        One more replication is needed if a metric has fewer than two values.
+
+        Parameters
+        ----------
+        values : dict
+            The values of each metric in the results of the replications
+            executed, keyed by (collector, metric) tuple
+        n_scheduled : int
+            The number of replications scheduled so far
+
+        Returns
+        -------
+        n : int
+            The number of additional replications, not exceeding
+            *MAX_REPLICATIONS* in total
+        """
+        settings = self.settings
+        max_replications = (
+            settings.MAX_REPLICATIONS if "MAX_REPLICATIONS" in settings else 20
+        )
+        target_width = (
+            settings.REPLICATIONS_CI_WIDTH
+            if "REPLICATIONS_CI_WIDTH" in settings
+            else 0.05
+        )
+        confidence = (
+            settings.REPLICATIONS_CONFIDENCE
+            if "REPLICATIONS_CONFIDENCE" in settings
+            else 0.95
+        )
+        if n_scheduled >= max_replications:
+            return 0
+        if any(len(samples) < 2 for samples in values.values()):
+            # Intervals cannot be computed yet, e.g. because replications failed
+            return 1
+        # Ratio between the widest relative interval and the target width
+        ratio = 0.0
+        for samples in values.values():
+            mean, err = means_confidence_interval(samples, confidence)
+            if err == 0:
+                continue
+            if mean == 0:
+                ratio = math.inf
+                break
+            ratio = max(ratio, 2 * err / abs(mean) / target_width)
+        if ratio <= 1:
+            return 0
+        n = len(next(iter(values.values())))
+        n_needed = math.ceil(n * ratio ** 2) if ratio < math.inf else max_replications
+        return min(max(n_needed - n_scheduled, 1), max_replications - n_scheduled)
+
+    def _replicate(self, params, results):
+        """Record the results of a replication of an experiment, or its
+        failure if *results* is *None*, and schedule further replications if
+        needed, once all replications scheduled so far have completed"""
+        replications = self._replications.get(ResultsJournal.key(params))
+        if replications is None:
+            return
+        metrics = (
+            self.settings.REPLICATIONS_METRICS
+            if "REPLICATIONS_METRICS" in self.settings
+            else [("CACHE_HIT_RATIO", "MEAN"), ("LATENCY", "MEAN")]
+        )
+        if results is None:
+            replications.n_failed += 1
+        else:
+            for collector, metric in metrics:
+                if collector in results and metric in results[collector]:
+                    replications.values[(collector, metric)].append(
+                        results[collector][metric]
+                    )
+        replications.n_completed += 1
+        if replications.n_completed < replications.n_scheduled:
+            return
+        values = replications.values
+        n = self.n_more_replications(values, replications.n_scheduled)
+        if n > 0:
+            replications.n_scheduled += n
+            self._new_replications.append(
+                (replications.experiment, replications.assign(n))
+            )
+        # Replications stop without reaching the target if no values were
+        # collected, e.g. because all replications failed, or if
+        # *MAX_REPLICATIONS* is reached, in which case more replications would
+        # be needed if none had been scheduled
+        elif not values or self.n_more_replications(values, 0) > 0:
+            logger.warning(
+                "Stopping replications of an experiment after %d replication(s), "
+                "%d failed, without reaching the target confidence interval width"
+                % (replications.n_completed, replications.n_failed)
+            )
+
+    def _pop_new_replications(self):
+        """Return the (experiment, replication_indices) tuples of the
+        replications scheduled since the last call and add them to the number
+        of experiments"""
+        new_replications = []
+        while self._new_replications:
+            experiment, indices = self._new_replications.popleft()
+            logger.info(
+                "Scheduling %d more replication(s) of an experiment" % len(indices)
+            )
+            self.n_exp += len(indices)
+            runtime = self.cost_model.runtime(experiment)
+            self._remaining_runtime += runtime * len(indices)
+            new_replications.append((experiment, indices))
+        return new_replications
+
+    def _jobs(self, experiments):
+        """Return the jobs executing replications of experiments
+
+        Parameters
+        ----------
+        experiments : iterable
+            The (experiment, replication_indices) tuples to execute
+
+        Returns
+        -------
+        jobs : list
+            The (experiment, curr_exp, replication, segment) tuples of the
+            jobs, where *segment* is *None* if replications are not split
+            into segments. All segments of a replication have the same
+            sequence number
+        """
+        jobs = []
+        for experiment, indices in experiments:
+            if (
+                self.n_segments > 1
+                and _workload_length(experiment["workload"])[1] >= self.n_segments
+            ):
+                segments = range(self.n_segments)
+            else:
+                segments = [None]
+            for i in indices:
+                curr_exp = self.seq.assign()
+                jobs.extend((experiment, curr_exp, i, s) for s in segments)
+        return jobs
+
+    def _merge_segment(self, params, results, duration):
+        """Merge the results of a segment of a replication with those of the
+        segments of the same replication received so far
+
+        Returns
+        -------
+        args : tuple
+            The (params, results, duration) tuple of the replication, if all
+            its segments have been received, *None* otherwise. Results other
+            than those of collectors are those of the first segment and the
+            duration is the sum of the durations of all segments
+        """
+        segment = results.pop("SEGMENT")
+        state = results.pop("COLLECTOR_STATE")
+        key = (ResultsJournal.key(params), segment["REPLICATION"])
+        merged = self._segments.setdefault(key, _Segments())
+        merged.n_received += 1
+        merged.duration += duration
+        if merged.state is None:
+            merged.state = state
+        else:
+            merged.state.merge(state)
+        if segment["INDEX"] == 0:
+            merged.results = results
+        if merged.n_received < segment["N_SEGMENTS"]:
+            return None
+        del self._segments[key]
+        if merged.failed:
+            self._replication_failed(params)
+            return None
+        results = merged.results
+        results.update(merged.state.results())
+        return params, results, merged.duration
+
+    def _job_callback(self, job, args):
+        """Callback of a parallel job completed"""
+        try:
+            self.experiment_callback(args, job)
+        finally:
+            self._completed.put(None)
+
+    def _job_error_callback(self, job, msg):
+        """Callback of a parallel job that raised an uncaught error"""
+        try:
+            self.error_callback(msg, job)
+        finally:
+            self._completed.put(None)
+
+    def _job_failed(self, job):
+        """Record the failure of a job
+
+        A replication split into segments fails once all its segments are
+        received, if any of them failed.
+
+        Parameters
+        ----------
+        job : tuple
+            The (experiment, replication, segment) tuple of the job or *None*
+            if unknown
+        """
+        if job is None:
+            self.n_fail += 1
+            return
+        experiment, replication, segment = job
+        if segment is not None:
+            key = (ResultsJournal.key(experiment), replication)
+            merged = self._segments.setdefault(key, _Segments())
+            merged.n_received += 1
+            merged.failed = True
+            if merged.n_received < self.n_segments:
+                return
+            del self._segments[key]
+        self._replication_failed(experiment)
+
+    def _replication_failed(self, params):
+        """Record the failure of a replication of an experiment"""
+        self.n_fail += 1
+        if self.adaptive:
+            self._replicate(params, None)
+
+    def error_callback(self, msg, job=None):
         """Callback method called in case of error in Python > 3.2
 
         Parameters
         ----------
         msg : string
             Error message
+        job : tuple, optional
+            The (experiment, replication, segment) tuple of the job which
+            raised the error
         """
         logger.error("FAILURE | Experiment failed: {}".format(msg))
-        self.n_fail += 1
+        self._job_failed(job)
 
-    def experiment_callback(self, args):
+    def experiment_callback(self, args, job=None):
         """Callback method called by run_scenario
 
         Parameters
         ----------
         args : tuple
             Tuple of arguments
+        job : tuple, optional
+            The (experiment, replication, segment) tuple of the job which
+            returned *args*, used to account for its failure
         """
         # If args is None, that means that an exception was raised during the
-        # execution of the experiment. In such case, ignore it
+        # execution of the experiment. In such case, record the failure
         if not args:
-            self.n_fail += 1
+            self._job_failed(job)
             return
+        if "SEGMENT" in args[1]:
+            args = self._merge_segment(*args)
+            if args is None:
+                return
         # Extract parameters
         params, results, duration = args
         self.n_success += 1
         # Store results
         self.results.add(params, results)
-        self.exp_durations.append(duration)
+        if self.journal is not None:
+            self.journal.append(params, results)
+        if self.adaptive:
+            self._replicate(params, results)
+        estimated_runtime = self.cost_model.runtime(params)
+        self._remaining_runtime -= estimated_runtime
+        self._estimated_runtime += estimated_runtime
+        self._actual_runtime += duration
         if self.n_success % self.summary_freq == 0:
             # Number of experiments scheduled to be executed
             n_scheduled = self.n_exp - (self.n_fail + self.n_success)
-            # Compute ETA
+            # Compute ETA from the estimated run time of the experiments
+            # scheduled, corrected by the error of the estimates so far
             n_cores = min(mp.cpu_count(), self.n_proc)
-            mean_duration = sum(self.exp_durations) / len(self.exp_durations)
-            eta = timestr(n_scheduled * mean_duration / n_cores, False)
+            correction = (
+                self._actual_runtime / self._estimated_runtime
+                if self._estimated_runtime > 0
+                else 1.0
+            )
+            remaining_runtime = max(self._remaining_runtime, 0.0) * correction
+            eta = timestr(remaining_runtime / n_cores, False)
             # Print summary
             logger.info(
                 "SUMMARY | Completed: %d, Failed: %d, Scheduled: %d, ETA: %s",
@@ -199,7 +681,574 @@ class Orchestrator:
             )
 
 
-def run_scenario(settings, params, curr_exp, n_exp):
+class _Segments:
+    """State of the segments of a replication received"""
+
+    def __init__(self):
+        """Constructor"""
+        self.n_received = 0
+        self.duration = 0.0
+        # Whether any segment failed, in which case the replication fails
+        self.failed = False
+        # Collector proxy into which the states of segments are merged and
+        # results of the first segment
+        self.state = None
+        self.results = None
+
+
+class _Replications:
+    """State of the replications of an experiment"""
+
+    __slots__ = [
+        "experiment",
+        "n_scheduled",
+        "n_completed",
+        "n_failed",
+        "values",
+        "indices",
+    ]
+
+    def __init__(self, experiment):
+        self.experiment = experiment
+        self.n_scheduled = 0
+        # Number of replications completed, including those failed
+        self.n_completed = 0
+        self.n_failed = 0
+        # Values of each metric, keyed by (collector, metric) tuple
+        self.values = collections.defaultdict(list)
+        # Indices of the replications executed or scheduled
+        self.indices = set()
+
+    def assign(self, n):
+        """Return the lowest *n* replication indices not assigned yet"""
+        indices = []
+        i = 0
+        while len(indices) < n:
+            if i not in self.indices:
+                self.indices.add(i)
+                indices.append(i)
+            i += 1
+        return indices
+
+
+class ScenarioCache:
+    """Cache of the scenarios built by `run_scenario`.
+
+    A scenario is a topology on which caches and contents have been placed.
+    Scenarios are keyed by a hash of the canonicalised specifications of
+    topology, workload, cache placement and content placement, hence
+    experiments differing only in other parameters, e.g. strategy or cache
+    policy, reuse the same scenario. The shortest paths of the topology are
+    cached as well and keyed by the topology specification only.
+
+    Cached entries are kept in memory, up to *maxsize* scenarios and
+    *maxsize* path stores, evicting the least recently used ones. If a
+    directory is specified, entries are also written to and read from it,
+    so that they can be shared by different processes and runs. Entries
+    written to disk are not invalidated if the code building them changes,
+    apart from a change of the Icarus version.
+
+    Scenarios must be cached only if they are built deterministically, see
+    `ScenarioCache.cacheable`. The state of the random generators after
+    building a scenario is stored with it and restored when it is reused, so
+    that experiments using a cached scenario produce the same results they
+    would produce otherwise.
+    """
+
+    def __init__(self, maxsize=4, directory=None):
+        """Constructor
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            The maximum number of scenarios and of path stores kept in memory
+        directory : str, optional
+            The directory where entries are stored on disk. If not specified,
+            entries are only kept in memory
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.directory = directory
+        self._scenarios = collections.OrderedDict()
+        self._paths = collections.OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*specs):
+        """Return the key of the entry built from a set of specifications
+
+        Parameters
+        ----------
+        *specs : dicts
+            The specifications, e.g. of topology and content placement
+
+        Returns
+        -------
+        key : str
+            Hash of the canonical representation of the specifications
+        """
+        canonical = json.dumps(
+            [icarus.__version__, *specs], sort_keys=True, default=repr
+        )
+        return hashlib.sha1(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def cacheable(spec, registry):
+        """Return whether the object built from a specification is always the
+        same, i.e. it is built by a registered function or class not taking a
+        *seed* argument or the specification sets the seed.
+
+        Parameters
+        ----------
+        spec : dict
+            The specification, including the registered *name*
+        registry : dict
+            The registry where the name is looked up
+
+        Returns
+        -------
+        cacheable : bool
+            *True* if the object can be cached, *False* otherwise
+        """
+        if spec.get("seed") is not None:
+            return True
+        try:
+            return "seed" not in inspect.signature(registry[spec["name"]]).parameters
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    def get_scenario(self, key):
+        """Return a cached scenario
+
+        Parameters
+        ----------
+        key : str
+            The key of the scenario
+
+        Returns
+        -------
+        scenario : tuple
+            A (topology, random_state) tuple, where topology is a copy of the
+            cached topology which can be modified freely and random_state is
+            the state of the generators of the *random* and *numpy.random*
+            modules after the scenario was built, or *None* if the scenario
+            is not cached
+        """
+        entry = self._get(self._scenarios, key, "scenario")
+        if entry is None:
+            return None
+        topology, random_state = entry
+        return topology.copy(), random_state
+
+    def put_scenario(self, key, topology, random_state):
+        """Cache a scenario
+
+        Parameters
+        ----------
+        key : str
+            The key of the scenario
+        topology : Topology
+            The topology with caches and contents placed. A copy is cached
+        random_state : tuple
+            The state of the generators of the *random* and *numpy.random*
+            modules after the scenario was built
+        """
+        self._put(self._scenarios, key, "scenario", (topology.copy(), random_state))
+
+    def get_paths(self, key):
+        """Return a cached path store or *None* if it is not cached
+
+        Parameters
+        ----------
+        key : str
+            The key of the path store
+        """
+        return self._get(self._paths, key, "paths")
+
+    def put_paths(self, key, path_store):
+        """Cache a path store
+
+        Parameters
+        ----------
+        key : str
+            The key of the path store
+        path_store : PathStore
+            The path store
+        """
+        self._put(self._paths, key, "paths", path_store)
+
+    def _path(self, key, kind):
+        return os.path.join(self.directory, "{}.{}.pickle".format(key, kind))
+
+    def _get(self, entries, key, kind):
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+        if self.directory is None or not os.path.exists(self._path(key, kind)):
+            return None
+        with open(self._path(key, kind), "rb") as f:
+            value = pickle.load(f)
+        self._put(entries, key, None, value)
+        return value
+
+    def _put(self, entries, key, kind, value):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        if self.directory is not None and kind is not None:
+            # Write to a temporary file first so that other processes never
+            # read a partially written entry
+            tmp_path = "{}.{}.tmp".format(self._path(key, kind), os.getpid())
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key, kind))
+
+
+class CostModel:
+    """Model of the memory footprint and run time of experiments.
+
+    The memory of an experiment is the sum of the memory of a process
+    running Icarus, of the nodes of the topology, of the table of all-pair
+    shortest paths, of the contents and of the cache entries.
+
+    The run time of an experiment is the time taken to set up the scenario
+    plus the time taken by each warmup and measured event. Unless the model
+    is calibrated, the setup time grows with the number of node pairs and of
+    contents and the time of an event grows with the mean length of the
+    shortest paths of the topology. The model can be calibrated by executing
+    a short version of an experiment, in which case the times measured are
+    used for all experiments with the same topology, strategy and cache
+    policy.
+
+    Constants are rough estimates for CPython on 64-bit platforms. For
+    experiments with steady state detection enabled, estimates are upper
+    bounds.
+    """
+
+    # Resident memory of a process which imported Icarus, in bytes
+    BASE_MEMORY = 150 * 2 ** 20
+    # Memory of each node, e.g. of its attributes, cache and data collectors
+    NODE_MEMORY = 16 * 2 ** 10
+    # Memory of each content, e.g. its entries in the content placement and
+    # source tables
+    CONTENT_MEMORY = 200
+    # Memory of each cache entry
+    CACHE_ENTRY_MEMORY = 200
+    # Time taken by an event for each node on the path it traverses
+    EVENT_HOP_TIME = 2e-6
+    # Setup time for each pair of nodes, e.g. to compute shortest paths, and
+    # for each content, e.g. to place it
+    SETUP_PAIR_TIME = 1.5e-6
+    SETUP_CONTENT_TIME = 1e-7
+
+    def __init__(self):
+        """Constructor"""
+        # Map topology keys to (n_nodes, mean_path_length) tuples
+        self._topologies = {}
+        # Map calibration keys to (setup_time, warmup_time, measured_time)
+        # tuples, the latter two being times per event
+        self._calibration = {}
+
+    @staticmethod
+    def calibration_key(experiment):
+        """Return the key identifying the experiments sharing the calibration
+        of an experiment, i.e. those with the same topology, strategy and
+        cache policy"""
+        return ScenarioCache.key(
+            experiment["topology"], experiment["strategy"], experiment["cache_policy"]
+        )
+
+    def topology(self, spec):
+        """Return the size of a topology
+
+        Parameters
+        ----------
+        spec : dict
+            The topology specification of an experiment
+
+        Returns
+        -------
+        n_nodes : int
+            The number of nodes
+        path_length : float
+            The mean length, in hops, of shortest paths, estimated from the
+            paths of a sample of nodes
+        """
+        key = ScenarioCache.key(spec)
+        if key not in self._topologies:
+            topology = _build_topology(spec)
+            if topology is None or topology.number_of_nodes() < 2:
+                self._topologies[key] = (_topology_size(spec), 1.0)
+            else:
+                nodes = sorted(topology.nodes(), key=str)
+                sample = nodes[:: max(len(nodes) // 16, 1)]
+                lengths = [
+                    length
+                    for v in sample
+                    for length in nx.single_source_shortest_path_length(
+                        topology, v
+                    ).values()
+                    if length > 0
+                ]
+                self._topologies[key] = (
+                    len(nodes),
+                    sum(lengths) / len(lengths) if lengths else 1.0,
+                )
+        return self._topologies[key]
+
+    def memory(self, experiment):
+        """Return the estimated peak memory of a process executing an
+        experiment
+
+        Parameters
+        ----------
+        experiment : Tree
+            The experiment parameters tree
+
+        Returns
+        -------
+        memory : int
+            The memory, in bytes
+        """
+        n_nodes, path_length = self.topology(experiment["topology"])
+        n_contents = experiment["workload"].get("n_contents", 0)
+        network_cache = (
+            experiment["cache_placement"].get("network_cache", 0)
+            if "cache_placement" in experiment
+            else 0
+        )
+        # The path table stores a predecessor matrix, the offsets of the path
+        # of each pair and the nodes of all paths, see PathStore
+        n_pairs = n_nodes * (n_nodes + 1) // 2
+        path_table = n_nodes ** 2 * 4 + n_pairs * (8 + 4 * (path_length + 1))
+        return int(
+            self.BASE_MEMORY
+            + n_nodes * self.NODE_MEMORY
+            + path_table
+            + n_contents * self.CONTENT_MEMORY
+            + n_contents * network_cache * self.CACHE_ENTRY_MEMORY
+        )
+
+    def runtime(self, experiment):
+        """Return the estimated run time of an experiment
+
+        Parameters
+        ----------
+        experiment : Tree
+            The experiment parameters tree
+
+        Returns
+        -------
+        runtime : float
+            The run time, in seconds
+        """
+        n_warmup, n_measured = _workload_length(experiment["workload"])
+        key = self.calibration_key(experiment)
+        if key in self._calibration:
+            setup_time, warmup_time, measured_time = self._calibration[key]
+        else:
+            n_nodes, path_length = self.topology(experiment["topology"])
+            n_contents = experiment["workload"].get("n_contents", 0)
+            setup_time = (
+                n_nodes ** 2 * self.SETUP_PAIR_TIME
+                + n_contents * self.SETUP_CONTENT_TIME
+            )
+            warmup_time = measured_time = self.EVENT_HOP_TIME * (1 + path_length)
+        return setup_time + n_warmup * warmup_time + n_measured * measured_time
+
+    def calibrate(self, settings, experiment, n_events=2000):
+        """Calibrate the model by executing a short version of an experiment
+
+        The experiment is executed in this process with at most *n_events*
+        warmup and measured events.
+
+        Parameters
+        ----------
+        settings : Settings
+            The simulator settings
+        experiment : Tree
+            The experiment parameters tree
+        n_events : int, optional
+            The maximum number of warmup and of measured events
+
+        Returns
+        -------
+        calibrated : bool
+            *True* if the model was calibrated, *False* if the experiment
+            failed or its workload has no warmup and measured lengths
+        """
+        n_warmup, n_measured = _workload_length(experiment["workload"])
+        if n_warmup + n_measured == 0:
+            return False
+        short = copy.deepcopy(experiment)
+        short["workload"]["n_warmup"] = min(n_warmup, n_events)
+        short["workload"]["n_measured"] = min(n_measured, n_events)
+        calibration_settings = Settings()
+        for name in ("DATA_COLLECTORS", "BATCH_SIZE", "SEED"):
+            if name in settings:
+                calibration_settings.set(name, settings.get(name))
+        calibration_settings.INSTRUMENTATION = True
+        result = run_scenario(calibration_settings, short, 1, 1)
+        if result is None:
+            return False
+        instr = result[1]["INSTRUMENTATION"]
+        event_times = {
+            phase: instr["WALL_TIME"][phase] / n
+            for phase, n in instr["N_EVENTS"].items()
+            if n > 0
+        }
+        measured_time = event_times.get("MEASURED", event_times.get("WARMUP"))
+        if measured_time is None:
+            return False
+        warmup_time = event_times.get("WARMUP", measured_time)
+        setup_time = sum(
+            t
+            for phase, t in instr["WALL_TIME"].items()
+            if phase not in ("WARMUP", "MEASURED")
+        )
+        self._calibration[self.calibration_key(experiment)] = (
+            setup_time,
+            warmup_time,
+            measured_time,
+        )
+        return True
+
+    def makespan(self, experiments, n_processes):
+        """Return the estimated wall-clock time taken to execute experiments
+        by a number of processes, each executing one experiment at a time, if
+        the most expensive experiments are executed first
+
+        Parameters
+        ----------
+        experiments : list
+            The parameters trees of the experiments, including each
+            replication
+        n_processes : int
+            The number of processes
+
+        Returns
+        -------
+        makespan : float
+            The wall-clock time, in seconds
+        """
+        finish_times = [0.0] * max(n_processes, 1)
+        for runtime in sorted(map(self.runtime, experiments), reverse=True):
+            heapq.heapreplace(finish_times, finish_times[0] + runtime)
+        return max(finish_times)
+
+    def max_processes(self, experiments, n_processes, memory=None):
+        """Return the maximum number of processes which can execute
+        experiments concurrently without exceeding the memory available
+
+        Parameters
+        ----------
+        experiments : list
+            The parameters trees of the experiments
+        n_processes : int
+            The number of processes requested
+        memory : int, optional
+            The memory available, in bytes. If not specified, it is the memory
+            currently available on this host, if it can be measured
+
+        Returns
+        -------
+        n_processes : int
+            The number of processes, at least 1 and at most the number
+            requested, such that the processes executing the most memory
+            intensive experiments fit in the memory available
+        """
+        if memory is None:
+            memory = _available_memory()
+            if memory is None:
+                return n_processes
+        footprints = sorted(map(self.memory, experiments), reverse=True)
+        total = 0
+        for n, footprint in enumerate(footprints[:n_processes]):
+            total += footprint
+            if total > memory:
+                return max(n, 1)
+        return n_processes
+
+
+def _available_memory():
+    """Return the memory available to start new processes without swapping
+
+    Returns
+    -------
+    memory : int
+        The available memory, in bytes, or *None* if it cannot be measured on
+        this platform
+    """
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+# Scenario cache of the current process, created on first use. Each worker
+# process of the orchestrator has its own cache.
+_scenario_cache = None
+
+
+def _get_scenario_cache(settings):
+    """Return the scenario cache of the current process or *None* if scenario
+    caching is disabled"""
+    global _scenario_cache
+    if "SCENARIO_CACHE" not in settings or not settings.SCENARIO_CACHE:
+        return None
+    directory = (
+        settings.SCENARIO_CACHE_DIR if "SCENARIO_CACHE_DIR" in settings else None
+    )
+    maxsize = settings.SCENARIO_CACHE_SIZE if "SCENARIO_CACHE_SIZE" in settings else 4
+    if (
+        _scenario_cache is None
+        or _scenario_cache.directory != directory
+        or _scenario_cache.maxsize != maxsize
+    ):
+        _scenario_cache = ScenarioCache(maxsize, directory)
+    return _scenario_cache
+
+
+# Settings and read-only topologies installed in each worker process of the
+# orchestrator pool by _init_worker
+_worker_settings = None
+_shared_topologies = {}
+
+
+def _init_worker(settings, topologies):
+    """Initialize a worker process of the orchestrator pool
+
+    Parameters
+    ----------
+    settings : Settings
+        The simulator settings
+    topologies : dict
+        Topologies built by the orchestrator, keyed by the key of their
+        specification. Experiments use copies of them instead of building
+        them again
+    """
+    global _worker_settings, _shared_topologies
+    _worker_settings = settings
+    _shared_topologies = topologies
+
+
+def _run_job(params, curr_exp, n_exp, replication, segment=None):
+    """Run an experiment in a worker process of the orchestrator pool, with
+    the settings installed by _init_worker, see `run_scenario`"""
+    return run_scenario(_worker_settings, params, curr_exp, n_exp, replication, segment)
+
+
+def run_scenario(settings, params, curr_exp, n_exp, replication=0, segment=None):
     """Run a single scenario experiment
 
     Parameters
@@ -212,6 +1261,11 @@ def run_scenario(settings, params, curr_exp, n_exp):
         sequence number of the experiment
     n_exp : int
         Number of scheduled experiments
+    replication : int, optional
+        Index of the replication of the experiment
+    segment : int, optional
+        Index of the segment of the replication to execute, if replications
+        are split into *N_SEGMENTS* segments, see `_split_segment`
 
     Returns
     -------
@@ -221,17 +1275,94 @@ def run_scenario(settings, params, curr_exp, n_exp):
         is a dictionary which stores the results. The third element is an
         integer expressing the wall-clock duration of the experiment (in
         seconds)
+
+    Notes
+    -----
+    If the *INSTRUMENTATION* setting is *True*, the wall-clock and CPU time of
+    each phase of the experiment, the rate of warmup and measured events and
+    the peak memory of the process are stored in the results under the
+    *INSTRUMENTATION* key.
+
+    If the *PROFILE* setting is specified, the experiment is profiled by a
+    `SamplingProfiler` and its samples are written in collapsed stack format
+    to a file named *<PROFILE>.<curr_exp>.collapsed*.
+
+    If the *STEADY_STATE_DETECTION* setting is *True*, the numbers of warmup
+    and measured requests of the workload are only upper bounds and the
+    actual numbers are chosen by a `SteadyStateDetector`, whose parameters
+    are specified by the *STEADY_STATE_PARAMS* setting. They are stored in the
+    results under the *STEADY_STATE* key.
+
+    If the *SEED* setting is specified, the components of the experiment
+    which accept a *seed* argument and are not seeded by its parameters are
+    seeded with values derived from *SEED*, the replication index and the
+    component, see `SEEDED_COMPONENTS`. The index and the seed are stored in
+    the results under the *REPLICATION* key.
+
+    If *segment* is specified, the results of collectors are not computed.
+    The results store instead the `CollectorProxy` of the experiment under
+    the *COLLECTOR_STATE* key, to be merged with those of the other segments,
+    and the index of the segment, the number of segments and the index of
+    the replication under the *SEGMENT* key.
     """
+    profiler = None
     try:
         start_time = time.time()
         proc_name = mp.current_process().name
         logger = logging.getLogger("runner-%s" % proc_name)
 
+        if "PROFILE" in settings and settings.PROFILE:
+            interval = (
+                settings.PROFILE_INTERVAL if "PROFILE_INTERVAL" in settings else 0.005
+            )
+            profiler = SamplingProfiler(interval)
+            profiler.start()
+
         # Get list of metrics required
         metrics = settings.DATA_COLLECTORS
 
         # Copy parameters so that they can be manipulated
         tree = copy.deepcopy(params)
+        seed = settings.SEED if "SEED" in settings else None
+        if seed is not None:
+            _seed_components(tree, seed, replication)
+        if segment is not None:
+            _split_segment(tree, segment, settings.N_SEGMENTS)
+
+        if "INSTRUMENTATION" in settings and settings.INSTRUMENTATION:
+            instrumentation = Instrumentation()
+        else:
+            instrumentation = None
+
+        # Look up the scenario in the cache, if enabled and if the scenario is
+        # built deterministically
+        scenario_cache = _get_scenario_cache(settings)
+        scenario_key = None
+        scenario = None
+        topology_key = ScenarioCache.key(tree["topology"])
+        if scenario_cache is not None and all(
+            ScenarioCache.cacheable(tree[name], registry)
+            for name, registry in (
+                ("topology", TOPOLOGY_FACTORY),
+                ("workload", WORKLOAD),
+                ("cache_placement", CACHE_PLACEMENT),
+                ("content_placement", CONTENT_PLACEMENT),
+            )
+            if name in tree
+        ):
+            scenario_key = ScenarioCache.key(
+                *(
+                    tree[name] if name in tree else None
+                    for name in (
+                        "topology",
+                        "workload",
+                        "cache_placement",
+                        "content_placement",
+                    )
+                )
+            )
+            with _phase(instrumentation, "SCENARIO_CACHE"):
+                scenario = scenario_cache.get_scenario(scenario_key)
 
         # Set topology
         topology_spec = tree["topology"]
@@ -241,7 +1372,15 @@ def run_scenario(settings, params, curr_exp, n_exp):
                 "No topology factory implementation for %s was found." % topology_name
             )
             return None
-        topology = TOPOLOGY_FACTORY[topology_name](**topology_spec)
+        if scenario is not None:
+            topology, random_state = scenario
+        else:
+            with _phase(instrumentation, "TOPOLOGY"):
+                topology = _shared_topologies.get(topology_key)
+                if topology is not None:
+                    topology = _copy_topology(topology)
+                else:
+                    topology = TOPOLOGY_FACTORY[topology_name](**topology_spec)
 
         workload_spec = tree["workload"]
         workload_name = workload_spec.pop("name")
@@ -250,7 +1389,8 @@ def run_scenario(settings, params, curr_exp, n_exp):
                 "No workload implementation named %s was found." % workload_name
             )
             return None
-        workload = WORKLOAD[workload_name](topology, **workload_spec)
+        with _phase(instrumentation, "WORKLOAD"):
+            workload = WORKLOAD[workload_name](topology, **workload_spec)
 
         # Assign caches to nodes
         if "cache_placement" in tree:
@@ -263,7 +1403,9 @@ def run_scenario(settings, params, curr_exp, n_exp):
             # Cache budget is the cumulative number of cache entries across
             # the whole network
             cachepl_spec["cache_budget"] = workload.n_contents * network_cache
-            CACHE_PLACEMENT[cachepl_name](topology, **cachepl_spec)
+            if scenario is None:
+                with _phase(instrumentation, "CACHE_PLACEMENT"):
+                    CACHE_PLACEMENT[cachepl_name](topology, **cachepl_spec)
 
         # Assign contents to sources
         # If there are many contents, after doing this, performing operations
@@ -276,7 +1418,18 @@ def run_scenario(settings, params, curr_exp, n_exp):
                 "No content placement implementation named %s was found." % contpl_name
             )
             return None
-        CONTENT_PLACEMENT[contpl_name](topology, workload.contents, **contpl_spec)
+        if scenario is None:
+            with _phase(instrumentation, "CONTENT_PLACEMENT"):
+                CONTENT_PLACEMENT[contpl_name](
+                    topology, workload.contents, **contpl_spec
+                )
+            if scenario_key is not None:
+                random_state = (random.getstate(), np.random.get_state())
+                scenario_cache.put_scenario(scenario_key, topology, random_state)
+        else:
+            # Leave random generators as building the scenario would have
+            random.setstate(random_state[0])
+            np.random.set_state(random_state[1])
 
         # caching and routing strategy definition
         strategy = tree["strategy"]
@@ -296,6 +1449,19 @@ def run_scenario(settings, params, curr_exp, n_exp):
 
         # Configuration parameters of network model
         netconf = tree["netconf"]
+        # Reuse shortest paths computed for the same topology, unless the
+        # experiment requests a specific path store
+        if (
+            scenario_key is not None
+            and "shortest_path" not in netconf
+            and "path_cache_size" not in netconf
+        ):
+            path_store = scenario_cache.get_paths(topology_key)
+            if path_store is None:
+                with _phase(instrumentation, "SHORTEST_PATHS"):
+                    path_store = PathStore(topology)
+                scenario_cache.put_paths(topology_key, path_store)
+            netconf = dict(netconf, shortest_path=path_store)
 
         # Text description of the scenario run to print on screen
         scenario = tree["desc"] if "desc" in tree else "Description N/A"
@@ -313,9 +1479,47 @@ def run_scenario(settings, params, curr_exp, n_exp):
         collectors = {m: {} for m in metrics}
 
         logger.info("Experiment %d/%d | Start simulation", curr_exp, n_exp)
+        batch_size = settings.BATCH_SIZE if "BATCH_SIZE" in settings else None
+        steady_state = None
+        if "STEADY_STATE_DETECTION" in settings and settings.STEADY_STATE_DETECTION:
+            if hasattr(workload, "n_warmup") and hasattr(workload, "n_measured"):
+                steady_state = SteadyStateDetector(
+                    workload.n_warmup,
+                    workload.n_measured,
+                    **(
+                        settings.STEADY_STATE_PARAMS
+                        if "STEADY_STATE_PARAMS" in settings
+                        else {}
+                    )
+                )
+            else:
+                logger.warning(
+                    "Experiment %d/%d | Workload %s has no warmup and measured "
+                    "lengths, steady state detection disabled",
+                    curr_exp,
+                    n_exp,
+                    workload_name,
+                )
         results = exec_experiment(
-            topology, workload, netconf, strategy, cache_policy, collectors
+            topology,
+            workload,
+            netconf,
+            strategy,
+            cache_policy,
+            collectors,
+            batch_size=batch_size,
+            instrumentation=instrumentation,
+            steady_state=steady_state,
+            collector_state=segment is not None,
         )
+        if segment is not None:
+            results["SEGMENT"] = Tree(
+                INDEX=segment, N_SEGMENTS=settings.N_SEGMENTS, REPLICATION=replication
+            )
+        if instrumentation is not None:
+            results["INSTRUMENTATION"] = instrumentation.results()
+        if seed is not None:
+            results["REPLICATION"] = Tree(INDEX=replication, SEED=seed)
 
         duration = time.time() - start_time
         logger.info(
@@ -339,3 +1543,232 @@ def run_scenario(settings, params, curr_exp, n_exp):
             err_message,
             traceback.format_exc(),
         )
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            if segment is None:
+                profiler.write("%s.%d.collapsed" % (settings.PROFILE, curr_exp))
+            else:
+                profiler.write(
+                    "%s.%d.%d.collapsed" % (settings.PROFILE, curr_exp, segment)
+                )
+
+
+def run_worker(address, authkey, heartbeat_interval=5.0, connect_timeout=60.0):
+    """Execute experiments handed out by a remote orchestrator until all
+    experiments of its campaign are executed
+
+    Parameters
+    ----------
+    address : str
+        The *HOST:PORT* address of the orchestrator
+    authkey : str
+        The key authenticating the worker, i.e. the *SERVE_AUTHKEY* setting
+        of the orchestrator or the key it logged if that is not specified
+    heartbeat_interval : float, optional
+        The interval between heartbeats sent to the orchestrator, in seconds.
+        It must be shorter than the *SERVE_HEARTBEAT_TIMEOUT* setting of the
+        orchestrator
+    connect_timeout : float, optional
+        The time, in seconds, during which connection to the orchestrator is
+        retried if it is not reachable
+    """
+    worker = "%s-%d" % (socket.gethostname(), os.getpid())
+    client = CoordinatorClient(
+        worker,
+        parse_address(address),
+        authkey.encode(),
+        heartbeat_interval,
+        connect_timeout,
+    )
+    logger.info("Worker %s connected to %s" % (worker, address))
+    try:
+        settings = client.settings()
+        while True:
+            status, job_id, job = client.get_job()
+            if status == "DONE":
+                break
+            if status == "WAIT":
+                time.sleep(1)
+                continue
+            client.put_result(job_id, run_scenario(settings, *job))
+    except (EOFError, OSError):
+        # The orchestrator exits as soon as it receives all results, hence
+        # workers waiting for jobs may not be notified that none are left
+        logger.warning("Worker %s disconnected from %s" % (worker, address))
+    finally:
+        client.close()
+
+
+def _seed_components(tree, seed, replication):
+    """Seed the components of an experiment which accept a *seed* argument
+    and are not seeded by its parameters
+
+    The seed of each component is derived from the seed of the campaign, the
+    index of the replication and the position of the component in
+    `SEEDED_COMPONENTS`, but not from other parameters. Hence, the same
+    replication of experiments differing e.g. only in strategy uses the same
+    random numbers for workload and placements, which reduces the variance of
+    the differences between their results.
+
+    Parameters
+    ----------
+    tree : Tree
+        The experiment parameters tree, modified in place
+    seed : int
+        The seed of the campaign
+    replication : int
+        The index of the replication
+    """
+    for i, (name, registry) in enumerate(SEEDED_COMPONENTS):
+        if name not in tree or tree[name].get("seed") is not None:
+            continue
+        factory = registry.get(tree[name].get("name"))
+        if factory is None or "seed" not in inspect.signature(factory).parameters:
+            continue
+        seed_seq = np.random.SeedSequence(seed, spawn_key=(replication, i))
+        tree[name]["seed"] = int(seed_seq.generate_state(1, np.uint64)[0])
+
+
+def _split_segment(tree, segment, n_segments):
+    """Adapt the parameters of an experiment to execute one of the segments
+    into which its measured requests are split
+
+    Each segment executes all the warmup requests of the experiment, so that
+    its caches are warmed independently, and its share of measured requests.
+    The components of `SEGMENT_SEEDED_COMPONENTS` which are seeded are given
+    a seed derived from theirs and from the index of the segment, except in
+    the first segment, so that segments are independent.
+
+    Parameters
+    ----------
+    tree : Tree
+        The experiment parameters tree, modified in place
+    segment : int
+        The index of the segment
+    n_segments : int
+        The number of segments
+    """
+    workload = tree["workload"]
+    n_measured = _workload_length(workload)[1]
+    workload["n_measured"] = n_measured // n_segments + int(
+        segment < n_measured % n_segments
+    )
+    if segment == 0:
+        return
+    for name in SEGMENT_SEEDED_COMPONENTS:
+        if name in tree and tree[name].get("seed") is not None:
+            seed_seq = np.random.SeedSequence(tree[name]["seed"], spawn_key=(segment,))
+            tree[name]["seed"] = int(seed_seq.generate_state(1, np.uint64)[0])
+
+
+def _replication_index(results):
+    """Return the index of the replication which produced some results, or
+    *None* if unknown"""
+    if "REPLICATION" in results and "INDEX" in results["REPLICATION"]:
+        return results["REPLICATION"]["INDEX"]
+    return None
+
+
+def _authkey(settings):
+    """Return the key authenticating workers, i.e. the *SERVE_AUTHKEY*
+    setting or, if it is not specified, a random key which is logged"""
+    if "SERVE_AUTHKEY" in settings and settings.SERVE_AUTHKEY:
+        return settings.SERVE_AUTHKEY.encode()
+    authkey = secrets.token_hex(16)
+    logger.warning(
+        "SERVE_AUTHKEY is not set, start workers with --authkey %s" % authkey
+    )
+    return authkey.encode()
+
+
+def _phase(instrumentation, name):
+    """Return a context manager timing a phase of an experiment if
+    instrumentation is enabled or doing nothing otherwise"""
+    if instrumentation is None:
+        return contextlib.nullcontext()
+    return instrumentation.phase(name)
+
+
+# Topologies built by the orchestrator process, keyed by the key of their
+# specification, or None if they cannot be built
+_topologies = {}
+
+
+def _build_topology(spec):
+    """Return the topology built from a specification, or *None* if it cannot
+    be built. Topologies are built once and must not be modified"""
+    key = ScenarioCache.key(spec)
+    if key not in _topologies:
+        spec = dict(spec)
+        # Building the topology must not alter the random generators used
+        # by experiments executed by this process
+        random_state = random.getstate(), np.random.get_state()
+        try:
+            _topologies[key] = TOPOLOGY_FACTORY[spec.pop("name")](**spec)
+        except Exception:
+            _topologies[key] = None
+        finally:
+            random.setstate(random_state[0])
+            np.random.set_state(random_state[1])
+    return _topologies[key]
+
+
+def _copy_topology(topology):
+    """Return a copy of a topology whose node stacks can be modified, e.g. by
+    cache and content placements, without modifying those of the original
+
+    Copying a topology only copies the attribute dictionaries of its nodes,
+    not the stack tuples and property dictionaries they store.
+    """
+    topology = topology.copy()
+    for _, data in topology.nodes(data=True):
+        if "stack" in data:
+            data["stack"] = copy.deepcopy(data["stack"])
+    return topology
+
+
+def _topology_size(spec):
+    """Return the number of nodes of the topology built from a specification
+    or 1 if it cannot be built"""
+    topology = _build_topology(spec)
+    return 1 if topology is None else max(topology.number_of_nodes(), 1)
+
+
+def _experiment_cost(experiment):
+    """Return an estimate of the cost of executing an experiment
+
+    The cost is the product of the number of nodes of the topology and the
+    number of events of the workload, i.e. warmup and measured requests. It
+    is only meant to compare experiments with each other.
+
+    Parameters
+    ----------
+    experiment : Tree
+        The experiment parameters tree
+
+    Returns
+    -------
+    cost : int
+        The estimated cost
+    """
+    n_nodes = _topology_size(experiment["topology"])
+    return n_nodes * max(sum(_workload_length(experiment["workload"])), 1)
+
+
+def _workload_length(spec):
+    """Return the numbers of warmup and measured events of a workload, as
+    specified or by default, or 0 if unknown"""
+    try:
+        defaults = inspect.signature(WORKLOAD[spec["name"]]).parameters
+    except (KeyError, TypeError, ValueError):
+        defaults = {}
+    length = []
+    for param in ("n_warmup", "n_measured"):
+        if param in spec:
+            length.append(spec[param])
+        elif param in defaults and isinstance(defaults[param].default, int):
+            length.append(defaults[param].default)
+        else:
+            length.append(0)
+    return tuple(length)
@@ -3,6 +3,8 @@
 import collections
 import copy
 import json
+import logging
+import os
 
 try:
     import cPickle as pickle
@@ -12,7 +14,15 @@ from icarus.util import Tree
 from icarus.registry import register_results_reader, register_results_writer
 
 
-__all__ = ["ResultSet", "write_results_pickle", "read_results_pickle"]
+__all__ = [
+    "ResultSet",
+    "ResultsJournal",
+    "write_results_pickle",
+    "read_results_pickle",
+]
+
+
+logger = logging.getLogger("results")
 
 
 class ResultSet:
@@ -211,6 +221,89 @@ class ResultSet:
         return filtered_resultset
 
 
+class ResultsJournal:
+    """Append-only on-disk journal of the results of experiments.
+
+    Each result is appended to the journal file and flushed to disk as soon as
+    it is added, so that the results of completed experiments survive a crash
+    of the process running a campaign and can be used to resume it.
+
+    The journal is a sequence of pickled (parameters, results) 2-tuples. If
+    the process crashes while a record is being written, the incomplete
+    record is discarded when the journal is reopened.
+    """
+
+    def __init__(self, path, resume=False):
+        """Constructor
+
+        Parameters
+        ----------
+        path : str
+            The path of the journal file
+        resume : bool, optional
+            If *True* and the journal file exists, the results it contains are
+            loaded in the *results* attribute and new results are appended to
+            it. Otherwise, the journal file is created or truncated
+        """
+        self.path = path
+        self.results = ResultSet()
+        offset = 0
+        if resume and os.path.exists(path):
+            with open(path, "rb") as f:
+                while True:
+                    try:
+                        parameters, results = pickle.load(f)
+                    except EOFError:
+                        break
+                    except Exception:
+                        logger.warning(
+                            "Discarding incomplete record at the end of results "
+                            "journal %s" % path
+                        )
+                        break
+                    self.results.add(parameters, results)
+                    offset = f.tell()
+        self._file = open(path, "r+b" if offset else "wb")
+        # Drop any incomplete record after the last complete one
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    @staticmethod
+    def key(parameters):
+        """Return a canonical representation of the parameters of an
+        experiment, identical for equal parameter trees
+
+        Parameters
+        ----------
+        parameters : Tree
+            Tree of experiment parameters
+
+        Returns
+        -------
+        key : str
+            The canonical representation
+        """
+        return json.dumps(parameters, sort_keys=True, default=repr)
+
+    def append(self, parameters, results):
+        """Append the result of an experiment to the journal
+
+        Parameters
+        ----------
+        parameters : Tree
+            Tree of experiment parameters
+        results : Tree
+            Tree of experiment results
+        """
+        pickle.dump((parameters, results), self._file, pickle.HIGHEST_PROTOCOL)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the journal file"""
+        self._file.close()
+
+
 @register_results_writer("PICKLE")
 def write_results_pickle(results, path):
     """Write a resultset to a pickle file
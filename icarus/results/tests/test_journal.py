@@ -0,0 +1,46 @@
+from icarus.results import ResultsJournal
+from icarus.util import Tree
+
+
+class TestResultsJournal:
+    def test_append_resume(self, tmp_path):
+        path = str(tmp_path / "results.journal")
+        journal = ResultsJournal(path)
+        journal.append(Tree({"alpha": 1}), Tree({"m": 1}))
+        journal.append(Tree({"alpha": 2}), Tree({"m": 2}))
+        journal.close()
+        journal = ResultsJournal(path, resume=True)
+        assert [({"alpha": 1}, {"m": 1}), ({"alpha": 2}, {"m": 2})] == list(
+            journal.results
+        )
+        journal.append(Tree({"alpha": 3}), Tree({"m": 3}))
+        journal.close()
+        assert 3 == len(ResultsJournal(path, resume=True).results)
+
+    def test_no_resume(self, tmp_path):
+        path = str(tmp_path / "results.journal")
+        journal = ResultsJournal(path)
+        journal.append(Tree({"alpha": 1}), Tree({"m": 1}))
+        journal.close()
+        assert 0 == len(ResultsJournal(path).results)
+        assert 0 == len(ResultsJournal(path, resume=True).results)
+
+    def test_incomplete_record(self, tmp_path):
+        path = str(tmp_path / "results.journal")
+        journal = ResultsJournal(path)
+        journal.append(Tree({"alpha": 1}), Tree({"m": 1}))
+        journal.append(Tree({"alpha": 2}), Tree({"m": 2}))
+        journal.close()
+        with open(path, "rb+") as f:
+            f.truncate(f.seek(0, 2) - 3)
+        journal = ResultsJournal(path, resume=True)
+        assert [({"alpha": 1}, {"m": 1})] == list(journal.results)
+        journal.append(Tree({"alpha": 3}), Tree({"m": 3}))
+        journal.close()
+        journal = ResultsJournal(path, resume=True)
+        assert [{"alpha": 1}, {"alpha": 3}] == [p for p, _ in journal.results]
+
+    def test_key(self):
+        key = ResultsJournal.key(Tree({"a": {"b": 1, "c": 2}, "d": 3}))
+        assert key == ResultsJournal.key({"d": 3, "a": {"c": 2, "b": 1}})
+        assert key != ResultsJournal.key({"d": 3, "a": {"c": 2, "b": 2}})
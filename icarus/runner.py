@@ -8,12 +8,13 @@ import functools
 import logging
 import multiprocessing as mp
 
-from icarus.util import Settings, config_logging
+from icarus.util import Settings, config_logging, timestr
 from icarus.registry import RESULTS_WRITER
-from icarus.orchestration import Orchestrator
+from icarus.orchestration import CostModel, Orchestrator, run_worker
+from icarus.results import ResultsJournal
 
 
-__all__ = ["run", "handler"]
+__all__ = ["run", "plan", "run_workers", "handler"]
 
 
 logger = logging.getLogger("main")
@@ -74,7 +75,23 @@ def _validate_settings(settings, freeze=True):
         settings.freeze()
 
 
-def run(config_file, output, config_override):
+def _read_settings(config_file, config_override):
+    """Read settings from a file and override them"""
+    settings = Settings()
+    settings.read_from(config_file)
+    if config_override:
+        for k, v in config_override.items():
+            try:
+                v = eval(v)
+            except NameError:
+                pass
+            settings.set(k, v)
+    return settings
+
+
+def run(
+    config_file, output, config_override, profile=False, resume=False, serve=False
+):
     """
     Run function. It starts the simulator.
     experiments
@@ -87,23 +104,35 @@ def run(config_file, output, config_override):
         The file name where results will be saved
     config_override : dict, optional
         Configuration parameters overriding parameters in the file
+    profile : bool, optional
+        If *True*, profile each experiment with a sampling profiler and write
+        its samples next to the results file
+    resume : bool, optional
+        If *True*, resume an interrupted run, i.e. do not execute again the
+        experiments whose results are in the journal of the results file
+    serve : bool, optional
+        If *True*, do not execute experiments but hand them out to remote
+        workers, see `run_workers`
+
+    Notes
+    -----
+    The results of each experiment are appended to a journal file, named as
+    the results file with a *.journal* suffix, as soon as the experiment
+    completes. The journal is removed once all results are saved.
     """
     # Read settings from file and save them in icarus.conf.settings
-    settings = Settings()
-    settings.read_from(config_file)
-    if config_override:
-        for k, v in config_override.items():
-            try:
-                v = eval(v)
-            except NameError:
-                pass
-            settings.set(k, v)
+    settings = _read_settings(config_file, config_override)
+    if profile:
+        settings.set("PROFILE", os.path.splitext(output)[0])
+    if serve:
+        settings.set("SERVE", True)
     # Config logger
     config_logging(settings.LOG_LEVEL if "LOG_LEVEL" in settings else "INFO")
     # Validate settings
     _validate_settings(settings, freeze=True)
     # set up orchestration
-    orch = Orchestrator(settings)
+    journal = ResultsJournal(output + ".journal", resume=resume)
+    orch = Orchestrator(settings, journal=journal)
     for sig in (
         signal.SIGTERM,
         signal.SIGINT,
@@ -118,3 +147,116 @@ def run(config_file, output, config_override):
     results = orch.results
     RESULTS_WRITER[settings.RESULTS_FORMAT](results, output)
     logger.info("Saved results to file %s" % os.path.abspath(output))
+    journal.close()
+    os.remove(journal.path)
+
+
+def plan(config_file, config_override=None, calibrate=True):
+    """Estimate the resources needed to run a simulation campaign without
+    running it.
+
+    The memory footprint and run time of each experiment are estimated by
+    the cost model used by the orchestrator. If *calibrate* is *True*, the
+    model is first calibrated by executing a short version of one experiment
+    for each distinct combination of topology, strategy and cache policy.
+
+    Parameters
+    ----------
+    config_file : str
+        Path of the configuration file
+    config_override : dict, optional
+        Configuration parameters overriding parameters in the file
+    calibrate : bool, optional
+        If *True*, calibrate the cost model
+
+    Returns
+    -------
+    report : str
+        The estimated memory and run time of each experiment and the
+        wall-clock time of the campaign
+    """
+    settings = _read_settings(config_file, config_override)
+    config_logging(settings.LOG_LEVEL if "LOG_LEVEL" in settings else "INFO")
+    _validate_settings(settings, freeze=True)
+    experiments = settings.EXPERIMENT_QUEUE
+    n_replications = settings.N_REPLICATIONS
+    n_proc = settings.N_PROCESSES if settings.PARALLEL_EXECUTION else 1
+    cost_model = CostModel()
+    if calibrate:
+        calibrated = set()
+        for experiment in experiments:
+            key = cost_model.calibration_key(experiment)
+            if key not in calibrated:
+                calibrated.add(key)
+                logger.info(
+                    "Calibrating cost model on topology %s, strategy %s, "
+                    "cache policy %s",
+                    experiment["topology"]["name"],
+                    experiment["strategy"]["name"],
+                    experiment["cache_policy"]["name"],
+                )
+                cost_model.calibrate(settings, experiment)
+    fmt = "{:>5}  {:<16} {:<16} {:<12} {:>6} {:>12} {:>12}"
+    lines = [
+        fmt.format(
+            "#", "TOPOLOGY", "STRATEGY", "POLICY", "NODES", "MEMORY (MB)", "TIME (s)"
+        )
+    ]
+    for i, experiment in enumerate(experiments):
+        lines.append(
+            fmt.format(
+                i + 1,
+                experiment["topology"]["name"],
+                experiment["strategy"]["name"],
+                experiment["cache_policy"]["name"],
+                cost_model.topology(experiment["topology"])[0],
+                "%.1f" % (cost_model.memory(experiment) / 2 ** 20),
+                "%.2f" % cost_model.runtime(experiment),
+            )
+        )
+    jobs = [experiment for experiment in experiments for _ in range(n_replications)]
+    memory = settings.MAX_MEMORY if "MAX_MEMORY" in settings else None
+    n_safe = cost_model.max_processes(jobs, n_proc, memory)
+    cpu_time = sum(map(cost_model.runtime, jobs))
+    lines.append("")
+    lines.append(
+        "Experiments: %d x %d replications" % (len(experiments), n_replications)
+    )
+    lines.append("Total CPU time: %s" % timestr(cpu_time))
+    lines.append(
+        "Wall-clock time with %d processes: %s"
+        % (n_proc, timestr(cost_model.makespan(jobs, n_proc)))
+    )
+    if n_safe < n_proc:
+        lines.append(
+            "Memory only fits %d processes, wall-clock time: %s"
+            % (n_safe, timestr(cost_model.makespan(jobs, n_safe)))
+        )
+    return "\n".join(lines)
+
+
+def run_workers(address, authkey, n_processes=None):
+    """Run worker processes executing the experiments handed out by a remote
+    orchestrator, started with *serve=True*. This function returns when all
+    experiments are executed.
+
+    Parameters
+    ----------
+    address : str
+        The *HOST:PORT* address of the orchestrator
+    authkey : str
+        The key authenticating workers, i.e. the *SERVE_AUTHKEY* setting of
+        the orchestrator or the key it logged if that is not specified
+    n_processes : int, optional
+        The number of worker processes. If not specified, it is the number of
+        CPUs of the host
+    """
+    config_logging("INFO")
+    processes = [
+        mp.Process(target=run_worker, args=(address, authkey))
+        for _ in range(n_processes or mp.cpu_count())
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
@@ -4,9 +4,9 @@ This module provides algorithms for performing cache placement, i.e., given
 a cumulative cache size and a topology where each possible node candidate is
 labelled, these functions deploy caching space to the nodes of the topology.
 """
-import random
 import networkx as nx
 
+from icarus.tools import random_generator
 from icarus.util import iround
 from icarus.registry import register_cache_placement
 from icarus.scenarios.algorithms import (
@@ -149,6 +149,8 @@ def random_cache_placement(topology, cache_budget, n_cache_nodes, seed=None, **k
         The cumulative cache budget
     n_nodes : int
         The number of caching nodes to deploy
+    seed : int, SeedSequence or any hashable type, optional
+        The seed of the random number generator, see `random_generator`
     """
     n_cache_nodes = int(n_cache_nodes)
     icr_candidates = topology.graph["icr_candidates"]
@@ -159,8 +161,12 @@ def random_cache_placement(topology, cache_budget, n_cache_nodes, seed=None, **k
     elif len(icr_candidates) == n_cache_nodes:
         caches = icr_candidates
     else:
-        random.seed(seed)
-        caches = random.sample(icr_candidates, n_cache_nodes)
+        # Candidates are a set in topologies, hence sort them to index them
+        # and draw the same caches for the same seed
+        candidates = sorted(icr_candidates, key=str)
+        rng = random_generator(seed)
+        indices = rng.choice(len(candidates), n_cache_nodes, replace=False)
+        caches = [candidates[i] for i in indices.tolist()]
     cache_size = iround(cache_budget / n_cache_nodes)
     if cache_size == 0:
         return
@@ -3,11 +3,12 @@
 This module contains function to decide the allocation of content objects to
 source nodes.
 """
-import random
 import collections
 
-from fnss.util import random_from_pdf
+import numpy as np
+
 from icarus.registry import register_content_placement
+from icarus.tools import random_generator
 
 
 __all__ = ["uniform_content_placement", "weighted_content_placement"]
@@ -42,8 +43,8 @@ def uniform_content_placement(topology, contents, seed=None):
         The topology object
     contents : iterable
         Iterable of content objects
-    source_nodes : list
-        List of nodes of the topology which are content sources
+    seed : int, SeedSequence or any hashable type, optional
+        The seed of the random number generator, see `random_generator`
 
     Returns
     -------
@@ -55,11 +56,12 @@ def uniform_content_placement(topology, contents, seed=None):
     A deterministic placement of objects (e.g., for reproducing results) can be
     achieved by using a fix seed value
     """
-    random.seed(seed)
+    rng = random_generator(seed)
     source_nodes = get_sources(topology)
     content_placement = collections.defaultdict(set)
-    for c in contents:
-        content_placement[random.choice(source_nodes)].add(c)
+    sources = rng.integers(len(source_nodes), size=len(contents))
+    for c, i in zip(contents, sources.tolist()):
+        content_placement[source_nodes[i]].add(c)
     apply_content_placement(content_placement, topology)
 
 
@@ -77,6 +79,8 @@ def weighted_content_placement(topology, contents, source_weights, seed=None):
      source_weights : dict
          Dict mapping nodes nodes of the topology which are content sources and
          the weight according to which content placement decision is made.
+     seed : int, SeedSequence or any hashable type, optional
+         The seed of the random number generator, see `random_generator`
 
      Returns
      -------
@@ -88,10 +92,12 @@ def weighted_content_placement(topology, contents, source_weights, seed=None):
      A deterministic placement of objects (e.g., for reproducing results) can be
      achieved by using a fix seed value
     """
-    random.seed(seed)
-    norm_factor = float(sum(source_weights.values()))
-    source_pdf = {k: v / norm_factor for k, v in source_weights.items()}
+    rng = random_generator(seed)
+    source_nodes = list(source_weights)
+    source_pdf = np.array([source_weights[v] for v in source_nodes], dtype=float)
+    source_pdf /= source_pdf.sum()
     content_placement = collections.defaultdict(set)
-    for c in contents:
-        content_placement[random_from_pdf(source_pdf)].add(c)
+    sources = rng.choice(len(source_nodes), size=len(contents), p=source_pdf)
+    for c, i in zip(contents, sources.tolist()):
+        content_placement[source_nodes[i]].add(c)
     apply_content_placement(content_placement, topology)
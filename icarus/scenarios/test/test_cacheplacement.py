@@ -2,6 +2,7 @@ import fnss
 
 import networkx as nx
 
+import icarus.scenarios
 import icarus.scenarios as cacheplacement
 
 
@@ -45,6 +46,19 @@ class TestRandomCachePlacement:
     def test_random_cache_placement_some_nodes_c(self):
         self.verify_random_assignment(self.topo, 100, 4)
 
+    def test_random_cache_placement_topology(self):
+        caches = []
+        for _ in range(2):
+            topo = icarus.scenarios.topology_tree(2, 4)
+            cacheplacement.random_cache_placement(topo, 100, 5, seed=1)
+            caches.append(
+                sorted(v for v in topo if "cache_size" in topo.node[v]["stack"][1])
+            )
+        assert 5 == len(caches[0])
+        assert set(caches[0]) <= topo.graph["icr_candidates"]
+        # The same seed draws the same caches
+        assert caches[0] == caches[1]
+
 
 class TestDegreeCentralityCachePlacement:
     def setup_method(self):
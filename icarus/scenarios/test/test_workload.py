@@ -1,3 +1,6 @@
+import numpy as np
+import fnss
+
 import icarus.scenarios as workload
 
 
@@ -58,3 +61,62 @@ class TestYCBS:
             assert "op" in event
             assert "item" in event
             assert "log" in event
+
+
+class TestStationaryWorkloadBatches:
+    @classmethod
+    def topology(cls):
+        topology = fnss.Topology()
+        topology.add_path([0, 1, 2])
+        fnss.add_stack(topology, 0, "receiver", {})
+        fnss.add_stack(topology, 1, "router", {})
+        fnss.add_stack(topology, 2, "receiver", {})
+        return topology
+
+    def test_batches(self):
+        wl = workload.StationaryWorkload(
+            self.topology(), 10, 0.8, n_warmup=7, n_measured=8, seed=1
+        )
+        batches = list(wl.batches(4))
+        assert [len(b[0]) for b in batches] == [4, 4, 4, 3]
+        time = np.concatenate([b[0] for b in batches])
+        receiver = np.concatenate([b[1] for b in batches])
+        content = np.concatenate([b[2] for b in batches])
+        log = np.concatenate([b[3] for b in batches])
+        assert np.all(np.diff(time) > 0)
+        assert set(receiver.tolist()) <= {0, 1}
+        assert content.min() >= 1 and content.max() <= 10
+        assert log.tolist() == 7 * [False] + 8 * [True]
+
+    def test_batches_seed(self):
+        a = workload.StationaryWorkload(
+            self.topology(), 10, 0.8, n_warmup=5, n_measured=5, seed=3
+        )
+        b = workload.StationaryWorkload(
+            self.topology(), 10, 0.8, n_warmup=5, n_measured=5, seed=3
+        )
+        for batch_a, batch_b in zip(a.batches(3), b.batches(3)):
+            for arr_a, arr_b in zip(batch_a, batch_b):
+                assert np.array_equal(arr_a, arr_b)
+
+    def test_iter_same_as_batches(self):
+        wl = workload.StationaryWorkload(
+            self.topology(), 10, 0.8, n_warmup=50, n_measured=5000, seed=4
+        )
+        events = list(wl)
+        for batch_size in (1, 7, 10000):
+            batches = list(wl.batches(batch_size))
+            time = np.concatenate([b[0] for b in batches])
+            receiver = np.concatenate([b[1] for b in batches])
+            content = np.concatenate([b[2] for b in batches])
+            assert time.tolist() == [t for t, _ in events]
+            assert [wl.receivers[r] for r in receiver] == [
+                e["receiver"] for _, e in events
+            ]
+            assert content.tolist() == [e["content"] for _, e in events]
+
+    def test_iter_unseeded(self):
+        wl = workload.StationaryWorkload(
+            self.topology(), 10, 0.8, n_warmup=5, n_measured=5
+        )
+        assert list(wl) == list(wl)
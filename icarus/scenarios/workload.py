@@ -16,13 +16,23 @@ following attributes:
 
 Each workload must expose the `contents` attribute which is an iterable of
 all content identifiers. This is needed for content placement.
+
+Workloads can optionally implement a `batches` method, which is used by the
+simulation engine when batched execution is enabled. It takes a batch size as
+argument and returns an iterator over 4-tuples of NumPy arrays of equal length:
+ * time: timestamps of the events
+ * receiver: indices of the receivers issuing the requests in the `receivers`
+   attribute of the workload
+ * content: identifiers of the contents requested
+ * log: boolean flags indicating whether each request must be logged
 """
-import random
 import csv
+import itertools
 
+import numpy as np
 import networkx as nx
 
-from icarus.tools import TruncatedZipfDist
+from icarus.tools import RandomStream, TruncatedZipfDist, seed_sequence
 from icarus.registry import register_workload
 
 __all__ = [
@@ -33,6 +43,22 @@ __all__ = [
 ]
 
 
+def _generators(seed_seq, n):
+    """Return *n* independent random generators derived from a seed sequence
+
+    Unlike `SeedSequence.spawn`, this function returns the same generators
+    each time it is called with the same seed sequence.
+    """
+    return [
+        np.random.default_rng(
+            np.random.SeedSequence(
+                seed_seq.entropy, spawn_key=seed_seq.spawn_key + (i,)
+            )
+        )
+        for i in range(n)
+    ]
+
+
 @register_workload("STATIONARY")
 class StationaryWorkload:
     """This function generates events on the fly, i.e. instead of creating an
@@ -74,6 +100,9 @@ class StationaryWorkload:
         not logged)
     n_measured : int, optional
         The number of logged requests after the warmup
+    seed : int, SeedSequence or any hashable type, optional
+        The seed of the random number generators. Request times, receivers
+        and contents are drawn from independent streams spawned from it
 
     Returns
     -------
@@ -109,7 +138,10 @@ class StationaryWorkload:
         self.rate = rate
         self.n_warmup = n_warmup
         self.n_measured = n_measured
-        random.seed(seed)
+        self.seed = seed
+        # The seed sequence is fixed at construction, so that iterating over
+        # the workload again returns the same events even if not seeded
+        self._seed_seq = seed_sequence(seed)
         self.beta = beta
         if beta != 0:
             degree = nx.degree(self.topology)
@@ -121,20 +153,50 @@ class StationaryWorkload:
             self.receiver_dist = TruncatedZipfDist(beta, len(self.receivers))
 
     def __iter__(self):
-        req_counter = 0
+        receivers = self.receivers
+        for time, receiver, content, log in self.batches(4096):
+            for t_event, r, c, logged in zip(
+                time.tolist(), receiver.tolist(), content.tolist(), log.tolist()
+            ):
+                yield (t_event, {"receiver": receivers[r], "content": c, "log": logged})
+
+    def batches(self, batch_size):
+        """Return an iterator over blocks of events stored as arrays.
+
+        Events are the same returned by `__iter__`, irrespective of the size
+        of the blocks.
+
+        Parameters
+        ----------
+        batch_size : int
+            The number of events of each block. The last block may be shorter
+
+        Returns
+        -------
+        batches : iterator
+            Iterator of (time, receiver, content, log) tuples of arrays
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        # Each variable is drawn from its own stream so that the sequence of
+        # events does not depend on how many are drawn at a time
+        time_rng, receiver_rng, content_rng = _generators(self._seed_seq, 3)
+        n_events = self.n_warmup + self.n_measured
         t_event = 0.0
-        while req_counter < self.n_warmup + self.n_measured:
-            t_event += random.expovariate(self.rate)
+        for start in range(0, n_events, batch_size):
+            n = min(batch_size, n_events - start)
+            intervals = time_rng.exponential(1.0 / self.rate, n)
+            time = np.cumsum(np.concatenate(([t_event], intervals)))[1:]
+            t_event = time[-1]
             if self.beta == 0:
-                receiver = random.choice(self.receivers)
+                receiver = (receiver_rng.random(n) * len(self.receivers)).astype(int)
             else:
-                receiver = self.receivers[self.receiver_dist.rv() - 1]
-            content = int(self.zipf.rv())
-            log = req_counter >= self.n_warmup
-            event = {"receiver": receiver, "content": content, "log": log}
-            yield (t_event, event)
-            req_counter += 1
-        return
+                receiver = np.searchsorted(
+                    self.receiver_dist.cdf, receiver_rng.random(n)
+                )
+            content = np.searchsorted(self.zipf.cdf, content_rng.random(n)) + 1
+            log = np.arange(start, start + n) >= self.n_warmup
+            yield time, receiver, content, log
 
 
 @register_workload("GLOBETRAFF")
@@ -163,6 +225,8 @@ class GlobetraffWorkload:
         The GlobeTraff content file
     beta : float, optional
         Spatial skewness of requests rates
+    seed : int, SeedSequence or any hashable type, optional
+        The seed of the random number generator mapping requests to receivers
 
     Returns
     -------
@@ -172,7 +236,9 @@ class GlobetraffWorkload:
         dictionary of event attributes.
     """
 
-    def __init__(self, topology, reqs_file, contents_file, beta=0, **kwargs):
+    def __init__(
+        self, topology, reqs_file, contents_file, beta=0, seed=None, **kwargs
+    ):
         """Constructor"""
         if beta < 0:
             raise ValueError("beta must be positive")
@@ -188,6 +254,7 @@ class GlobetraffWorkload:
         self.contents = range(self.n_contents)
         self.request_file = reqs_file
         self.beta = beta
+        self._random = RandomStream(seed)
         if beta != 0:
             degree = nx.degree(self.topology)
             self.receivers = sorted(
@@ -195,14 +262,14 @@ class GlobetraffWorkload:
                 key=lambda x: degree[iter(topology.adj[x]).next()],
                 reverse=True,
             )
-            self.receiver_dist = TruncatedZipfDist(beta, len(self.receivers))
+            self.receiver_dist = TruncatedZipfDist(beta, len(self.receivers), seed)
 
     def __iter__(self):
         with open(self.request_file) as f:
             reader = csv.reader(f, delimiter="\t")
             for timestamp, content, size in reader:
                 if self.beta == 0:
-                    receiver = random.choice(self.receivers)
+                    receiver = self._random.choice(self.receivers)
                 else:
                     receiver = self.receivers[self.receiver_dist.rv() - 1]
                 event = {"receiver": receiver, "content": content, "size": size}
@@ -252,6 +319,9 @@ class TraceDrivenWorkload:
         The network-wide mean rate of requests per second
     beta : float, optional
         Spatial skewness of requests rates
+    seed : int, SeedSequence or any hashable type, optional
+        The seed of the random number generators. Request times and receivers
+        are drawn from independent streams spawned from it
 
     Returns
     -------
@@ -271,6 +341,7 @@ class TraceDrivenWorkload:
         n_measured,
         rate=1.0,
         beta=0,
+        seed=None,
         **kwargs
     ):
         """Constructor"""
@@ -290,6 +361,8 @@ class TraceDrivenWorkload:
         with open(contents_file, buffering=self.buffering) as f:
             for content in f:
                 self.contents.append(content)
+        self.seed = seed
+        self._seed_seq = seed_sequence(seed)
         self.beta = beta
         if beta != 0:
             degree = nx.degree(topology)
@@ -301,22 +374,54 @@ class TraceDrivenWorkload:
             self.receiver_dist = TruncatedZipfDist(beta, len(self.receivers))
 
     def __iter__(self):
-        req_counter = 0
+        receivers = self.receivers
+        for time, receiver, content, log in self.batches(4096):
+            for t_event, r, c, logged in zip(
+                time.tolist(), receiver.tolist(), content.tolist(), log.tolist()
+            ):
+                yield (t_event, {"receiver": receivers[r], "content": c, "log": logged})
+
+    def batches(self, batch_size):
+        """Return an iterator over blocks of events stored as arrays.
+
+        Events are the same returned by `__iter__`, irrespective of the size
+        of the blocks.
+
+        Parameters
+        ----------
+        batch_size : int
+            The number of events of each block. The last block may be shorter
+
+        Returns
+        -------
+        batches : iterator
+            Iterator of (time, receiver, content, log) tuples of arrays
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        time_rng, receiver_rng = _generators(self._seed_seq, 2)
+        n_receivers = len(self.receivers)
+        n_events = self.n_warmup + self.n_measured
         t_event = 0.0
+        start = 0
         with open(self.reqs_file, buffering=self.buffering) as f:
-            for content in f:
-                t_event += random.expovariate(self.rate)
+            while start < n_events:
+                n = min(batch_size, n_events - start)
+                content = np.array(list(itertools.islice(f, n)), dtype=object)
+                if len(content) < n:
+                    raise ValueError("Trace did not contain enough requests")
+                intervals = time_rng.exponential(1.0 / self.rate, n)
+                time = np.cumsum(np.concatenate(([t_event], intervals)))[1:]
+                t_event = time[-1]
                 if self.beta == 0:
-                    receiver = random.choice(self.receivers)
+                    receiver = (receiver_rng.random(n) * n_receivers).astype(int)
                 else:
-                    receiver = self.receivers[self.receiver_dist.rv() - 1]
-                log = req_counter >= self.n_warmup
-                event = {"receiver": receiver, "content": content, "log": log}
-                yield (t_event, event)
-                req_counter += 1
-                if req_counter >= self.n_warmup + self.n_measured:
-                    return
-            raise ValueError("Trace did not contain enough requests")
+                    receiver = np.searchsorted(
+                        self.receiver_dist.cdf, receiver_rng.random(n)
+                    )
+                log = np.arange(start, start + n) >= self.n_warmup
+                yield time, receiver, content, log
+                start += n
 
 
 @register_workload("YCSB")
@@ -367,8 +472,8 @@ class YCSBWorkload:
             The number of logged requests after the warmup
         alpha : float, optional
             Parameter of Zipf distribution
-        seed : int, optional
-            The seed for the random generator
+        seed : int, SeedSequence or any hashable type, optional
+            The seed for the random generators
         """
 
         if workload not in ("A", "B", "C", "D", "E"):
@@ -376,9 +481,9 @@ class YCSBWorkload:
         elif workload in ("D", "E"):
             raise NotImplementedError("Workloads D and E not yet implemented")
         self.workload = workload
-        if seed is not None:
-            random.seed(seed)
-        self.zipf = TruncatedZipfDist(alpha, n_contents)
+        op_rng, item_rng = _generators(seed_sequence(seed), 2)
+        self._random = RandomStream(op_rng)
+        self.zipf = TruncatedZipfDist(alpha, n_contents, item_rng)
         self.n_warmup = n_warmup
         self.n_measured = n_measured
 
@@ -386,7 +491,7 @@ class YCSBWorkload:
         """Return an iterator over the workload"""
         req_counter = 0
         while req_counter < self.n_warmup + self.n_measured:
-            rand = random.random()
+            rand = self._random.random()
             op = {
                 "A": "READ" if rand < 0.5 else "UPDATE",
                 "B": "READ" if rand < 0.95 else "UPDATE",
@@ -0,0 +1,101 @@
+import multiprocessing as mp
+import os
+import time
+
+import pytest
+
+from icarus.distributed import (
+    Coordinator,
+    CoordinatorClient,
+    parse_address,
+    serve_coordinator,
+)
+
+AUTHKEY = b"test"
+
+
+def power_worker(name, address, crash=False):
+    client = CoordinatorClient(name, address, AUTHKEY, heartbeat_interval=0.05)
+    exponent = client.settings()
+    while True:
+        status, job_id, job = client.get_job()
+        if status == "DONE":
+            break
+        if status == "WAIT":
+            time.sleep(0.05)
+            continue
+        if crash:
+            # Disappear holding a job
+            os._exit(1)
+        client.put_result(job_id, job ** exponent)
+    client.close()
+
+
+class TestCoordinator:
+    def test_parse_address(self):
+        assert ("localhost", 5000) == parse_address("localhost:5000")
+        assert ("", 5000) == parse_address(":5000")
+        with pytest.raises(ValueError):
+            parse_address("localhost")
+
+    def test_get_job(self):
+        coordinator = Coordinator([1, 2])
+        assert ("JOB", 0, 1) == coordinator.get_job("a")
+        assert ("JOB", 1, 2) == coordinator.get_job("b")
+        assert ("WAIT", None, None) == coordinator.get_job("a")
+        coordinator.put_result("a", 0, 1)
+        coordinator.put_result("b", 1, 4)
+        assert coordinator.finished
+        assert [(1, 1), (2, 4)] == [coordinator.results.get() for _ in range(2)]
+        # Jobs can be added until the coordinator is closed
+        assert ("WAIT", None, None) == coordinator.get_job("a")
+        coordinator.add_jobs([3])
+        assert not coordinator.finished
+        assert ("JOB", 2, 3) == coordinator.get_job("a")
+        coordinator.put_result("a", 2, 9)
+        coordinator.close()
+        assert ("DONE", None, None) == coordinator.get_job("a")
+
+    def test_reassign_expired(self):
+        coordinator = Coordinator([1, 2], heartbeat_timeout=0.05)
+        assert ("JOB", 0, 1) == coordinator.get_job("a")
+        time.sleep(0.1)
+        coordinator.heartbeat("b")
+        assert ["a"] == coordinator.reassign_expired()
+        assert ("JOB", 0, 1) == coordinator.get_job("b")
+        # Results of reassigned jobs are discarded
+        coordinator.put_result("a", 0, 1)
+        assert coordinator.results.empty()
+        coordinator.put_result("b", 0, 1)
+        assert 1 == coordinator.n_done
+
+    def test_close(self):
+        coordinator = Coordinator([1])
+        coordinator.close()
+        assert ("DONE", None, None) == coordinator.get_job("a")
+
+    def test_workers(self):
+        jobs = list(range(20))
+        coordinator = Coordinator(jobs, heartbeat_timeout=0.5, settings=3)
+        address = serve_coordinator(coordinator, ("127.0.0.1", 0), AUTHKEY)
+        crashing = mp.Process(target=power_worker, args=("crash", address, True))
+        crashing.start()
+        crashing.join(10)
+        workers = [
+            mp.Process(target=power_worker, args=(str(i), address)) for i in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        results = []
+        while not coordinator.finished:
+            coordinator.reassign_expired()
+            time.sleep(0.05)
+        coordinator.close()
+        while not coordinator.results.empty():
+            job, result = coordinator.results.get()
+            assert job ** 3 == result
+            results.append(result)
+        for worker in workers:
+            worker.join(10)
+            assert 0 == worker.exitcode
+        assert sorted(x ** 3 for x in jobs) == sorted(results)
@@ -0,0 +1,440 @@
+import collections
+import inspect
+import multiprocessing as mp
+import socket
+
+import pytest
+
+import icarus.orchestration as orchestration
+from icarus.orchestration import (
+    CostModel,
+    Orchestrator,
+    ScenarioCache,
+    run_scenario,
+    run_worker,
+)
+from icarus.registry import CONTENT_PLACEMENT, STRATEGY, TOPOLOGY_FACTORY
+from icarus.results import ResultsJournal
+from icarus.util import Settings, Tree
+
+
+class TestScenarioCache:
+    @classmethod
+    def experiment(cls, strategy, content_seed=1):
+        experiment = Tree()
+        experiment["topology"]["name"] = "PATH"
+        experiment["topology"]["n"] = 6
+        experiment["workload"] = {
+            "name": "STATIONARY",
+            "n_contents": 50,
+            "n_warmup": 100,
+            "n_measured": 200,
+            "alpha": 0.8,
+            "rate": 1,
+            "seed": 2,
+        }
+        experiment["cache_placement"]["name"] = "UNIFORM"
+        experiment["cache_placement"]["network_cache"] = 0.1
+        experiment["content_placement"]["name"] = "UNIFORM"
+        experiment["content_placement"]["seed"] = content_seed
+        experiment["cache_policy"]["name"] = "LRU"
+        experiment["strategy"]["name"] = strategy
+        if "seed" in inspect.signature(STRATEGY[strategy]).parameters:
+            experiment["strategy"]["seed"] = 3
+        return experiment
+
+    @classmethod
+    def settings(cls, scenario_cache, directory=None):
+        settings = Settings()
+        settings.DATA_COLLECTORS = ["CACHE_HIT_RATIO", "LATENCY"]
+        settings.SCENARIO_CACHE = scenario_cache
+        if directory is not None:
+            settings.SCENARIO_CACHE_DIR = directory
+        return settings
+
+    def setup_method(self):
+        orchestration._scenario_cache = None
+
+    def teardown_method(self):
+        orchestration._scenario_cache = None
+
+    def test_key(self):
+        spec = {"name": "PATH", "n": 6}
+        assert ScenarioCache.key(spec) == ScenarioCache.key({"n": 6, "name": "PATH"})
+        assert ScenarioCache.key(spec) != ScenarioCache.key({"name": "PATH", "n": 7})
+
+    def test_cacheable(self):
+        assert ScenarioCache.cacheable({"name": "PATH", "n": 6}, TOPOLOGY_FACTORY)
+        assert not ScenarioCache.cacheable({"name": "UNIFORM"}, CONTENT_PLACEMENT)
+        assert ScenarioCache.cacheable(
+            {"name": "UNIFORM", "seed": 0}, CONTENT_PLACEMENT
+        )
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            ScenarioCache(maxsize=0)
+
+    def test_same_results(self):
+        strategies = ["PROB_CACHE", "LCE", "PROB_CACHE", "RAND_CHOICE"]
+        expected = [
+            run_scenario(self.settings(False), self.experiment(s), 1, 1)[1]
+            for s in strategies
+        ]
+        assert orchestration._scenario_cache is None
+        settings = self.settings(True)
+        for strategy, results in zip(strategies, expected):
+            experiment = self.experiment(strategy)
+            assert results == run_scenario(settings, experiment, 1, 1)[1]
+        cache = orchestration._scenario_cache
+        assert 1 == len(cache._scenarios)
+        assert 1 == len(cache._paths)
+
+    def test_not_cacheable(self):
+        experiment = self.experiment("LCE", content_seed=None)
+        run_scenario(self.settings(True), experiment, 1, 1)
+        assert 0 == len(orchestration._scenario_cache._scenarios)
+
+    def test_directory(self, tmp_path):
+        settings = self.settings(True, str(tmp_path))
+        results = run_scenario(settings, self.experiment("PROB_CACHE"), 1, 1)[1]
+        assert 2 == len(list(tmp_path.iterdir()))
+        # Another process would only find the entries on disk
+        orchestration._scenario_cache = None
+        assert results == run_scenario(settings, self.experiment("PROB_CACHE"), 1, 1)[1]
+        assert 2 == len(list(tmp_path.iterdir()))
+
+
+class TestOrchestrator:
+    @classmethod
+    def settings(cls, experiments, parallel, max_inflight=None):
+        settings = Settings()
+        settings.EXPERIMENT_QUEUE = experiments
+        settings.DATA_COLLECTORS = ["CACHE_HIT_RATIO"]
+        settings.N_REPLICATIONS = 2
+        settings.PARALLEL_EXECUTION = parallel
+        settings.N_PROCESSES = 2
+        if max_inflight is not None:
+            settings.MAX_INFLIGHT = max_inflight
+        return settings
+
+    @classmethod
+    def experiment(cls, n, n_measured):
+        experiment = TestScenarioCache.experiment("LCE")
+        experiment["topology"]["n"] = n
+        experiment["workload"]["n_measured"] = n_measured
+        return experiment
+
+    def test_experiment_cost(self):
+        small = self.experiment(4, 100)
+        large = self.experiment(8, 100)
+        longer = self.experiment(4, 1000)
+        assert orchestration._experiment_cost(small) == 4 * 200
+        assert orchestration._experiment_cost(large) == 8 * 200
+        assert orchestration._experiment_cost(longer) == 4 * 1100
+        del small["workload"]["n_warmup"]
+        assert orchestration._experiment_cost(small) == 4 * (10 ** 5 + 100)
+
+    def test_parallel(self):
+        experiments = [self.experiment(4, 100), self.experiment(8, 300)]
+        serial = Orchestrator(self.settings(experiments, False))
+        serial.run()
+        expected = {str(params): results for params, results in serial.results}
+        for max_inflight in (None, 1):
+            orch = Orchestrator(self.settings(experiments, True, max_inflight))
+            orch.run()
+            assert 4 == orch.n_success
+            assert 0 == orch.n_fail
+            for params, results in orch.results:
+                assert expected[str(params)] == results
+            if max_inflight == 1:
+                # Jobs are executed one at a time, longest first
+                sizes = [params["topology"]["n"] for params, _ in orch.results]
+                assert [8, 8, 4, 4] == sizes
+
+    def test_resume(self, tmp_path):
+        path = str(tmp_path / "results.journal")
+        experiments = [self.experiment(4, 100), self.experiment(8, 300)]
+        settings = self.settings(experiments, False)
+        # Simulate a run interrupted after three replications
+        orch = Orchestrator(settings, journal=ResultsJournal(path))
+        for params, results in [
+            run_scenario(settings, experiment, i, 4)[:2]
+            for i, experiment in enumerate(experiments + experiments[:1])
+        ]:
+            orch.experiment_callback((params, results, 1.0))
+        orch.journal.close()
+        orch = Orchestrator(settings, journal=ResultsJournal(path, resume=True))
+        orch.run()
+        assert 1 == orch.n_exp
+        assert 1 == orch.n_success
+        assert 4 == len(orch.results)
+        sizes = sorted(params["topology"]["n"] for params, _ in orch.results)
+        assert [4, 4, 8, 8] == sizes
+        assert 4 == len(ResultsJournal(path, resume=True).results)
+
+    def test_serve(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        address = "127.0.0.1:%d" % port
+        experiments = [self.experiment(4, 100), self.experiment(8, 300)]
+        serial = Orchestrator(self.settings(experiments, False))
+        serial.run()
+        expected = {str(params): results for params, results in serial.results}
+        settings = self.settings(experiments, True)
+        settings.SERVE = True
+        settings.SERVE_ADDRESS = address
+        settings.SERVE_AUTHKEY = "test"
+        workers = [
+            mp.Process(target=run_worker, args=(address, "test", 0.1))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        orch = Orchestrator(settings)
+        orch.run()
+        for worker in workers:
+            worker.join(10)
+            assert 0 == worker.exitcode
+        assert 4 == orch.n_success
+        for params, results in orch.results:
+            assert expected[str(params)] == results
+
+    def test_shared_topologies(self):
+        experiments = [self.experiment(6, 100), self.experiment(6, 100)]
+        experiments[0]["workload"]["n_contents"] = 200
+        experiments[1]["workload"]["n_contents"] = 4
+        experiments[1]["cache_placement"]["network_cache"] = 0.5
+        settings = self.settings(experiments, False)
+        expected = [run_scenario(settings, e, 1, 2)[1] for e in experiments]
+        spec = experiments[0]["topology"]
+        topology = orchestration._build_topology(spec)
+        try:
+            orchestration._init_worker(settings, {ScenarioCache.key(spec): topology})
+            for experiment, results in zip(experiments, expected):
+                assert results == orchestration._run_job(experiment, 1, 2, 0)[1]
+        finally:
+            orchestration._init_worker(None, {})
+        # Placements do not modify the shared topology
+        for v in topology:
+            props = topology.node[v]["stack"][1]
+            assert "cache_size" not in props
+            assert "contents" not in props
+
+    def test_authkey(self):
+        settings = Settings()
+        settings.SERVE_AUTHKEY = "key"
+        assert b"key" == orchestration._authkey(settings)
+        # Without SERVE_AUTHKEY, each orchestrator generates a random key
+        settings = Settings()
+        assert orchestration._authkey(settings) != orchestration._authkey(settings)
+
+    def test_n_more_replications(self):
+        settings = self.settings([], False)
+        settings.REPLICATIONS_CI_WIDTH = 0.1
+        settings.MAX_REPLICATIONS = 10
+        orch = Orchestrator(settings)
+        values = {("CACHE_HIT_RATIO", "MEAN"): [0.5, 0.5, 0.5]}
+        assert 0 == orch.n_more_replications(values, 3)
+        values = {("CACHE_HIT_RATIO", "MEAN"): [0.49, 0.5, 0.51]}
+        assert 0 == orch.n_more_replications(values, 3)
+        values[("LATENCY", "MEAN")] = [10, 20, 30]
+        assert 7 == orch.n_more_replications(values, 3)
+        assert 0 == orch.n_more_replications(values, 10)
+        values = {("CACHE_HIT_RATIO", "MEAN"): [0.6, 0.5, 0.6, 0.5]}
+        assert 2 == orch.n_more_replications(values, 8)
+        # Intervals cannot be computed from a single value
+        values = {("CACHE_HIT_RATIO", "MEAN"): [0.5]}
+        assert 1 == orch.n_more_replications(values, 2)
+
+    def test_seed_components(self):
+        experiments = [
+            TestScenarioCache.experiment(strategy, content_seed=None)
+            for strategy in ("PROB_CACHE", "RAND_CHOICE")
+        ]
+        for experiment in experiments:
+            orchestration._seed_components(experiment, 0, 1)
+        a, b = experiments
+        # Explicit seeds are kept and others are the same across strategies
+        assert 2 == a["workload"]["seed"] == b["workload"]["seed"]
+        assert 3 == a["strategy"]["seed"] == b["strategy"]["seed"]
+        seed = a["content_placement"]["seed"]
+        assert seed is not None and seed == b["content_placement"]["seed"]
+        # LRU does not accept a seed
+        assert "seed" not in a["cache_policy"]
+        other = TestScenarioCache.experiment("LCE", content_seed=None)
+        orchestration._seed_components(other, 0, 2)
+        assert seed != other["content_placement"]["seed"]
+
+    def test_unseeded_strategies_reproducible(self):
+        experiments = []
+        for strategy in ("PROB_CACHE", "RAND_BERNOULLI", "RAND_CHOICE"):
+            experiment = self.experiment(6, 300)
+            experiment["strategy"] = {"name": strategy}
+            experiments.append(experiment)
+        settings = self.settings(experiments, False)
+        settings.SEED = 0
+        results = []
+        for _ in range(2):
+            orch = Orchestrator(settings)
+            orch.run()
+            results.append([(str(p), r) for p, r in orch.results])
+        # Strategies are seeded from SEED, hence campaigns are reproducible
+        assert results[0] == results[1]
+
+    def test_replications_seeded(self):
+        experiment = self.experiment(6, 300)
+        experiment["workload"]["seed"] = None
+        settings = self.settings([experiment], False)
+        settings.SEED = 0
+        results = [run_scenario(settings, experiment, 1, 1, i)[1] for i in (0, 1, 0)]
+        assert results[0] == results[2]
+        assert results[0] != results[1]
+        assert 1 == results[1]["REPLICATION"]["INDEX"]
+        assert 0 == results[1]["REPLICATION"]["SEED"]
+
+    def test_resume_seeded(self, tmp_path):
+        path = str(tmp_path / "results.journal")
+        experiment = self.experiment(4, 100)
+        experiment["workload"]["seed"] = None
+        settings = self.settings([experiment], False)
+        settings.SEED = 0
+        journal = ResultsJournal(path)
+        journal.append(*run_scenario(settings, experiment, 1, 2, 1)[:2])
+        journal.close()
+        orch = Orchestrator(settings, journal=ResultsJournal(path, resume=True))
+        orch.run()
+        indices = sorted(r["REPLICATION"]["INDEX"] for _, r in orch.results)
+        assert [0, 1] == indices
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_segments(self, parallel):
+        experiment = self.experiment(6, 300)
+        settings = self.settings([experiment], parallel)
+        settings.DATA_COLLECTORS = ["CACHE_HIT_RATIO", "LATENCY"]
+        settings.N_SEGMENTS = 3
+        segments = [
+            run_scenario(settings, experiment, 1, 1, 0, segment)[1]
+            for segment in range(3)
+        ]
+        assert [0, 1, 2] == [results["SEGMENT"]["INDEX"] for results in segments]
+        hit_ratios = [
+            results["COLLECTOR_STATE"].results()["CACHE_HIT_RATIO"]["MEAN"]
+            for results in segments
+        ]
+        # Segments are seeded differently
+        assert len(set(hit_ratios)) > 1
+        orch = Orchestrator(settings)
+        orch.run()
+        assert 2 == orch.n_exp == orch.n_success == len(orch.results)
+        for _, results in orch.results:
+            assert "SEGMENT" not in results
+            assert "COLLECTOR_STATE" not in results
+            # Segments measure the same number of requests
+            assert sum(hit_ratios) / 3 == pytest.approx(
+                results["CACHE_HIT_RATIO"]["MEAN"]
+            )
+            assert "LATENCY" in results
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_adaptive_replications(self, parallel):
+        experiments = [self.experiment(4, 100), self.experiment(8, 100)]
+        # Replications of an experiment only differ if not seeded by its
+        # parameters, in which case seeds depend on the replication index
+        experiments[1]["workload"]["seed"] = None
+        experiments[1]["content_placement"]["seed"] = None
+        settings = self.settings(experiments, parallel)
+        settings.SEED = 0
+        settings.ADAPTIVE_REPLICATIONS = True
+        settings.REPLICATIONS_METRICS = [("CACHE_HIT_RATIO", "MEAN")]
+        settings.REPLICATIONS_CI_WIDTH = 0.001
+        settings.MAX_REPLICATIONS = 5
+        orch = Orchestrator(settings)
+        orch.run()
+        sizes = collections.Counter(p["topology"]["n"] for p, _ in orch.results)
+        assert {4: 2, 8: 5} == sizes
+        assert 7 == orch.n_exp
+
+
+    @pytest.mark.parametrize("n_segments", [1, 2])
+    def test_adaptive_replications_failure(self, monkeypatch, n_segments):
+        experiment = self.experiment(8, 100)
+        experiment["workload"]["seed"] = None
+        experiment["content_placement"]["seed"] = None
+        settings = self.settings([experiment], False)
+        settings.SEED = 0
+        settings.N_SEGMENTS = n_segments
+        settings.ADAPTIVE_REPLICATIONS = True
+        settings.REPLICATIONS_METRICS = [("CACHE_HIT_RATIO", "MEAN")]
+        settings.REPLICATIONS_CI_WIDTH = 0.001
+        settings.MAX_REPLICATIONS = 5
+
+        def run_failing(settings, params, curr_exp, n_exp, replication=0, segment=None):
+            # Fail replication 1, or only its last segment
+            if replication == 1 and segment in (None, n_segments - 1):
+                return None
+            return run_scenario(settings, params, curr_exp, n_exp, replication, segment)
+
+        monkeypatch.setattr(orchestration, "run_scenario", run_failing)
+        orch = Orchestrator(settings)
+        orch.run()
+        # The failed replication does not prevent scheduling more replications
+        assert 5 == orch.n_exp
+        assert 4 == orch.n_success == len(orch.results)
+        assert 1 == orch.n_fail
+        assert not orch._segments
+
+class TestCostModel:
+    @classmethod
+    def experiment(cls, n=6, n_contents=50, n_measured=200):
+        experiment = TestScenarioCache.experiment("LCE")
+        experiment["topology"]["n"] = n
+        experiment["workload"]["n_contents"] = n_contents
+        experiment["workload"]["n_measured"] = n_measured
+        return experiment
+
+    def test_topology(self):
+        assert (6, 7 / 3) == CostModel().topology({"name": "PATH", "n": 6})
+
+    def test_memory(self):
+        model = CostModel()
+        base = model.memory(self.experiment())
+        assert base > CostModel.BASE_MEMORY
+        assert model.memory(self.experiment(n=20)) > base
+        assert model.memory(self.experiment(n_contents=1050)) == base + 1000 * (
+            CostModel.CONTENT_MEMORY + 0.1 * CostModel.CACHE_ENTRY_MEMORY
+        )
+
+    def test_runtime(self):
+        model = CostModel()
+        short = self.experiment()
+        longer = self.experiment(n_measured=2000)
+        assert model.runtime(longer) > model.runtime(short) > 0
+        settings = Settings()
+        settings.DATA_COLLECTORS = ["CACHE_HIT_RATIO"]
+        assert model.calibrate(settings, longer, n_events=500)
+        # Calibration applies to experiments with other workloads
+        setup, _, measured = model._calibration[model.calibration_key(short)]
+        assert setup > 0 and measured > 0
+        assert model.runtime(longer) - model.runtime(short) == pytest.approx(
+            1800 * measured
+        )
+        other = self.experiment(n=8)
+        assert model.calibration_key(other) not in model._calibration
+
+    def test_makespan(self):
+        model = CostModel()
+        model.runtime = lambda experiment: experiment
+        # Longest first: [5], [4, 1], [3, 2]
+        assert 5 == model.makespan([1, 2, 3, 4, 5], 3)
+        assert 15 == model.makespan([1, 2, 3, 4, 5], 1)
+        assert 5 == model.makespan([1, 2, 3, 4, 5], 8)
+
+    def test_max_processes(self):
+        model = CostModel()
+        experiments = [self.experiment(), self.experiment(n_contents=10 ** 6)] * 2
+        small, large = map(model.memory, experiments[:2])
+        assert 4 == model.max_processes(experiments, 4, 2 * (small + large))
+        assert 3 == model.max_processes(experiments, 4, 2 * large + small)
+        assert 1 == model.max_processes(experiments, 4, 2 * large - 1)
+        assert 1 == model.max_processes(experiments, 4, 1)
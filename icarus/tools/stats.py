@@ -2,14 +2,17 @@
 """
 
 import math
-import random
 import collections
+import hashlib
 
 import numpy as np
 import scipy.stats as ss
 
 
 __all__ = [
+    "seed_sequence",
+    "random_generator",
+    "RandomStream",
     "DiscreteDist",
     "TruncatedZipfDist",
     "means_confidence_interval",
@@ -19,6 +22,92 @@ __all__ = [
 ]
 
 
+def seed_sequence(seed=None):
+    """Return the NumPy seed sequence of a seed
+
+    Parameters
+    ----------
+    seed : int, SeedSequence or any hashable type, optional
+        The seed. Non-negative integers are used as the entropy of the
+        sequence. Other hashable values, e.g. strings or tuples as accepted
+        by `random.seed`, are converted to integers by hashing their
+        representation, hence the same value always produces the same
+        sequence. If *None*, entropy is drawn from the operating system,
+        hence numbers derived from the sequence are not reproducible
+
+    Returns
+    -------
+    seed_seq : SeedSequence
+        The seed sequence
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if seed is None or (isinstance(seed, (int, np.integer)) and seed >= 0):
+        return np.random.SeedSequence(seed)
+    digest = hashlib.sha256(repr(seed).encode()).digest()
+    return np.random.SeedSequence(int.from_bytes(digest, "big"))
+
+
+def random_generator(seed=None):
+    """Return a NumPy random generator
+
+    Parameters
+    ----------
+    seed : int, SeedSequence, Generator or any hashable type, optional
+        The seed of the generator, see `seed_sequence`. A generator is
+        returned as is. If *None*, numbers drawn from the generator are not
+        reproducible
+
+    Returns
+    -------
+    rng : Generator
+        The random generator
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed_sequence(seed))
+
+
+class RandomStream:
+    """Stream of random numbers drawn from a NumPy random generator.
+
+    Uniform random numbers are drawn from the generator in blocks, which makes
+    drawing them one at a time, as done by models deciding on each event
+    whether to take a random action, much faster than calling the generator
+    for each of them. The sequence of numbers returned does not depend on the
+    size of the blocks.
+    """
+
+    def __init__(self, seed=None, block_size=4096):
+        """Constructor
+
+        Parameters
+        ----------
+        seed : int, SeedSequence, Generator or any hashable type, optional
+            The seed of the random number generator, see `random_generator`.
+            If *None*, numbers are not reproducible
+        block_size : int, optional
+            The number of random numbers drawn from the generator at a time
+        """
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self.rng = random_generator(seed)
+        self.block_size = block_size
+        self._block = iter(())
+
+    def random(self):
+        """Return a random number uniformly distributed in [0, 1)"""
+        try:
+            return next(self._block)
+        except StopIteration:
+            self._block = iter(self.rng.random(self.block_size).tolist())
+            return next(self._block)
+
+    def choice(self, seq):
+        """Return a random element of a non-empty sequence"""
+        return seq[int(self.random() * len(seq))]
+
+
 class DiscreteDist:
     """Implements a discrete distribution with finite population.
 
@@ -34,12 +123,13 @@ class DiscreteDist:
         ----------
         pdf : array-like
             The probability density function
-        seed : any hashable type (optional)
-            The seed to be used for random number generation
+        seed : int, SeedSequence, Generator or any hashable type, optional
+            The seed to be used for random number generation, see
+            `random_generator`. If *None*, numbers are not reproducible
         """
         if np.abs(sum(pdf) - 1.0) > 0.001:
             raise ValueError("The sum of pdf values must be equal to 1")
-        random.seed(seed)
+        self._random = RandomStream(seed)
         self._pdf = np.asarray(pdf)
         self._cdf = np.cumsum(self._pdf)
         # set last element of the CDF to 1.0 to avoid rounding errors
@@ -82,11 +172,26 @@ class DiscreteDist:
 
     def rv(self):
         """Get rand value from the distribution"""
-        rv = random.random()
+        rv = self._random.random()
         # This operation performs binary search over the CDF to return the
         # random value. Worst case time complexity is O(log2(n))
         return int(np.searchsorted(self._cdf, rv) + 1)
 
+    def rvs(self, size):
+        """Get an array of random values from the distribution
+
+        Parameters
+        ----------
+        size : int
+            The number of values
+
+        Returns
+        -------
+        rvs : Numpy array
+            Array of random values
+        """
+        return np.searchsorted(self._cdf, self._random.rng.random(size)) + 1
+
 
 class TruncatedZipfDist(DiscreteDist):
     """Implements a truncated Zipf distribution, i.e. a Zipf distribution with
@@ -102,8 +207,9 @@ class TruncatedZipfDist(DiscreteDist):
             The value of the alpha parameter (it must be positive)
         n : int
             The size of population
-        seed : any hashable type, optional
-            The seed to be used for random number generation
+        seed : int, SeedSequence, Generator or any hashable type, optional
+            The seed to be used for random number generation, see
+            `random_generator`. If *None*, numbers are not reproducible
         """
         # Validate parameters
         if alpha <= 0:
@@ -13,6 +13,41 @@ class TestMeansConfidenceInterval:
         assert 0 == err
 
 
+class TestRandomGenerator:
+    def test_int_seed(self):
+        a = stats.random_generator(1).random(10)
+        assert np.array_equal(a, np.random.default_rng(1).random(10))
+
+    @pytest.mark.parametrize("seed", ["abc", (1, "a"), -1, 0.5])
+    def test_hashable_seed(self, seed):
+        a = stats.random_generator(seed).random(10)
+        assert np.array_equal(a, stats.random_generator(seed).random(10))
+        assert not np.array_equal(a, stats.random_generator(1).random(10))
+
+    def test_generator(self):
+        rng = np.random.default_rng(0)
+        assert rng is stats.random_generator(rng)
+
+
+class TestRandomStream:
+    def test_block_size(self):
+        a = stats.RandomStream(1, block_size=3)
+        b = stats.RandomStream(1)
+        values = [a.random() for _ in range(10)]
+        assert values == [b.random() for _ in range(10)]
+        assert values == np.random.default_rng(1).random(10).tolist()
+
+    def test_choice(self):
+        rand = stats.RandomStream(0)
+        choices = collections.Counter(rand.choice("abc") for _ in range(3000))
+        assert set(choices) == {"a", "b", "c"}
+        assert all(900 < n < 1100 for n in choices.values())
+
+    def test_invalid_block_size(self):
+        with pytest.raises(ValueError):
+            stats.RandomStream(block_size=0)
+
+
 class TestDiscreteDist:
     def test_pdf_incorrect_sum(self):
         with pytest.raises(ValueError):
@@ -23,6 +58,21 @@ class TestDiscreteDist:
         pdf_2 = stats.DiscreteDist(pdf_1).pdf
         assert all(pdf_1[i] == pdf_2[i] for i in range(len(pdf_1)))
 
+    def test_seed(self):
+        pdf = [0.1, 0.2, 0.3, 0.4]
+        a = stats.DiscreteDist(pdf, seed=2)
+        b = stats.DiscreteDist(pdf, seed=2)
+        assert [a.rv() for _ in range(100)] == [b.rv() for _ in range(100)]
+        assert np.array_equal(a.rvs(100), b.rvs(100))
+        a = stats.DiscreteDist(pdf, seed="seed")
+        b = stats.DiscreteDist(pdf, seed="seed")
+        assert [a.rv() for _ in range(100)] == [b.rv() for _ in range(100)]
+
+    def test_rvs(self):
+        rvs = stats.DiscreteDist([0.25, 0.75], seed=0).rvs(10000)
+        assert set(rvs.tolist()) == {1, 2}
+        assert abs(np.mean(rvs == 2) - 0.75) < 0.02
+
 
 class TestTruncatedZipfDist:
     def test_pdf_sum(self):
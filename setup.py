@@ -8,7 +8,7 @@ from setuptools import find_packages, setup
 # Packages required to run Icarus
 requires = [
     "networkx (>=2.0)",
-    "numpy (>=1.4)",
+    "numpy (>=1.17)",
     "scipy (>=0.16)",
     "fnss (>=0.9.0)",
     "matplotlib (>=1.5.3)",